@@ -20,6 +20,29 @@ IS/OOS EMA state continuity
 EMAs are computed once over the full dataset BEFORE the loop begins.
 The split boundary does NOT reset indicator state. This satisfies
 the spec requirement that "EMAs must preserve state across split."
+
+Engine modes
+------------
+``"bar"``   — reference loop; reads each bar through ``DataFrame.iloc``.
+``"array"`` — extracts open, timestamp, contains_roll and signal columns
+              into contiguous NumPy arrays once and iterates over plain
+              scalars. Same four steps, same fill functions, identical
+              ledger.
+``"event"`` — visits only bars with a non-zero signal or a roll flag.
+              The freeze window is resolved vectorially from the roll
+              indices, and fills are read from ``open[i+1]`` with NumPy
+              fancy indexing. Cost scales with event count, not bar count.
+``"jit"``   — full state machine compiled with numba over primitive
+              arrays (``backtest/jit_core.py``). Falls back to ``"array"``
+              when numba is not installed.
+
+Price representation
+--------------------
+When the M5 OHLC columns have an integer dtype (``settings.PRICE_TICKS``)
+they are tick counts. Every mode then fills with
+:func:`compute_fill_ticks` (integer slippage, no rounding) and the ledger
+prices trades as ``ticks_moved × TICK_VALUE``. Float columns take the
+original ``compute_fill_price`` + ``round_to_tick`` path.
 """
 
 from __future__ import annotations
@@ -31,16 +54,23 @@ from typing import Optional
 import numpy as np
 import pandas as pd
 
+from backtest.jit_core import NUMBA_AVAILABLE, backtest_kernel
 from backtest.ledger import Ledger
 from config import constants as C
 from config import settings as S
-from execution.execution_engine import compute_fill_price, round_to_tick
+from config.run_config import RunConfig
+from execution.execution_engine import (
+    compute_fill_price,
+    compute_fill_ticks,
+    round_to_tick,
+    ticks_to_price,
+)
 from execution.position_manager import Direction, PositionManager
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class PendingOrder:
     """
     Represents an order queued for execution at the next bar open.
@@ -63,7 +93,7 @@ class PendingOrder:
     exit_reason: str = "signal"
 
 
-@dataclass
+@dataclass(slots=True)
 class BacktestState:
     """
     Mutable state carried through the bar loop.
@@ -73,26 +103,70 @@ class BacktestState:
     position : PositionManager
     ledger : Ledger
     pending : PendingOrder or None
-    entry_price : float or None
-        Post-slippage entry price of the current open trade.
+    entry_price : float or int or None
+        Post-slippage entry price of the current open trade (a tick
+        count when ``price_ticks`` is True).
     entry_bar : pd.Timestamp or None
         Bar at which the current trade was opened.
     roll_freeze_remaining : int
         Number of M5 bars remaining in the post-roll freeze window.
         Zero means no freeze is active. Decremented each bar during freeze.
         Signal evaluation is skipped while this is > 0.
+    config : RunConfig
+        Run configuration used for fills, costs and the freeze window.
+        The ledger is created with the same config when not supplied.
+    price_ticks : bool
+        True when bar prices are integer tick counts.
+    force_closed : bool
+        True if a position was still open after the final bar and was
+        closed at that bar's open by the end-of-data close.
     """
     position: PositionManager = field(default_factory=PositionManager)
-    ledger: Ledger = field(default_factory=Ledger)
+    ledger: Optional[Ledger] = None
     pending: Optional[PendingOrder] = None
     entry_price: Optional[float] = None
     entry_bar: Optional[pd.Timestamp] = None
     roll_freeze_remaining: int = 0
+    config: RunConfig = field(default_factory=RunConfig.from_settings)
+    price_ticks: bool = False
+    force_closed: bool = False
+
+    def __post_init__(self) -> None:
+        if self.ledger is None:
+            self.ledger = Ledger(
+                config=self.config, price_ticks=self.price_ticks
+            )
+
+
+def is_tick_frame(df_m5: pd.DataFrame) -> bool:
+    """True if the M5 prices are stored as integer tick counts."""
+    return pd.api.types.is_integer_dtype(df_m5[C.COL_OPEN].dtype)
+
+
+def _check_signals(signals: pd.Series) -> None:
+    """
+    Raise ValueError if any signal is not -1, 0 or +1.
+
+    Raises
+    ------
+    ValueError
+        Naming the first invalid value and its bar.
+    """
+    values = signals.to_numpy()
+    invalid = ~np.isin(values, (-1, 0, 1))
+    if invalid.any():
+        k = int(np.argmax(invalid))
+        raise ValueError(
+            f"Invalid signal {values[k]!r} at {signals.index[k]}; "
+            "expected -1, 0 or +1."
+        )
 
 
 def run_backtest(
     df_m5: pd.DataFrame,
     signals: pd.Series,
+    mode: str | None = None,
+    config: RunConfig | None = None,
 ) -> BacktestState:
     """
     Execute the SFFM v1.2 backtest over a prepared M5 DataFrame.
@@ -105,14 +179,50 @@ def run_backtest(
     signals : pd.Series
         Signal series aligned to df_m5.index.
         Values: +1 (long), -1 (short), 0 (no signal).
+    mode : str, optional
+        Engine mode: ``"bar"``, ``"array"``, ``"event"`` or ``"jit"``
+        (see module docstring).
+        Default: settings.BACKTEST_ENGINE_MODE.
+    config : RunConfig, optional
+        Slippage, commission, contracts and freeze length for this run.
+        Default: a snapshot of the current settings, taken once.
 
     Returns
     -------
     BacktestState
         State object containing the ledger (all completed trades)
         and the final position manager state.
+
+    Raises
+    ------
+    ValueError
+        If ``mode`` is not a known engine mode, or a signal is not
+        -1, 0 or +1.
     """
-    state = BacktestState()
+    mode = mode if mode is not None else S.BACKTEST_ENGINE_MODE
+    if config is None:
+        config = RunConfig.from_settings()
+
+    # Checked once here so every mode rejects the same inputs: the event
+    # and jit modes would otherwise trade any non-zero value as a
+    # direction.
+    _check_signals(signals)
+
+    if mode == "array":
+        return _run_array_loop(df_m5, signals, config)
+    if mode == "event":
+        return _run_event_loop(df_m5, signals, config)
+    if mode == "jit":
+        if not NUMBA_AVAILABLE:
+            logger.warning(
+                "numba is not installed; falling back to the array engine."
+            )
+            return _run_array_loop(df_m5, signals, config)
+        return _run_jit_loop(df_m5, signals, config)
+    if mode != "bar":
+        raise ValueError(f"Unknown backtest engine mode: {mode!r}.")
+
+    state = BacktestState(config=config, price_ticks=is_tick_frame(df_m5))
     bars = df_m5.reset_index()   # numeric indexing is simpler in the loop
 
     n_bars = len(bars)
@@ -131,7 +241,7 @@ def run_backtest(
         # Skipping this step would leave the position in an invalid state.
         # ---------------------------------------------------------------
         if state.pending is not None:
-            _execute_pending(state, bar_ts, bar_open)
+            execute_pending(state, bar_ts, bar_open)
 
         # ---------------------------------------------------------------
         # STEP 2 — ROLL BAR: force-close open position, activate freeze.
@@ -153,7 +263,7 @@ def run_backtest(
                     exit_reason="roll",
                 )
             # Activate freeze regardless of whether a position was open.
-            state.roll_freeze_remaining = S.ROLL_FREEZE_BARS_POST
+            state.roll_freeze_remaining = config.roll_freeze_bars_post
             # Do NOT evaluate signals on this bar. Signal evaluation skipped.
             continue
 
@@ -192,15 +302,395 @@ def run_backtest(
             state.pending = None
 
     # Close any open position at the end of the dataset using the last bar.
-    _force_close_at_end(state, bars)
+    if n_bars > 0:
+        last_bar = bars.iloc[-1]
+        force_close_at_end(state, last_bar[C.COL_TS], last_bar[C.COL_OPEN])
+
+    logger.info(
+        "Backtest complete. %d trades recorded.", len(state.ledger)
+    )
+    return state
+
+
+def _run_array_loop(
+    df_m5: pd.DataFrame,
+    signals: pd.Series,
+    config: RunConfig,
+) -> BacktestState:
+    """
+    Array-native variant of the bar loop in :func:`run_backtest`.
+
+    The open, timestamp, contains_roll and signal columns are pulled into
+    contiguous NumPy arrays once; the loop then works on plain Python
+    scalars. Timestamps are materialised only when an order is queued or
+    filled, so no-signal bars cost a handful of comparisons.
+
+    Fill prices and trade records go through the same
+    :func:`execute_pending` / :func:`force_close_at_end` helpers as the
+    reference loop, so the resulting ledger is bit-for-bit identical.
+    """
+    state = BacktestState(config=config, price_ticks=is_tick_frame(df_m5))
+
+    n_bars = len(df_m5)
+    logger.info("Starting backtest over %d M5 bars (array mode).", n_bars)
+
+    timestamps = df_m5.index
+    price_dtype = np.int64 if state.price_ticks else np.float64
+    opens = np.ascontiguousarray(df_m5[C.COL_OPEN].to_numpy(dtype=price_dtype))
+    if "contains_roll" in df_m5.columns:
+        rolls = np.ascontiguousarray(
+            df_m5["contains_roll"].to_numpy(dtype=bool)
+        )
+    else:
+        rolls = np.zeros(n_bars, dtype=bool)
+    sigs = np.ascontiguousarray(signals.to_numpy(dtype=np.int64))
+
+    # tolist() yields native floats/bools/ints, which are the cheapest
+    # scalars to branch on in an interpreted loop.
+    open_list = opens.tolist()
+    roll_list = rolls.tolist()
+    signal_list = sigs.tolist()
+
+    position = state.position
+    freeze_bars = config.roll_freeze_bars_post
+
+    for i in range(n_bars):
+        # STEP 1 — execute pending order at this bar's open.
+        if state.pending is not None:
+            execute_pending(state, timestamps[i], open_list[i])
+
+        # STEP 2 — roll bar: queue force-close, activate freeze.
+        if roll_list[i]:
+            if not position.is_flat():
+                state.pending = PendingOrder(
+                    close_direction=Direction(position.current_direction),
+                    open_direction=None,
+                    signal_bar=timestamps[i],
+                    exit_reason="roll",
+                )
+            state.roll_freeze_remaining = freeze_bars
+            continue
+
+        # STEP 3 — freeze window: discard signals, decrement counter.
+        if state.roll_freeze_remaining > 0:
+            state.roll_freeze_remaining -= 1
+            continue
+
+        # STEP 4 — signal evaluation.
+        signal_value = signal_list[i]
+        if signal_value == 0:
+            # Equivalent to an empty Action from evaluate_signal.
+            state.pending = None
+            continue
+
+        action = position.evaluate_signal(signal_value, i)
+        if action.close_existing or action.open_new:
+            state.pending = PendingOrder(
+                close_direction=(
+                    Direction(position.current_direction)
+                    if action.close_existing else None
+                ),
+                open_direction=(
+                    action.new_direction if action.open_new else None
+                ),
+                signal_bar=timestamps[i],
+                exit_reason="signal",
+            )
+        else:
+            state.pending = None
+
+    if n_bars > 0:
+        force_close_at_end(state, timestamps[-1], open_list[-1])
+
+    logger.info(
+        "Backtest complete. %d trades recorded.", len(state.ledger)
+    )
+    return state
+
+
+def _run_event_loop(
+    df_m5: pd.DataFrame,
+    signals: pd.Series,
+    config: RunConfig,
+) -> BacktestState:
+    """
+    Event-driven variant of :func:`run_backtest`.
+
+    Bars with signal 0 and no roll flag are no-ops in the bar loop: a
+    pending order is always consumed at the very next open, so nothing
+    is carried across quiet bars. This kernel therefore visits only the
+    event bars (``signal != 0`` or ``contains_roll``) and applies:
+
+    - the freeze window, precomputed per event as
+      ``1 <= i - last_roll_before(i) <= ROLL_FREEZE_BARS_POST``;
+    - the position rules of :meth:`PositionManager.evaluate_signal`
+      (open when flat, reverse when opposite, ignore when same);
+    - fills at ``open[i+1]``, gathered for all trades at once.
+
+    An action raised on the final bar is left in ``state.pending``
+    unexecuted, exactly as in the bar loop.
+    """
+    state = BacktestState(config=config, price_ticks=is_tick_frame(df_m5))
+
+    n_bars = len(df_m5)
+    logger.info("Starting backtest over %d M5 bars (event mode).", n_bars)
+    if n_bars == 0:
+        return state
+
+    timestamps = df_m5.index
+    price_dtype = np.int64 if state.price_ticks else np.float64
+    opens = np.ascontiguousarray(df_m5[C.COL_OPEN].to_numpy(dtype=price_dtype))
+    if "contains_roll" in df_m5.columns:
+        rolls = df_m5["contains_roll"].to_numpy(dtype=bool)
+    else:
+        rolls = np.zeros(n_bars, dtype=bool)
+    sigs = signals.to_numpy(dtype=np.int64)
+
+    freeze_bars = config.roll_freeze_bars_post
+    events = np.flatnonzero((sigs != 0) | rolls)
+    roll_idx = np.flatnonzero(rolls)
+
+    # Most recent roll strictly before each event (-1 if none).
+    if roll_idx.size:
+        n_prior = np.searchsorted(roll_idx, events, side="left")
+        last_roll = np.where(
+            n_prior > 0, roll_idx[np.maximum(n_prior - 1, 0)], -1
+        )
+    else:
+        last_roll = np.full(events.size, -1, dtype=np.int64)
+    frozen = (last_roll >= 0) & (events - last_roll <= freeze_bars)
+
+    last_bar = n_bars - 1
+    trade_dir: list[int] = []
+    entry_idx: list[int] = []
+    exit_idx: list[int] = []
+    exit_is_roll: list[bool] = []
+
+    current = 0          # position direction code: +1, -1 or 0
+    current_entry = -1   # fill bar index of the open position
+
+    for i, is_roll, is_frozen, signal_value in zip(
+        events.tolist(),
+        rolls[events].tolist(),
+        frozen.tolist(),
+        sigs[events].tolist(),
+    ):
+        if is_roll:
+            if current != 0:
+                if i < last_bar:
+                    trade_dir.append(current)
+                    entry_idx.append(current_entry)
+                    exit_idx.append(i + 1)
+                    exit_is_roll.append(True)
+                    current = 0
+                else:
+                    state.pending = PendingOrder(
+                        close_direction=Direction(current),
+                        signal_bar=timestamps[i],
+                        exit_reason="roll",
+                    )
+            continue
+
+        if is_frozen or signal_value == current:
+            continue
+
+        if i >= last_bar:
+            # Signal on the final bar: queued but never filled.
+            state.pending = PendingOrder(
+                close_direction=Direction(current) if current != 0 else None,
+                open_direction=Direction(signal_value),
+                signal_bar=timestamps[i],
+                exit_reason="signal",
+            )
+            continue
+
+        if current != 0:
+            trade_dir.append(current)
+            entry_idx.append(current_entry)
+            exit_idx.append(i + 1)
+            exit_is_roll.append(False)
+        current = signal_value
+        current_entry = i + 1
+
+    if current != 0:
+        # End-of-data force close at the final bar's open, normal slippage.
+        trade_dir.append(current)
+        entry_idx.append(current_entry)
+        exit_idx.append(last_bar)
+        exit_is_roll.append(False)
+        state.force_closed = True
+        logger.info("Force-closed open position at end of data.")
+
+    if roll_idx.size:
+        state.roll_freeze_remaining = max(
+            0, freeze_bars - (last_bar - int(roll_idx[-1]))
+        )
+
+    if trade_dir:
+        _record_event_trades(
+            state,
+            timestamps,
+            opens,
+            np.asarray(trade_dir, dtype=np.int64),
+            np.asarray(entry_idx, dtype=np.int64),
+            np.asarray(exit_idx, dtype=np.int64),
+            np.asarray(exit_is_roll, dtype=bool),
+        )
+
+    logger.info(
+        "Backtest complete. %d trades recorded.", len(state.ledger)
+    )
+    return state
+
+
+def _run_jit_loop(
+    df_m5: pd.DataFrame,
+    signals: pd.Series,
+    config: RunConfig,
+) -> BacktestState:
+    """
+    Run the compiled kernel from ``backtest/jit_core.py`` and rebuild a
+    :class:`BacktestState` from its columnar output.
+
+    Tick counts are converted back to prices with :func:`ticks_to_price`
+    and fed to :meth:`Ledger.record_many`, so the ledger matches the
+    interpreted engines exactly. With integer-tick bars the kernel runs
+    with a tick size of 1 and its output goes to the ledger unconverted.
+    """
+    state = BacktestState(config=config, price_ticks=is_tick_frame(df_m5))
+
+    n_bars = len(df_m5)
+    logger.info("Starting backtest over %d M5 bars (jit mode).", n_bars)
+    if n_bars == 0:
+        return state
+
+    timestamps = df_m5.index
+    if "contains_roll" in df_m5.columns:
+        rolls = df_m5["contains_roll"].to_numpy(dtype=bool)
+    else:
+        rolls = np.zeros(n_bars, dtype=bool)
+
+    # Integer ticks are exact in float64, and rint(ticks / 1.0) is a no-op.
+    result = backtest_kernel(
+        opens=df_m5[C.COL_OPEN].to_numpy(dtype=np.float64),
+        rolls=rolls,
+        signals=signals.to_numpy(dtype=np.int64),
+        slippage_ticks=config.slippage_ticks,
+        roll_slippage_ticks=config.roll_close_slippage_ticks,
+        tick_size=1.0 if state.price_ticks else C.TICK_SIZE,
+        freeze_bars=config.roll_freeze_bars_post,
+    )
+
+    if state.price_ticks:
+        entry_prices = result.entry_ticks.tolist()
+        exit_prices = result.exit_ticks.tolist()
+    else:
+        entry_prices = [ticks_to_price(t) for t in result.entry_ticks.tolist()]
+        exit_prices = [ticks_to_price(t) for t in result.exit_ticks.tolist()]
+
+    state.ledger.record_many(
+        directions=result.direction.tolist(),
+        entry_bars=timestamps[result.entry_index],
+        exit_bars=timestamps[result.exit_index],
+        entry_prices=entry_prices,
+        exit_prices=exit_prices,
+    )
+
+    if result.pending_bar >= 0:
+        state.pending = PendingOrder(
+            close_direction=(
+                Direction(result.pending_close)
+                if result.pending_close != 0 else None
+            ),
+            open_direction=(
+                Direction(result.pending_open)
+                if result.pending_open != 0 else None
+            ),
+            signal_bar=timestamps[result.pending_bar],
+            exit_reason="roll" if result.pending_is_roll else "signal",
+        )
+    state.roll_freeze_remaining = int(result.freeze_remaining)
+    state.force_closed = bool(result.force_closed)
 
     logger.info(
-        "Backtest complete. %d trades recorded.", len(state.ledger.trades)
+        "Backtest complete. %d trades recorded.", len(state.ledger)
     )
     return state
 
 
-def _execute_pending(
+def _record_event_trades(
+    state: BacktestState,
+    timestamps: pd.DatetimeIndex,
+    opens: np.ndarray,
+    trade_dir: np.ndarray,
+    entry_idx: np.ndarray,
+    exit_idx: np.ndarray,
+    exit_is_roll: np.ndarray,
+) -> None:
+    """
+    Price a batch of round trips and append them to the ledger.
+
+    Raw fills are gathered with fancy indexing on ``opens``. Adverse
+    slippage is signed by the order direction (entry: trade direction;
+    exit: its opposite), which reproduces :func:`compute_fill_price`
+    operation for operation. Tick rounding goes through
+    :func:`round_to_tick` so the prices match the bar loop exactly.
+    Integer-tick bars add whole slippage ticks and need no rounding.
+    """
+    if state.price_ticks:
+        slip_ticks = state.config.slippage_ticks
+        roll_ticks = state.config.roll_close_slippage_ticks
+        entry_fill = opens[entry_idx] + trade_dir * slip_ticks
+        exit_fill = opens[exit_idx] - trade_dir * np.where(
+            exit_is_roll, roll_ticks, slip_ticks
+        )
+        state.ledger.record_many(
+            directions=trade_dir.tolist(),
+            entry_bars=timestamps[entry_idx],
+            exit_bars=timestamps[exit_idx],
+            entry_prices=entry_fill.tolist(),
+            exit_prices=exit_fill.tolist(),
+        )
+        return
+
+    slip = state.config.slippage_amount
+    roll_slip = state.config.roll_slippage_amount
+
+    entry_raw = opens[entry_idx] + trade_dir * slip
+    exit_raw = opens[exit_idx] - trade_dir * np.where(
+        exit_is_roll, roll_slip, slip
+    )
+
+    state.ledger.record_many(
+        directions=trade_dir.tolist(),
+        entry_bars=timestamps[entry_idx],
+        exit_bars=timestamps[exit_idx],
+        entry_prices=[round_to_tick(p) for p in entry_raw.tolist()],
+        exit_prices=[round_to_tick(p) for p in exit_raw.tolist()],
+    )
+
+
+def _fill(
+    state: BacktestState,
+    direction: Direction,
+    bar_open: float,
+    is_roll_close: bool = False,
+) -> float:
+    """Fill price of one order at ``bar_open`` (a tick count in tick mode)."""
+    if state.price_ticks:
+        return compute_fill_ticks(
+            direction, bar_open, is_roll_close=is_roll_close,
+            config=state.config,
+        )
+    return round_to_tick(
+        compute_fill_price(
+            direction, bar_open, is_roll_close=is_roll_close,
+            config=state.config,
+        )
+    )
+
+
+def execute_pending(
     state: BacktestState,
     bar_ts: pd.Timestamp,
     bar_open: float,
@@ -209,6 +699,9 @@ def _execute_pending(
     Execute the pending order at bar_open.
 
     Handles close-only, open-only, and close+open (reversal) scenarios.
+    Shared by every interpreted engine mode and by
+    :class:`backtest.live.LiveDriver`, so all of them fill and record
+    trades identically.
     """
     pending = state.pending
     assert pending is not None
@@ -216,12 +709,11 @@ def _execute_pending(
     # --- Close existing position ---
     if pending.close_direction is not None:
         closing_order_dir = Direction(-pending.close_direction.value)
-        exit_price = round_to_tick(
-            compute_fill_price(
-                closing_order_dir,
-                bar_open,
-                is_roll_close=(pending.exit_reason == "roll"),
-            )
+        exit_price = _fill(
+            state,
+            closing_order_dir,
+            bar_open,
+            is_roll_close=(pending.exit_reason == "roll"),
         )
 
         assert state.entry_price is not None
@@ -240,9 +732,7 @@ def _execute_pending(
 
     # --- Open new position ---
     if pending.open_direction is not None:
-        entry_price = round_to_tick(
-            compute_fill_price(pending.open_direction, bar_open)
-        )
+        entry_price = _fill(state, pending.open_direction, bar_open)
         state.position.on_open(pending.open_direction, bar_index=-1)
         state.entry_price = entry_price
         state.entry_bar = bar_ts
@@ -250,20 +740,21 @@ def _execute_pending(
     state.pending = None
 
 
-def _force_close_at_end(state: BacktestState, bars: pd.DataFrame) -> None:
+def force_close_at_end(
+    state: BacktestState,
+    bar_ts: pd.Timestamp,
+    bar_open: float,
+) -> None:
     """
     Force-close any open position at the final bar's open price.
-    This ensures the ledger is complete at backtest end.
+    This ensures the ledger is complete at backtest end (or when a live
+    stream is finalised).
     """
     if state.position.is_flat():
         return
 
-    last_bar = bars.iloc[-1]
-    bar_ts: pd.Timestamp = last_bar[C.COL_TS]
-    bar_open: float = last_bar[C.COL_OPEN]
-
     closing_dir = Direction(-state.position.current_direction.value)
-    exit_price = round_to_tick(compute_fill_price(closing_dir, bar_open))
+    exit_price = _fill(state, closing_dir, bar_open)
 
     assert state.entry_price is not None
     assert state.entry_bar is not None
@@ -276,4 +767,5 @@ def _force_close_at_end(state: BacktestState, bars: pd.DataFrame) -> None:
         exit_price=exit_price,
     )
     state.position.on_close()
+    state.force_closed = True
     logger.info("Force-closed open position at end of data.")
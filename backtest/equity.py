@@ -6,17 +6,41 @@ Builds bar-by-bar equity curves from completed trade records.
 The equity curve tracks cumulative net PnL over time. It is used
 by the drawdown module and for performance reporting.
 
-Open-trade mark-to-market is NOT implemented in v1.2. The equity
-curve moves only when a trade closes.
+Modes
+-----
+Closed-trade (default): the curve moves only when a trade closes.
+
+Mark-to-market (``settings.EQUITY_MARK_TO_MARKET``): open positions are
+valued at each bar's close, so drawdown and Sharpe see open-trade risk.
+For a trade opened at bar ``s`` and closed at bar ``e`` the curve
+carries
+
+    direction × (close[t] - entry_price) × (TICK_VALUE / TICK_SIZE) × contracts
+
+for ``s <= t < e``, and the realised net PnL from ``e`` onward.
+Commission is charged at the exit bar, so both modes end at the same
+value. The open-trade sum is evaluated for all trades at once as
+
+    unrealised[t] = K × (position[t] × close[t] - basis[t])
+
+where ``position`` (net direction) and ``basis`` (sum of
+direction × entry_price) are step functions built from the entry/exit
+bar indices with ``bincount`` + ``cumsum``. Cost is O(bars + trades),
+with no per-bar Python loop.
 """
 
 from __future__ import annotations
 
 import logging
+from typing import Optional
 
 import numpy as np
 import pandas as pd
 
+from config import constants as C
+from config import settings as S
+from config.run_config import RunConfig
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,12 +48,16 @@ def build_equity_curve(
     trade_df: pd.DataFrame,
     bar_index: pd.DatetimeIndex,
     initial_capital: float = 0.0,
+    close: Optional[pd.Series] = None,
+    config: Optional[RunConfig] = None,
+    mark_to_market: Optional[bool] = None,
 ) -> pd.Series:
     """
     Construct a bar-resolution equity curve from closed trades.
 
-    The curve is flat between trade closures and steps up/down at
-    each exit bar. Open positions are NOT marked to market.
+    By default the curve is flat between trade closures and steps
+    up/down at each exit bar. With ``mark_to_market`` open positions
+    are valued at every bar's close (see module docstring).
 
     Parameters
     ----------
@@ -40,17 +68,42 @@ def build_equity_curve(
         Full M5 bar timestamps used as the curve's time axis.
     initial_capital : float
         Starting equity level (default 0 — curves show cumulative PnL).
+    close : pd.Series, optional
+        M5 close prices aligned to ``bar_index`` (integer ticks
+        accepted). Required for mark-to-market.
+    config : RunConfig, optional
+        Supplies the contract count for mark-to-market. Default: a
+        snapshot of the current settings.
+    mark_to_market : bool, optional
+        Value open positions at each close.
+        Default: settings.EQUITY_MARK_TO_MARKET.
 
     Returns
     -------
     pd.Series
         Equity (cumulative net PnL + initial_capital) indexed on
         ``bar_index``. Values are forward-filled between trade events.
+
+    Raises
+    ------
+    ValueError
+        If mark-to-market is requested without ``close``.
     """
+    if mark_to_market is None:
+        mark_to_market = S.EQUITY_MARK_TO_MARKET
+    if mark_to_market and close is None:
+        raise ValueError("Mark-to-market equity requires close prices.")
+
     if trade_df.empty:
         logger.warning("No trades found. Returning flat equity curve.")
         return pd.Series(initial_capital, index=bar_index)
 
+    if mark_to_market:
+        return _build_mtm_equity_curve(
+            trade_df, bar_index, close, initial_capital,
+            config if config is not None else RunConfig.from_settings(),
+        )
+
     # Aggregate PnL per exit bar (multiple trades may close on same bar).
     pnl_by_bar = trade_df.groupby("exit_bar")["net_pnl"].sum()
 
@@ -66,6 +119,59 @@ def build_equity_curve(
     return equity
 
 
+def _build_mtm_equity_curve(
+    trade_df: pd.DataFrame,
+    bar_index: pd.DatetimeIndex,
+    close: pd.Series,
+    initial_capital: float,
+    config: RunConfig,
+) -> pd.Series:
+    """Vectorised mark-to-market curve; see the module docstring."""
+    n_bars = len(bar_index)
+    entry_idx = bar_index.get_indexer(trade_df["entry_bar"])
+    exit_idx = bar_index.get_indexer(trade_df["exit_bar"])
+    if (entry_idx < 0).any() or (exit_idx < 0).any():
+        raise ValueError("Trade entry/exit bars must lie on bar_index.")
+
+    direction = np.where(trade_df["direction"].to_numpy() == "LONG", 1.0, -1.0)
+    signed_entry = direction * trade_df["entry_price"].to_numpy(np.float64)
+
+    closes = close.to_numpy()
+    if np.issubdtype(closes.dtype, np.integer):
+        closes = closes * C.TICK_SIZE   # integer-tick mode
+    closes = closes.astype(np.float64, copy=False)
+
+    # Step functions: +x at the entry bar, -x at the exit bar.
+    def steps(values: np.ndarray) -> np.ndarray:
+        delta = np.bincount(entry_idx, weights=values, minlength=n_bars + 1)
+        delta -= np.bincount(exit_idx, weights=values, minlength=n_bars + 1)
+        return np.cumsum(delta[:n_bars])
+
+    position = steps(direction)
+    basis = steps(signed_entry)
+    usd_per_price = C.TICK_VALUE / C.TICK_SIZE * config.contracts
+    unrealised = np.where(
+        position != 0, usd_per_price * (position * closes - basis), 0.0
+    )
+
+    realised = np.cumsum(
+        np.bincount(
+            exit_idx,
+            weights=trade_df["net_pnl"].to_numpy(np.float64),
+            minlength=n_bars,
+        )
+    )
+
+    equity = pd.Series(
+        initial_capital + realised + unrealised, index=bar_index
+    )
+    logger.info(
+        "Equity curve (mark-to-market): start=%.2f  end=%.2f  range=%d bars.",
+        equity.iloc[0], equity.iloc[-1], len(equity),
+    )
+    return equity
+
+
 def split_equity(
     equity: pd.Series,
     split_timestamp: pd.Timestamp,
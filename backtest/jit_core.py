@@ -0,0 +1,248 @@
+"""
+jit_core.py
+===========
+Compiled backtest core. Implements the same state machine as the bar
+loop in ``backtest/engine.py`` — pending-order execution, roll
+force-close, freeze countdown and signal evaluation — over primitive
+arrays only:
+
+  - ``opens``   float64  bar open prices
+  - ``rolls``   bool     contains_roll flags
+  - ``signals`` int64    +1 / -1 / 0 (validated by ``run_backtest``;
+                         the kernel takes any non-zero value as a
+                         direction)
+
+Directions are plain integer codes (+1 long, -1 short, 0 flat), so no
+``Action``, ``PendingOrder`` or ``Direction`` objects are created inside
+the loop. Slippage follows ``compute_fill_price`` operation for
+operation, and prices are reduced to whole ticks with ``rint`` (the
+inner half of ``round_to_tick``). The caller converts tick counts back
+to prices with ``ticks_to_price``, which keeps the ledger identical to
+the interpreted engine.
+
+numba is optional (see ``utils/jit.py``). When it is not installed,
+``NUMBA_AVAILABLE`` is False and the engine falls back to its
+interpreted array loop; the kernel below is still importable and runs
+as plain Python.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import NamedTuple
+
+import numpy as np
+
+from utils.jit import NUMBA_AVAILABLE, njit
+
+logger = logging.getLogger(__name__)
+
+
+class KernelResult(NamedTuple):
+    """
+    Columnar output of :func:`backtest_kernel`.
+
+    Attributes
+    ----------
+    direction : np.ndarray[int64]
+        Trade direction codes (+1 long, -1 short).
+    entry_index, exit_index : np.ndarray[int64]
+        Fill bar positions of entry and exit.
+    entry_ticks, exit_ticks : np.ndarray[int64]
+        Post-slippage fill prices in whole ticks.
+    pending_close, pending_open : int
+        Direction codes of an order queued on the final bar and never
+        filled (0 if none).
+    pending_bar : int
+        Signal bar of that order, -1 if there is no pending order.
+    pending_is_roll : bool
+        True if that order is a roll force-close.
+    freeze_remaining : int
+        Freeze counter after the final bar.
+    force_closed : bool
+        True if the last trade is the end-of-data close of a position
+        still open after the final bar.
+    """
+    direction: np.ndarray
+    entry_index: np.ndarray
+    exit_index: np.ndarray
+    entry_ticks: np.ndarray
+    exit_ticks: np.ndarray
+    pending_close: int
+    pending_open: int
+    pending_bar: int
+    pending_is_roll: bool
+    freeze_remaining: int
+    force_closed: bool
+
+
+@njit(cache=True)
+def _fill_ticks(order_dir, bar_open, ticks, tick_size):
+    """Adverse-slippage fill for an order direction, in whole ticks."""
+    amount = ticks * tick_size
+    if order_dir == 1:
+        fill = bar_open + amount
+    else:
+        fill = bar_open - amount
+    return np.int64(np.rint(fill / tick_size))
+
+
+@njit(cache=True)
+def _kernel(
+    opens,
+    rolls,
+    signals,
+    slippage_ticks,
+    roll_slippage_ticks,
+    tick_size,
+    freeze_bars,
+    capacity,
+):
+    n = opens.shape[0]
+    direction = np.empty(capacity, dtype=np.int64)
+    entry_index = np.empty(capacity, dtype=np.int64)
+    exit_index = np.empty(capacity, dtype=np.int64)
+    entry_ticks = np.empty(capacity, dtype=np.int64)
+    exit_ticks = np.empty(capacity, dtype=np.int64)
+    n_trades = 0
+
+    position = 0
+    entry_bar = -1
+    entry_tick = np.int64(0)
+
+    has_pending = False
+    pending_close = 0
+    pending_open = 0
+    pending_bar = -1
+    pending_is_roll = False
+
+    freeze = 0
+
+    for i in range(n):
+        # STEP 1 — execute pending order at this bar's open.
+        if has_pending:
+            if pending_close != 0:
+                ticks = roll_slippage_ticks if pending_is_roll else slippage_ticks
+                direction[n_trades] = pending_close
+                entry_index[n_trades] = entry_bar
+                exit_index[n_trades] = i
+                entry_ticks[n_trades] = entry_tick
+                exit_ticks[n_trades] = _fill_ticks(
+                    -pending_close, opens[i], ticks, tick_size
+                )
+                n_trades += 1
+                position = 0
+            if pending_open != 0:
+                entry_tick = _fill_ticks(
+                    pending_open, opens[i], slippage_ticks, tick_size
+                )
+                entry_bar = i
+                position = pending_open
+            has_pending = False
+            pending_close = 0
+            pending_open = 0
+            pending_bar = -1
+            pending_is_roll = False
+
+        # STEP 2 — roll bar: queue force-close, activate freeze.
+        if rolls[i]:
+            if position != 0:
+                has_pending = True
+                pending_close = position
+                pending_open = 0
+                pending_bar = i
+                pending_is_roll = True
+            freeze = freeze_bars
+            continue
+
+        # STEP 3 — freeze window.
+        if freeze > 0:
+            freeze -= 1
+            continue
+
+        # STEP 4 — signal evaluation.
+        s = signals[i]
+        if s != 0 and s != position:
+            has_pending = True
+            pending_close = position
+            pending_open = s
+            pending_bar = i
+            pending_is_roll = False
+
+    # End-of-data force close at the final bar's open, normal slippage.
+    force_closed = position != 0
+    if force_closed:
+        direction[n_trades] = position
+        entry_index[n_trades] = entry_bar
+        exit_index[n_trades] = n - 1
+        entry_ticks[n_trades] = entry_tick
+        exit_ticks[n_trades] = _fill_ticks(
+            -position, opens[n - 1], slippage_ticks, tick_size
+        )
+        n_trades += 1
+
+    return (
+        direction[:n_trades],
+        entry_index[:n_trades],
+        exit_index[:n_trades],
+        entry_ticks[:n_trades],
+        exit_ticks[:n_trades],
+        pending_close,
+        pending_open,
+        pending_bar,
+        pending_is_roll,
+        freeze,
+        force_closed,
+    )
+
+
+def backtest_kernel(
+    opens: np.ndarray,
+    rolls: np.ndarray,
+    signals: np.ndarray,
+    slippage_ticks: int,
+    roll_slippage_ticks: int,
+    tick_size: float,
+    freeze_bars: int,
+) -> KernelResult:
+    """
+    Run the backtest state machine over primitive arrays.
+
+    Parameters
+    ----------
+    opens : np.ndarray[float64]
+        Bar open prices.
+    rolls : np.ndarray[bool]
+        contains_roll flag per bar.
+    signals : np.ndarray[int64]
+        Signal per bar: +1, -1 or 0. Other values are not checked here;
+        ``run_backtest`` rejects them before calling the kernel.
+    slippage_ticks, roll_slippage_ticks : int
+        Adverse slippage for normal fills and roll force-closes.
+    tick_size : float
+        Instrument tick size.
+    freeze_bars : int
+        Post-roll freeze length in bars.
+
+    Returns
+    -------
+    KernelResult
+    """
+    opens = np.ascontiguousarray(opens, dtype=np.float64)
+    rolls = np.ascontiguousarray(rolls, dtype=np.bool_)
+    signals = np.ascontiguousarray(signals, dtype=np.int64)
+
+    # Every trade needs a non-zero signal to open it, so this bounds the
+    # number of round trips (+1 for the end-of-data close).
+    capacity = int(np.count_nonzero(signals)) + 1
+
+    return KernelResult(*_kernel(
+        opens,
+        rolls,
+        signals,
+        int(slippage_ticks),
+        int(roll_slippage_ticks),
+        float(tick_size),
+        int(freeze_bars),
+        capacity,
+    ))
@@ -5,16 +5,31 @@ Defines the Trade dataclass and the Ledger that accumulates completed
 trades during the backtest run.
 
 A Trade is created when a position is CLOSED. It records the full
-round-trip: entry bar, exit bar, prices, costs, and net PnL.
+round-trip: entry bar, exit bar, prices, costs, and net PnL. The Ledger
+stores trades columnwise and materialises Trade records only on request.
 
 PnL formula
 -----------
     gross_pnl = direction × (exit_price - entry_price) × (TICK_VALUE / TICK_SIZE)
-    total_cost = (commission_per_side × 2) + (slippage_ticks × 2 × TICK_VALUE)
+                × contracts
+    total_cost = (commission_per_side × 2 × contracts)
     net_pnl    = gross_pnl - total_cost
 
+Integer-tick mode
+-----------------
+A ledger created with ``price_ticks=True`` receives fills as tick counts
+(see ``execution_engine.compute_fill_ticks``) and computes
+
+    gross_pnl = direction × (exit_ticks - entry_ticks) × TICK_VALUE × contracts
+
+with no price division. Trade prices are still reported in price units.
+
 Notes
 -----
+- Behaviour change: ``contracts`` (``settings.CONTRACTS``) scales gross
+  PnL and commission since the ledger takes a ``RunConfig``. Earlier
+  versions ignored it and priced every trade for one contract; the
+  default of 1 gives the same results as before.
 - Slippage is already baked into the fill prices (entry_price and
   exit_price are post-slippage). The formula therefore does NOT
   subtract slippage again — doing so would double-count it.
@@ -26,18 +41,37 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass, field
-from typing import List
+from datetime import tzinfo
+from typing import List, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
 from config import constants as C
 from config import settings as S
+from config.run_config import RunConfig
+from execution.execution_engine import ticks_to_price
 from execution.position_manager import Direction
 
 logger = logging.getLogger(__name__)
 
+_PRICE_TO_USD: float = C.TICK_VALUE / C.TICK_SIZE   # = 125,000 USD per price unit
+
+# Ledger storage: one typed array per column. Bars are int64 UTC
+# nanoseconds.
+_COLUMN_DTYPES: tuple[tuple[str, str], ...] = (
+    ("direction", "int8"),
+    ("entry_bar", "int64"),
+    ("exit_bar", "int64"),
+    ("entry_price", "float64"),
+    ("exit_price", "float64"),
+    ("gross_pnl", "float64"),
+    ("commission", "float64"),
+    ("net_pnl", "float64"),
+)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Trade:
     """
     Immutable record of a completed round-trip trade.
@@ -80,67 +114,135 @@ class Trade:
     r_multiple: float
 
 
-def build_trade(
-    trade_id: int,
-    direction: Direction,
-    entry_bar: pd.Timestamp,
-    exit_bar: pd.Timestamp,
-    entry_price: float,
-    exit_price: float,
-) -> Trade:
+def _gross_pnl(direction, entry, exit_, price_ticks: bool, contracts: int):
     """
-    Construct a Trade record from raw fill data, computing PnL.
+    Gross USD PnL — the ledger's single PnL formula.
 
-    The gross PnL uses the price ratio TickValue / TickSize which gives
-    the USD value of a 1-unit price move for 1 contract.
+    Uses only arithmetic operators, so it applies to scalars and,
+    elementwise, to NumPy arrays with the same operation order. Fills
+    are tick counts when ``price_ticks`` is set (exact for any tick
+    count), prices otherwise.
+    """
+    usd_per_unit = C.TICK_VALUE if price_ticks else _PRICE_TO_USD
+    return direction * (exit_ - entry) * usd_per_unit * contracts
 
-    Parameters
-    ----------
-    trade_id, direction, entry_bar, exit_bar,
-    entry_price, exit_price : see Trade docstring.
+
+def _price_trade(
+    direction: int,
+    entry: float,
+    exit_: float,
+    price_ticks: bool,
+    config: RunConfig,
+) -> tuple[float, float, float, float]:
+    """
+    Cost one trade.
 
     Returns
     -------
-    Trade
+    tuple[float, float, float, float]
+        ``(entry_price, exit_price, gross_pnl, net_pnl)`` with prices in
+        price units.
     """
-    price_to_usd = C.TICK_VALUE / C.TICK_SIZE   # = 125,000 USD per price unit
-
-    gross_pnl = direction.value * (exit_price - entry_price) * price_to_usd
-
-    # Commission: both sides, one contract.
-    commission = S.COMMISSION_PER_SIDE * 2
-
-    net_pnl = gross_pnl - commission
-
-    return Trade(
-        trade_id=trade_id,
-        direction=direction,
-        entry_bar=entry_bar,
-        exit_bar=exit_bar,
-        entry_price=entry_price,
-        exit_price=exit_price,
-        gross_pnl=gross_pnl,
-        commission=commission,
-        net_pnl=net_pnl,
-        is_winner=net_pnl > 0,
-        r_multiple=float("nan"),
+    if price_ticks:
+        entry, exit_ = int(entry), int(exit_)
+    gross_pnl = _gross_pnl(
+        direction, entry, exit_, price_ticks, config.contracts
     )
+    if price_ticks:
+        entry, exit_ = ticks_to_price(entry), ticks_to_price(exit_)
+    return entry, exit_, gross_pnl, gross_pnl - config.round_trip_commission
+
+
+def _price_trades(
+    directions: np.ndarray,
+    entries: Sequence[float],
+    exits: Sequence[float],
+    price_ticks: bool,
+    config: RunConfig,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorised :func:`_price_trade`: same values for every element.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        ``(entry_prices, exit_prices, gross_pnl, net_pnl)``, float64.
+    """
+    if price_ticks:
+        entries = np.asarray(entries, dtype=np.int64)
+        exits = np.asarray(exits, dtype=np.int64)
+        gross_pnl = _gross_pnl(
+            directions, entries, exits, price_ticks, config.contracts
+        )
+        entries = [ticks_to_price(t) for t in entries.tolist()]
+        exits = [ticks_to_price(t) for t in exits.tolist()]
+    entries = np.asarray(entries, dtype=np.float64)
+    exits = np.asarray(exits, dtype=np.float64)
+    if not price_ticks:
+        gross_pnl = _gross_pnl(
+            directions, entries, exits, price_ticks, config.contracts
+        )
+    return entries, exits, gross_pnl, gross_pnl - config.round_trip_commission
 
 
 @dataclass
 class Ledger:
     """
-    Accumulates Trade records during the backtest.
+    Accumulates completed trades during the backtest.
+
+    Trades are stored columnwise in typed NumPy arrays that grow by
+    doubling, so recording a trade writes a few scalars and allocates no
+    per-trade objects. :meth:`to_dataframe` wraps the filled prefix of
+    the arrays; :meth:`trade` and :attr:`trades` rebuild :class:`Trade`
+    records on demand for auditing.
 
     Attributes
     ----------
-    trades : list[Trade]
-        Ordered list of completed trades.
-    _next_id : int
-        Auto-incremented trade counter.
+    config : RunConfig
+        Run configuration used to cost every trade, resolved by the
+        caller (``run_backtest`` creates the ledger with its config).
+    price_ticks : bool
+        If True, prices passed to :meth:`record` are tick counts.
+    capacity : int
+        Initial number of trade slots
+        (default: settings.LEDGER_INITIAL_CAPACITY).
     """
-    trades: List[Trade] = field(default_factory=list)
-    _next_id: int = field(default=1, init=False, repr=False)
+    config: RunConfig
+    price_ticks: bool = False
+    capacity: int = field(default_factory=lambda: S.LEDGER_INITIAL_CAPACITY)
+    _size: int = field(default=0, init=False, repr=False)
+    _tz: Optional[tzinfo] = field(default=None, init=False, repr=False)
+    _unit: str = field(default="ns", init=False, repr=False)
+    _columns: dict[str, np.ndarray] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        capacity = max(1, self.capacity)
+        self._columns = {
+            name: np.empty(capacity, dtype=dtype)
+            for name, dtype in _COLUMN_DTYPES
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, n_more: int) -> None:
+        """Grow every column so that ``n_more`` more trades fit."""
+        needed = self._size + n_more
+        capacity = len(self._columns["direction"])
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, values in self._columns.items():
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[: self._size] = values[: self._size]
+            self._columns[name] = grown
+
+    def _remember_time_format(self, ts: pd.Timestamp) -> None:
+        """Keep the zone and unit of the first timestamp for output."""
+        if self._size == 0:
+            self._tz = ts.tz
+            self._unit = ts.unit
 
     def record(
         self,
@@ -149,58 +251,213 @@ class Ledger:
         exit_bar: pd.Timestamp,
         entry_price: float,
         exit_price: float,
-    ) -> Trade:
+    ) -> int:
         """
-        Build and store a new Trade.
+        Price and store a new trade.
+
+        ``entry_price`` and ``exit_price`` are tick counts when the
+        ledger was created with ``price_ticks=True``.
 
         Returns
         -------
-        Trade
-            The newly created trade record.
+        int
+            Trade id of the new trade.
         """
-        trade = build_trade(
-            trade_id=self._next_id,
-            direction=direction,
-            entry_bar=entry_bar,
-            exit_bar=exit_bar,
-            entry_price=entry_price,
-            exit_price=exit_price,
+        entry_price, exit_price, gross_pnl, net_pnl = _price_trade(
+            direction.value, entry_price, exit_price, self.price_ticks,
+            self.config,
         )
-        self.trades.append(trade)
-        self._next_id += 1
+        commission = self.config.round_trip_commission
+
+        self._reserve(1)
+        self._remember_time_format(entry_bar)
+        k = self._size
+        cols = self._columns
+        cols["direction"][k] = direction.value
+        cols["entry_bar"][k] = entry_bar.value
+        cols["exit_bar"][k] = exit_bar.value
+        cols["entry_price"][k] = entry_price
+        cols["exit_price"][k] = exit_price
+        cols["gross_pnl"][k] = gross_pnl
+        cols["commission"][k] = commission
+        cols["net_pnl"][k] = net_pnl
+        self._size += 1
 
         logger.debug(
             "Trade #%d recorded: %s | entry=%.5f exit=%.5f net_pnl=%.2f",
-            trade.trade_id, trade.direction.name,
-            trade.entry_price, trade.exit_price, trade.net_pnl,
+            self._size, direction.name, entry_price, exit_price, net_pnl,
+        )
+        return self._size
+
+    def record_many(
+        self,
+        directions: Sequence[int],
+        entry_bars: Sequence[pd.Timestamp],
+        exit_bars: Sequence[pd.Timestamp],
+        entry_prices: Sequence[float],
+        exit_prices: Sequence[float],
+    ) -> None:
+        """
+        Store a batch of trades given as parallel columns.
+
+        Used by the array-based engine kernels, which produce their fills
+        columnwise. PnL comes from the same formula as :meth:`record`,
+        applied elementwise, so values are identical to recording the
+        trades one by one.
+
+        Parameters
+        ----------
+        directions : sequence of int
+            Direction codes (+1 long, -1 short).
+        entry_bars, exit_bars : sequence of pd.Timestamp
+        entry_prices, exit_prices : sequence of float
+            Post-slippage, tick-rounded fill prices (tick counts in
+            integer-tick mode).
+        """
+        n = len(directions)
+        if n == 0:
+            return
+
+        direction = np.asarray(directions, dtype=np.int64)
+        entry_bars = pd.DatetimeIndex(entry_bars)
+        exit_bars = pd.DatetimeIndex(exit_bars)
+
+        entry, exit_, gross_pnl, net_pnl = _price_trades(
+            direction, entry_prices, exit_prices, self.price_ticks,
+            self.config,
         )
-        return trade
+        commission = self.config.round_trip_commission
+
+        self._reserve(n)
+        self._remember_time_format(entry_bars[0])
+        rows = slice(self._size, self._size + n)
+        cols = self._columns
+        cols["direction"][rows] = direction
+        cols["entry_bar"][rows] = entry_bars.as_unit("ns").asi8
+        cols["exit_bar"][rows] = exit_bars.as_unit("ns").asi8
+        cols["entry_price"][rows] = entry
+        cols["exit_price"][rows] = exit_
+        cols["gross_pnl"][rows] = gross_pnl
+        cols["commission"][rows] = commission
+        cols["net_pnl"][rows] = net_pnl
+        self._size += n
+
+    def extend(self, other: Ledger) -> None:
+        """
+        Append every trade of another ledger as it was recorded.
+
+        Prices and PnL are copied, not recomputed, so trades keep the
+        costs of the run that produced them. Used to stitch the
+        out-of-sample ledgers of a walk-forward run.
+        """
+        n = len(other)
+        if n == 0:
+            return
+        self._reserve(n)
+        if self._size == 0:
+            self._tz = other._tz
+            self._unit = other._unit
+        rows = slice(self._size, self._size + n)
+        for name, values in self._columns.items():
+            values[rows] = other._columns[name][:n]
+        self._size += n
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Read-only view of one stored column over the recorded trades.
+
+        Parameters
+        ----------
+        name : str
+            One of ``direction``, ``entry_bar``, ``exit_bar`` (int64
+            nanoseconds since epoch), ``entry_price``, ``exit_price``,
+            ``gross_pnl``, ``commission``, ``net_pnl``.
+        """
+        view = self._columns[name][: self._size]
+        view.flags.writeable = False
+        return view
+
+    def _bars(self, name: str) -> pd.DatetimeIndex:
+        """Stored bar column as a DatetimeIndex in the recorded zone/unit."""
+        index = pd.DatetimeIndex(
+            self._columns[name][: self._size].view("datetime64[ns]")
+        )
+        if self._tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self._tz)
+        return index.as_unit(self._unit)
+
+    def _timestamp(self, value: int) -> pd.Timestamp:
+        """One stored bar value as a Timestamp in the recorded zone/unit."""
+        ts = pd.Timestamp(int(value))
+        if self._tz is not None:
+            ts = ts.tz_localize("UTC").tz_convert(self._tz)
+        return ts.as_unit(self._unit)
+
+    def trade(self, k: int) -> Trade:
+        """
+        Rebuild the :class:`Trade` record at position ``k`` (0-based).
+
+        Raises
+        ------
+        IndexError
+            If ``k`` is out of range.
+        """
+        if not -self._size <= k < self._size:
+            raise IndexError(f"Trade index {k} out of range ({self._size}).")
+        k %= self._size
+        cols = self._columns
+        net_pnl = float(cols["net_pnl"][k])
+        return Trade(
+            trade_id=k + 1,
+            direction=Direction(int(cols["direction"][k])),
+            entry_bar=self._timestamp(cols["entry_bar"][k]),
+            exit_bar=self._timestamp(cols["exit_bar"][k]),
+            entry_price=float(cols["entry_price"][k]),
+            exit_price=float(cols["exit_price"][k]),
+            gross_pnl=float(cols["gross_pnl"][k]),
+            commission=float(cols["commission"][k]),
+            net_pnl=net_pnl,
+            is_winner=net_pnl > 0,
+            r_multiple=float("nan"),
+        )
+
+    @property
+    def trades(self) -> List[Trade]:
+        """All trades as :class:`Trade` records, in order (audit view)."""
+        return [self.trade(k) for k in range(self._size)]
 
     def to_dataframe(self) -> pd.DataFrame:
         """
-        Convert the trade list to a pandas DataFrame.
+        Convert the stored columns to a pandas DataFrame.
+
+        Numeric columns are passed to pandas as views of the ledger
+        arrays, without a copy; pandas' copy-on-write semantics keep
+        later edits to either side from leaking into the other.
 
         Returns
         -------
         pd.DataFrame
             One row per completed trade.
         """
-        if not self.trades:
+        n = self._size
+        if n == 0:
             return pd.DataFrame()
 
-        records = [
+        cols = self._columns
+        direction = cols["direction"][:n]
+        frame = pd.DataFrame(
             {
-                "trade_id": t.trade_id,
-                "direction": t.direction.name,
-                "entry_bar": t.entry_bar,
-                "exit_bar": t.exit_bar,
-                "entry_price": t.entry_price,
-                "exit_price": t.exit_price,
-                "gross_pnl": t.gross_pnl,
-                "commission": t.commission,
-                "net_pnl": t.net_pnl,
-                "is_winner": t.is_winner,
-            }
-            for t in self.trades
-        ]
-        return pd.DataFrame(records).set_index("trade_id")
+                "direction": np.where(direction > 0, "LONG", "SHORT"),
+                "entry_bar": self._bars("entry_bar"),
+                "exit_bar": self._bars("exit_bar"),
+                "entry_price": cols["entry_price"][:n],
+                "exit_price": cols["exit_price"][:n],
+                "gross_pnl": cols["gross_pnl"][:n],
+                "commission": cols["commission"][:n],
+                "net_pnl": cols["net_pnl"][:n],
+                "is_winner": cols["net_pnl"][:n] > 0,
+            },
+            index=pd.RangeIndex(1, n + 1, name="trade_id"),
+            copy=False,
+        )
+        return frame
@@ -0,0 +1,169 @@
+"""
+parallel.py
+===========
+Runs many independent backtest configurations across a process pool.
+
+Each configuration varies the EMA periods and the execution settings
+(slippage, roll slippage, freeze length, commission, contracts). All
+configurations share the same prepared M5 bars (``main.prepare_m5_bars``).
+
+Data sharing
+------------
+The M5 bars are written once as an Arrow IPC file in a temporary
+directory (``data.m5_cache.write_m5_ipc``). Worker processes memory-map
+it in their initializer (``open_m5_ipc``) and build the DataFrame over
+read-only views, so the bars are never pickled into a task and all
+workers share one copy in the OS page cache. Only the small config
+object travels with each task.
+
+Per-run settings
+----------------
+Each task carries a :class:`RunConfig`, which is passed explicitly to
+the indicator, engine and ledger layers; workers never modify
+``config.settings``. Because ``RunConfig`` is hashable, identical
+configurations in one call are evaluated once and their result reused.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config import constants as C
+from config.run_config import RunConfig
+from data.m5_cache import open_m5_ipc, write_m5_ipc
+
+logger = logging.getLogger(__name__)
+
+# M5 columns shared with workers and their storage dtypes. Integer-tick
+# prices keep their own dtype.
+_SHARED_COLUMNS: tuple[tuple[str, str], ...] = (
+    (C.COL_OPEN, "float64"),
+    (C.COL_HIGH, "float64"),
+    (C.COL_LOW, "float64"),
+    (C.COL_CLOSE, "float64"),
+    (C.COL_VOLUME, "int64"),
+    ("contains_roll", "bool"),
+)
+
+# Populated in each worker by _init_worker.
+_WORKER_BARS: Optional[pd.DataFrame] = None
+
+
+def _export_bars(df_m5: pd.DataFrame, path: Path) -> int:
+    """
+    Write the M5 index and shared columns as one Arrow IPC file.
+
+    Returns
+    -------
+    int
+        Total bytes written.
+    """
+    columns = {}
+    for column, dtype in _SHARED_COLUMNS:
+        if column in df_m5.columns:
+            if pd.api.types.is_integer_dtype(df_m5[column].dtype):
+                dtype = df_m5[column].dtype
+            columns[column] = df_m5[column].to_numpy(dtype=dtype)
+        else:
+            columns[column] = np.zeros(len(df_m5), dtype=dtype)
+    shared = pd.DataFrame(columns, index=df_m5.index, copy=False)
+    return write_m5_ipc(shared, path)
+
+
+def _init_worker(path: str) -> None:
+    """Pool initializer: build the M5 DataFrame over the mapped file."""
+    global _WORKER_BARS
+
+    _WORKER_BARS = open_m5_ipc(Path(path))
+
+
+def _run_one(config: RunConfig) -> dict[str, object]:
+    """Worker task: backtest one configuration against the shared bars."""
+    from backtest.engine import run_backtest
+    from backtest.equity import build_equity_curve
+    from indicators.ema import compute_ema_pair
+    from metrics.fused import compute_metrics
+    from signals.crossover import generate_crossover_signals
+
+    assert _WORKER_BARS is not None, "worker initializer did not run"
+    df_m5 = _WORKER_BARS
+
+    row: dict[str, object] = config.as_dict()
+
+    ema_fast, ema_slow = compute_ema_pair(df_m5[C.COL_CLOSE], config=config)
+    signals = generate_crossover_signals(ema_fast, ema_slow)
+    trade_df = run_backtest(df_m5, signals, config=config).ledger.to_dataframe()
+
+    if trade_df.empty:
+        row["total_trades"] = 0
+        return row
+
+    equity = build_equity_curve(
+        trade_df, df_m5.index, close=df_m5[C.COL_CLOSE], config=config
+    )
+    perf, dd = compute_metrics(trade_df, equity)
+    row.update(dataclasses.asdict(perf))
+    row["max_drawdown_usd"] = dd.max_drawdown_usd
+    return row
+
+
+def run_parallel(
+    df_m5: pd.DataFrame,
+    configs: Sequence[RunConfig],
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Backtest every configuration in a process pool.
+
+    Parameters
+    ----------
+    df_m5 : pd.DataFrame
+        Prepared M5 bars (see ``main.prepare_m5_bars``).
+    configs : sequence of RunConfig
+        Independent configurations to evaluate. Duplicates are run once.
+    max_workers : int, optional
+        Pool size. Default: ``os.cpu_count()``.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per configuration, in input order: the configuration
+        fields, the ``PerformanceSummary`` fields and
+        ``max_drawdown_usd``. Configurations without trades have
+        ``total_trades = 0`` and NaN metrics.
+
+    Raises
+    ------
+    ValueError
+        If ``configs`` is empty.
+    """
+    if not configs:
+        raise ValueError("No backtest configurations given.")
+
+    # Identical configs on the same bars give identical results.
+    unique = list(dict.fromkeys(configs))
+
+    with tempfile.TemporaryDirectory(prefix="sffm_m5_") as directory:
+        path = Path(directory) / "m5.arrow"
+        n_bytes = _export_bars(df_m5, path)
+        logger.info(
+            "Running %d configurations (%d distinct) over %d M5 bars "
+            "(%.1f MB shared).",
+            len(configs), len(unique), len(df_m5), n_bytes / 1e6,
+        )
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(str(path),),
+        ) as pool:
+            results = dict(zip(unique, pool.map(_run_one, unique)))
+
+    return pd.DataFrame([results[config] for config in configs])
@@ -0,0 +1,176 @@
+"""
+sweep.py
+========
+Batched parameter sweep over EMA (fast, slow) period grids.
+
+Method
+------
+1. Compute every distinct EMA period once as a column of a 2-D matrix
+   (bars × periods).
+2. Derive the crossover signals of a batch of pairs in one NumPy pass.
+3. Backtest each pair and summarise it with ``metrics.fused.compute_metrics``.
+
+EMA values and signals are identical to the single-pair path
+(``compute_ema_pair`` + ``generate_crossover_signals``), so each row of
+the sweep reproduces what ``main.py`` would report for that pair.
+
+This module does NOT modify settings; the period grid is passed in.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import run_backtest
+from backtest.equity import build_equity_curve
+from config import constants as C
+from config import settings as S
+from config.run_config import RunConfig
+from indicators.ema import compute_ema_matrix
+from metrics.fused import compute_metrics
+from metrics.performance import PerformanceSummary
+from signals.crossover import generate_crossover_signal_matrix
+
+logger = logging.getLogger(__name__)
+
+# Columns of a sweep row besides the EMA pair; also the objectives a
+# walk-forward run may maximise.
+SUMMARY_FIELDS: tuple[str, ...] = tuple(
+    f.name for f in dataclasses.fields(PerformanceSummary)
+)
+
+
+def build_period_grid(
+    fast_periods: Iterable[int],
+    slow_periods: Iterable[int],
+) -> list[tuple[int, int]]:
+    """
+    Cartesian grid of (fast, slow) pairs, keeping only fast < slow.
+
+    Parameters
+    ----------
+    fast_periods, slow_periods : iterable of int
+
+    Returns
+    -------
+    list[tuple[int, int]]
+        Pairs in fast-major order.
+    """
+    slows = sorted(set(int(p) for p in slow_periods))
+    return [
+        (f, s)
+        for f in sorted(set(int(p) for p in fast_periods))
+        for s in slows
+        if f < s
+    ]
+
+
+def run_ema_sweep(
+    df_m5: pd.DataFrame,
+    pairs: Sequence[tuple[int, int]],
+    mode: str | None = None,
+    config: RunConfig | None = None,
+) -> pd.DataFrame:
+    """
+    Backtest every (fast, slow) EMA pair over the same M5 data.
+
+    Parameters
+    ----------
+    df_m5 : pd.DataFrame
+        M5 OHLCV DataFrame as produced by the resampler.
+    pairs : sequence of (int, int)
+        (fast_period, slow_period) pairs, e.g. from
+        :func:`build_period_grid`.
+    mode : str, optional
+        Backtest engine mode passed to ``run_backtest``.
+    config : RunConfig, optional
+        Base configuration; each pair runs with its EMA periods replaced.
+        Default: a snapshot of the current settings.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per pair with columns ``ema_fast``, ``ema_slow`` followed
+        by the ``PerformanceSummary`` fields. Pairs that produce no
+        trades have ``total_trades = 0`` and NaN metrics.
+
+    Raises
+    ------
+    ValueError
+        If ``pairs`` is empty.
+    """
+    if not pairs:
+        raise ValueError("Cannot run a sweep over an empty period grid.")
+    if config is None:
+        config = RunConfig.from_settings()
+
+    periods = sorted({p for pair in pairs for p in pair})
+    column_of = {p: k for k, p in enumerate(periods)}
+
+    logger.info(
+        "Sweep: %d pairs, %d distinct EMA periods, %d bars.",
+        len(pairs), len(periods), len(df_m5),
+    )
+    ema_matrix = compute_ema_matrix(
+        df_m5[C.COL_CLOSE], periods, config.warmup_bars
+    )
+
+    fast_cols = np.array([column_of[f] for f, _ in pairs], dtype=np.intp)
+    slow_cols = np.array([column_of[s] for _, s in pairs], dtype=np.intp)
+
+    rows: list[dict[str, object]] = []
+    batch = max(1, S.SWEEP_PAIR_BATCH)
+    for start in range(0, len(pairs), batch):
+        stop = min(start + batch, len(pairs))
+        signal_matrix = generate_crossover_signal_matrix(
+            ema_matrix, fast_cols[start:stop], slow_cols[start:stop]
+        )
+        for k in range(stop - start):
+            fast, slow = pairs[start + k]
+            signals = pd.Series(signal_matrix[:, k], index=df_m5.index)
+            pair_config = dataclasses.replace(
+                config, ema_fast=fast, ema_slow=slow
+            )
+            rows.append(evaluate_pair(df_m5, signals, pair_config, mode))
+
+        logger.info("Sweep progress: %d / %d pairs.", stop, len(pairs))
+
+    return pd.DataFrame(rows, columns=["ema_fast", "ema_slow", *SUMMARY_FIELDS])
+
+
+def evaluate_pair(
+    df_m5: pd.DataFrame,
+    signals: pd.Series,
+    config: RunConfig,
+    mode: str | None,
+) -> dict[str, object]:
+    """
+    Backtest one pair and flatten its PerformanceSummary into a row.
+
+    The row holds ``ema_fast``, ``ema_slow`` and every field of
+    :data:`SUMMARY_FIELDS` (NaN, with ``total_trades`` 0, when the pair
+    does not trade). Also used to score pairs in ``backtest/walk_forward.py``.
+    """
+    state = run_backtest(df_m5, signals, mode=mode, config=config)
+    trade_df = state.ledger.to_dataframe()
+
+    row: dict[str, object] = {
+        "ema_fast": config.ema_fast,
+        "ema_slow": config.ema_slow,
+    }
+    if trade_df.empty:
+        row.update({name: np.nan for name in SUMMARY_FIELDS})
+        row["total_trades"] = 0
+        return row
+
+    equity = build_equity_curve(
+        trade_df, df_m5.index, close=df_m5[C.COL_CLOSE], config=config
+    )
+    perf, _ = compute_metrics(trade_df, equity)
+    row.update(dataclasses.asdict(perf))
+    return row
@@ -0,0 +1,416 @@
+"""
+walk_forward.py
+===============
+Walk-forward optimisation of the EMA periods over rolling or anchored
+IS/OOS windows.
+
+Windows
+-------
+The M5 history is cut into consecutive out-of-sample (OOS) windows of
+settings.WALK_FORWARD_OOS_BARS bars. Each is preceded by its in-sample
+(IS) window: the previous settings.WALK_FORWARD_IS_BARS bars (rolling)
+or every bar from the start of the data (anchored). The last OOS window
+may be shorter.
+
+For each window:
+  1. every (fast, slow) pair of the grid is backtested on the IS bars
+     and scored by settings.WALK_FORWARD_OBJECTIVE (a
+     ``PerformanceSummary`` field, maximised; pairs with fewer than
+     settings.WALK_FORWARD_MIN_TRADES IS trades are not eligible);
+  2. the winning pair trades the OOS bars.
+
+Consecutive windows that select the same pair are traded as one
+backtest over their joined OOS bars, so a position is carried across
+their boundaries exactly as in a single run. The OOS ledgers are
+stitched into one ``Ledger`` and one equity curve over the OOS span —
+the track record a trader re-optimising at every window boundary would
+have produced. Each window is credited with the trades that exit in its
+OOS bars.
+
+Work
+----
+EMAs for every period of the grid are computed once over the full
+history, exactly as ``main.py`` computes them (no reset at window
+boundaries), and each pair's crossover signals are stored as the sparse
+list of bars where they fire. A window backtest slices the bars and
+scatters the pair's events inside the window into a dense signal column,
+so the cost of a run is one EMA pass plus backtests over
+``n_windows × (IS + OOS)`` bars — linear in the number of windows.
+
+Every IS backtest, and every OOS run of same-pair windows, starts flat
+and ends with the engine's end-of-data close at the open of its last
+bar; no position or roll freeze is carried across a change of pair.
+Such a close at a pair change is a trade the continuous strategy would
+not make; the ``boundary_closes`` column of the windows table counts
+them.
+
+This module does NOT modify settings; grids and lengths are passed in or
+read once.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import is_tick_frame, run_backtest
+from backtest.equity import build_equity_curve
+from backtest.ledger import Ledger
+from backtest.sweep import SUMMARY_FIELDS, evaluate_pair, build_period_grid
+from config import constants as C
+from config import settings as S
+from config.run_config import RunConfig
+from indicators.ema import compute_ema_matrix
+from signals.crossover import generate_crossover_signal_matrix
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class WalkForwardWindow:
+    """
+    One IS/OOS window as half-open ranges of bar positions.
+
+    Attributes
+    ----------
+    is_start, is_stop : int
+        In-sample bars ``[is_start, is_stop)``.
+    oos_start, oos_stop : int
+        Out-of-sample bars ``[oos_start, oos_stop)``; ``oos_start`` is
+        always ``is_stop``.
+    """
+    is_start: int
+    is_stop: int
+    oos_start: int
+    oos_stop: int
+
+
+@dataclass(frozen=True)
+class WalkForwardResult:
+    """
+    Outcome of a walk-forward run.
+
+    Attributes
+    ----------
+    windows : pd.DataFrame
+        One row per window: IS/OOS bounds (first and last bar
+        timestamps), the chosen ``ema_fast``/``ema_slow``, the IS
+        objective value and trade count, the OOS trade count and net
+        PnL (trades exiting in the window), and ``boundary_closes``: 1
+        if an open position was force-closed at the window's last bar
+        because the next window trades another pair, else 0.
+    ledger : Ledger
+        OOS trades of every window, in time order.
+    trades : pd.DataFrame
+        ``ledger.to_dataframe()``.
+    equity : pd.Series
+        Equity curve of the stitched OOS trades over the OOS bars.
+    """
+    windows: pd.DataFrame
+    ledger: Ledger
+    trades: pd.DataFrame
+    equity: pd.Series
+
+
+def build_windows(
+    n_bars: int,
+    is_bars: int,
+    oos_bars: int,
+    anchored: bool = False,
+) -> list[WalkForwardWindow]:
+    """
+    Consecutive IS/OOS windows covering bars ``is_bars`` to ``n_bars``.
+
+    Parameters
+    ----------
+    n_bars : int
+        Number of M5 bars in the history.
+    is_bars, oos_bars : int
+        In-sample and out-of-sample window lengths.
+    anchored : bool
+        If True every IS window starts at bar 0 (growing IS); otherwise
+        it is the ``is_bars`` bars before its OOS window.
+
+    Returns
+    -------
+    list[WalkForwardWindow]
+
+    Raises
+    ------
+    ValueError
+        If a length is not positive or no OOS bar remains after the
+        first IS window.
+    """
+    if is_bars < 1 or oos_bars < 1:
+        raise ValueError("Walk-forward IS and OOS lengths must be positive.")
+    if is_bars >= n_bars:
+        raise ValueError(
+            f"Walk-forward IS length ({is_bars} bars) leaves no OOS bars "
+            f"in {n_bars} bars."
+        )
+
+    windows = []
+    for oos_start in range(is_bars, n_bars, oos_bars):
+        windows.append(
+            WalkForwardWindow(
+                is_start=0 if anchored else oos_start - is_bars,
+                is_stop=oos_start,
+                oos_start=oos_start,
+                oos_stop=min(oos_start + oos_bars, n_bars),
+            )
+        )
+    return windows
+
+
+def _signal_events(
+    close: pd.Series,
+    pairs: Sequence[tuple[int, int]],
+    warmup_bars: int,
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    Full-history crossover signals of every pair, as (bar positions,
+    signal values) of the non-zero bars.
+    """
+    periods = sorted({p for pair in pairs for p in pair})
+    column_of = {p: k for k, p in enumerate(periods)}
+    ema_matrix = compute_ema_matrix(close, periods, warmup_bars)
+    fast_cols = np.array([column_of[f] for f, _ in pairs], dtype=np.intp)
+    slow_cols = np.array([column_of[s] for _, s in pairs], dtype=np.intp)
+
+    events = []
+    batch = max(1, S.SWEEP_PAIR_BATCH)
+    for start in range(0, len(pairs), batch):
+        stop = min(start + batch, len(pairs))
+        signal_matrix = generate_crossover_signal_matrix(
+            ema_matrix, fast_cols[start:stop], slow_cols[start:stop]
+        )
+        for k in range(stop - start):
+            column = signal_matrix[:, k]
+            positions = np.flatnonzero(column)
+            events.append((positions, column[positions]))
+    return events
+
+
+def _window_signals(
+    events: tuple[np.ndarray, np.ndarray],
+    index: pd.DatetimeIndex,
+    start: int,
+    stop: int,
+) -> pd.Series:
+    """Dense signal column of one pair over bars ``[start, stop)``."""
+    positions, values = events
+    lo, hi = np.searchsorted(positions, (start, stop))
+    signal = np.zeros(stop - start, dtype=np.int8)
+    signal[positions[lo:hi] - start] = values[lo:hi]
+    return pd.Series(signal, index=index[start:stop])
+
+
+def run_walk_forward(
+    df_m5: pd.DataFrame,
+    pairs: Optional[Sequence[tuple[int, int]]] = None,
+    is_bars: Optional[int] = None,
+    oos_bars: Optional[int] = None,
+    anchored: Optional[bool] = None,
+    objective: Optional[str] = None,
+    min_trades: Optional[int] = None,
+    mode: Optional[str] = None,
+    config: Optional[RunConfig] = None,
+) -> WalkForwardResult:
+    """
+    Optimise the EMA periods on each IS window and trade them on the
+    following OOS window.
+
+    Parameters
+    ----------
+    df_m5 : pd.DataFrame
+        Prepared M5 bars (see ``main.prepare_m5_bars``).
+    pairs : sequence of (int, int), optional
+        Candidate (fast, slow) pairs. Default: the grid of
+        settings.WALK_FORWARD_FAST_PERIODS × WALK_FORWARD_SLOW_PERIODS.
+    is_bars, oos_bars : int, optional
+        Window lengths. Default: settings.WALK_FORWARD_IS_BARS and
+        settings.WALK_FORWARD_OOS_BARS.
+    anchored : bool, optional
+        Default: settings.WALK_FORWARD_ANCHORED.
+    objective : str, optional
+        ``PerformanceSummary`` field to maximise.
+        Default: settings.WALK_FORWARD_OBJECTIVE.
+    min_trades : int, optional
+        Minimum IS trades for a pair to be eligible.
+        Default: settings.WALK_FORWARD_MIN_TRADES.
+    mode : str, optional
+        Backtest engine mode passed to ``run_backtest``.
+    config : RunConfig, optional
+        Base configuration; each backtest runs with its EMA periods
+        replaced. Default: a snapshot of the current settings.
+
+    Returns
+    -------
+    WalkForwardResult
+
+    Raises
+    ------
+    ValueError
+        If the grid is empty, the objective is unknown, or the window
+        lengths do not fit the data.
+
+    Notes
+    -----
+    When no pair is eligible in a window, the previous window's pair is
+    kept (the configured ``ema_fast``/``ema_slow`` for the first window).
+    """
+    if config is None:
+        config = RunConfig.from_settings()
+    if pairs is None:
+        pairs = build_period_grid(
+            S.WALK_FORWARD_FAST_PERIODS, S.WALK_FORWARD_SLOW_PERIODS
+        )
+    if not pairs:
+        raise ValueError("Cannot walk forward over an empty period grid.")
+    objective = S.WALK_FORWARD_OBJECTIVE if objective is None else objective
+    if objective not in SUMMARY_FIELDS:
+        raise ValueError(
+            f"Unknown walk-forward objective {objective!r}; expected a "
+            f"PerformanceSummary field."
+        )
+    if min_trades is None:
+        min_trades = S.WALK_FORWARD_MIN_TRADES
+
+    windows = build_windows(
+        len(df_m5),
+        S.WALK_FORWARD_IS_BARS if is_bars is None else is_bars,
+        S.WALK_FORWARD_OOS_BARS if oos_bars is None else oos_bars,
+        S.WALK_FORWARD_ANCHORED if anchored is None else anchored,
+    )
+    pairs = list(pairs)
+    logger.info(
+        "Walk-forward: %d windows, %d pairs, %d bars, objective %s.",
+        len(windows), len(pairs), len(df_m5), objective,
+    )
+
+    # The configured pair is the fallback before any pair is eligible;
+    # its signals are prepared with the grid's if it is not in it.
+    candidates = list(pairs)
+    if (config.ema_fast, config.ema_slow) not in candidates:
+        candidates.append((config.ema_fast, config.ema_slow))
+    index = df_m5.index
+    events = _signal_events(
+        df_m5[C.COL_CLOSE], candidates, config.warmup_bars
+    )
+    configs = [
+        dataclasses.replace(config, ema_fast=fast, ema_slow=slow)
+        for fast, slow in candidates
+    ]
+
+    # 1. Score every pair on each window's IS bars.
+    chosen = candidates.index((config.ema_fast, config.ema_slow))
+    choices: list[int] = []
+    rows: list[dict[str, object]] = []
+    for n, window in enumerate(windows, start=1):
+        df_is = df_m5.iloc[window.is_start:window.is_stop]
+        scores = pd.DataFrame([
+            evaluate_pair(
+                df_is,
+                _window_signals(
+                    events[k], index, window.is_start, window.is_stop
+                ),
+                configs[k],
+                mode,
+            )
+            for k in range(len(pairs))
+        ])
+        score = pd.to_numeric(scores[objective], errors="coerce")
+        eligible = (scores["total_trades"] >= min_trades) & np.isfinite(score)
+        if eligible.any():
+            best = score[eligible].idxmax()
+            chosen = int(best)
+            is_value = float(score[best])
+            is_trades = int(scores.at[best, "total_trades"])
+        else:
+            logger.warning(
+                "Walk-forward window %d: no eligible pair; keeping EMA%s.",
+                n, candidates[chosen],
+            )
+            is_value = float("nan")
+            is_trades = 0
+
+        fast, slow = candidates[chosen]
+        choices.append(chosen)
+        rows.append({
+            "is_start": index[window.is_start],
+            "is_end": index[window.is_stop - 1],
+            "oos_start": index[window.oos_start],
+            "oos_end": index[window.oos_stop - 1],
+            "ema_fast": fast,
+            "ema_slow": slow,
+            f"is_{objective}": is_value,
+            "is_trades": is_trades,
+        })
+
+    # 2. Trade each run of same-pair windows on its joined OOS bars.
+    ledger = Ledger(config=config, price_ticks=is_tick_frame(df_m5))
+    index_ns = index.as_unit("ns").asi8
+    n_runs = 0
+    first = 0
+    while first < len(windows):
+        last = first
+        while last + 1 < len(windows) and choices[last + 1] == choices[first]:
+            last += 1
+        start, stop = windows[first].oos_start, windows[last].oos_stop
+        state = run_backtest(
+            df_m5.iloc[start:stop],
+            _window_signals(events[choices[first]], index, start, stop),
+            mode=mode,
+            config=configs[choices[first]],
+        )
+        ledger.extend(state.ledger)
+        n_runs += 1
+
+        # Credit each trade to the window its exit bar falls in.
+        exit_ns = state.ledger.column("exit_bar")
+        net_pnl = state.ledger.column("net_pnl")
+        cuts = np.searchsorted(
+            exit_ns,
+            [index_ns[w.oos_start] for w in windows[first + 1:last + 1]],
+        )
+        edges = [0, *cuts.tolist(), len(exit_ns)]
+        for k in range(first, last + 1):
+            lo, hi = edges[k - first], edges[k - first + 1]
+            row = rows[k]
+            row["oos_trades"] = hi - lo
+            row["oos_net_pnl"] = float(net_pnl[lo:hi].sum())
+            row["boundary_closes"] = int(
+                k == last and k + 1 < len(windows) and state.force_closed
+            )
+            logger.info(
+                "Walk-forward window %d/%d: EMA(%d, %d), IS %s=%.4g, "
+                "OOS %d trades, net %.2f.",
+                k + 1, len(windows), row["ema_fast"], row["ema_slow"],
+                objective, row[f"is_{objective}"],
+                row["oos_trades"], row["oos_net_pnl"],
+            )
+        first = last + 1
+
+    windows_df = pd.DataFrame(rows)
+    logger.info(
+        "Walk-forward: %d OOS run(s) over %d windows, %d boundary close(s).",
+        n_runs, len(windows), int(windows_df["boundary_closes"].sum()),
+    )
+
+    trades = ledger.to_dataframe()
+    oos_span = slice(windows[0].oos_start, windows[-1].oos_stop)
+    equity = build_equity_curve(
+        trades, index[oos_span], close=df_m5[C.COL_CLOSE].iloc[oos_span],
+        config=config,
+    )
+    return WalkForwardResult(
+        windows=windows_df,
+        ledger=ledger,
+        trades=trades,
+        equity=equity,
+    )
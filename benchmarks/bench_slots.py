@@ -0,0 +1,143 @@
+"""
+bench_slots.py
+==============
+Micro-benchmark for the per-bar hot path of the backtest.
+
+Measures, on a seeded synthetic M5 series:
+
+- the cost of one :meth:`PositionManager.evaluate_signal` call for a
+  no-signal bar, a same-direction bar and a reversal;
+- the number of memory blocks still allocated by
+  ``position_manager.py`` after a run of no-signal bars whose results
+  are all kept (shared ``Action`` singletons make this zero);
+- the wall time of the ``bar`` and ``array`` engines on the same
+  frame and signals.
+
+Usage
+-----
+    python -m benchmarks.bench_slots [--bars N] [--calls N] [--repeat N]
+
+Run it from the repository root. Numbers are machine-dependent; compare
+runs on the same machine only.
+
+This module does NOT download data and does NOT assert on timings.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import run_backtest
+from config import constants as C
+from config.run_config import RunConfig
+from execution.position_manager import Direction, PositionManager
+from indicators.ema import compute_ema_pair
+from signals.crossover import generate_crossover_signals
+
+
+def _synthetic_m5(n_bars: int, seed: int = 0) -> pd.DataFrame:
+    """Random-walk M5 bars on the tick grid, with a roll every ~20k bars."""
+    rng = np.random.default_rng(seed)
+    steps = rng.integers(-3, 4, size=n_bars)
+    close = 22_000 + np.cumsum(steps)
+    open_ = close - steps
+    index = pd.date_range(
+        "2015-01-01", periods=n_bars, freq="5min", tz="UTC", name=C.COL_TS
+    )
+    df = pd.DataFrame(
+        {
+            C.COL_OPEN: open_ * C.TICK_SIZE,
+            C.COL_HIGH: (np.maximum(open_, close) + 1) * C.TICK_SIZE,
+            C.COL_LOW: (np.minimum(open_, close) - 1) * C.TICK_SIZE,
+            C.COL_CLOSE: close * C.TICK_SIZE,
+            C.COL_VOLUME: rng.integers(1, 100, size=n_bars),
+        },
+        index=index,
+    )
+    df["contains_roll"] = np.arange(n_bars) % 20_000 == 19_999
+    return df
+
+
+def _time_evaluate_signal(n_calls: int) -> dict[int, float]:
+    """Nanoseconds per ``evaluate_signal`` call while long, per signal."""
+    results: dict[int, float] = {}
+    for signal in (0, 1, -1):
+        position = PositionManager()
+        position.on_open(Direction.LONG, 0)
+        evaluate = position.evaluate_signal
+        start = time.perf_counter()
+        for i in range(n_calls):
+            evaluate(signal, i)
+        results[signal] = 1e9 * (time.perf_counter() - start) / n_calls
+    return results
+
+
+def _no_signal_blocks(n_calls: int) -> int:
+    """Blocks still allocated by the position manager after no-signal bars."""
+    position = PositionManager()
+    position.on_open(Direction.LONG, 0)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        kept = [position.evaluate_signal(0, i) for i in range(n_calls)]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del kept
+    stats = after.compare_to(before, "filename")
+    return sum(
+        s.count_diff for s in stats
+        if s.traceback[0].filename.endswith("position_manager.py")
+    )
+
+
+def _time_engine(
+    df_m5: pd.DataFrame,
+    signals: pd.Series,
+    mode: str,
+    repeat: int,
+    config: RunConfig,
+) -> float:
+    """Best wall time in seconds of ``repeat`` backtests in ``mode``."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_backtest(df_m5, signals, mode=mode, config=config)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--bars", type=int, default=100_000)
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    config = RunConfig.from_settings()
+
+    for signal, ns in _time_evaluate_signal(args.calls).items():
+        print(f"evaluate_signal({signal:+d})     {ns:8.0f} ns/call")
+    blocks = _no_signal_blocks(100_000)
+    print(f"no-signal blocks / 100k bars  {blocks:8d}")
+
+    df_m5 = _synthetic_m5(args.bars)
+    fast, slow = compute_ema_pair(df_m5[C.COL_CLOSE], config=config)
+    signals = generate_crossover_signals(fast, slow)
+    for mode in ("bar", "array"):
+        seconds = _time_engine(df_m5, signals, mode, args.repeat, config)
+        print(
+            f"engine {mode:<5}  {seconds:8.3f} s  "
+            f"({1e9 * seconds / args.bars:6.0f} ns/bar, {args.bars} bars)"
+        )
+
+
+if __name__ == "__main__":
+    main()
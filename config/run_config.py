@@ -0,0 +1,141 @@
+"""
+run_config.py
+=============
+Immutable per-run configuration.
+
+``config/settings.py`` remains the single source of truth for default
+values. A ``RunConfig`` snapshots the run-dependent subset of those
+values once, and is then passed explicitly to the indicator, execution,
+ledger and backtest layers. Two runs with different configurations can
+therefore execute in the same process without touching module globals.
+
+The price offsets of a fill and the round-trip commission are derived
+from those values once, when the config is built, so the fill and
+ledger code reads them as plain attributes.
+
+A ``RunConfig`` holds only numbers, so it is hashable and its hash is
+stable across processes. Equal configurations on the same data produce
+equal results, which makes the object usable as a memoization key
+(see :meth:`RunConfig.cache_key` for a persistent string form).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+from dataclasses import dataclass, field
+
+from config import constants as C
+from config import settings as S
+
+
+@dataclass(frozen=True)
+class RunConfig:
+    """
+    Run-dependent parameters, resolved once per backtest.
+
+    Attributes
+    ----------
+    ema_fast : int
+        Fast EMA period.
+    ema_slow : int
+        Slow EMA period.
+    warmup_bars : int
+        Bars masked as NaN at the start of every EMA.
+    slippage_ticks : int
+        Adverse ticks per normal fill.
+    roll_close_slippage_ticks : int
+        Adverse ticks per forced roll-close fill.
+    roll_freeze_bars_post : int
+        Post-roll freeze length in M5 bars.
+    commission_per_side : float
+        USD per contract per side.
+    contracts : int
+        Fixed position size.
+    slippage_amount : float
+        Derived: price offset of a normal fill
+        (slippage_ticks × TICK_SIZE).
+    roll_slippage_amount : float
+        Derived: price offset of a roll force-close fill.
+    round_trip_commission : float
+        Derived: commission for both sides of one round trip, all
+        contracts.
+    """
+    ema_fast: int
+    ema_slow: int
+    warmup_bars: int
+    slippage_ticks: int
+    roll_close_slippage_ticks: int
+    roll_freeze_bars_post: int
+    commission_per_side: float
+    contracts: int
+
+    # Derived in __post_init__; not settings, not compared or hashed.
+    slippage_amount: float = field(init=False, repr=False, compare=False)
+    roll_slippage_amount: float = field(
+        init=False, repr=False, compare=False
+    )
+    round_trip_commission: float = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        derived = {
+            "slippage_amount": self.slippage_ticks * C.TICK_SIZE,
+            "roll_slippage_amount": (
+                self.roll_close_slippage_ticks * C.TICK_SIZE
+            ),
+            "round_trip_commission": (
+                self.commission_per_side * 2 * self.contracts
+            ),
+        }
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_settings(cls, **overrides: object) -> "RunConfig":
+        """
+        Build a config from the current ``config.settings`` values.
+
+        Parameters
+        ----------
+        **overrides
+            Field values that replace the settings defaults.
+
+        Returns
+        -------
+        RunConfig
+
+        Raises
+        ------
+        TypeError
+            If an override does not name a RunConfig field.
+        """
+        values = {
+            f.name: getattr(S, f.name.upper())
+            for f in dataclasses.fields(cls)
+            if f.init
+        }
+        unknown = set(overrides) - set(values)
+        if unknown:
+            raise TypeError(f"Unknown RunConfig fields: {sorted(unknown)}")
+        values.update(overrides)
+        return cls(**values)
+
+    def as_dict(self) -> dict[str, object]:
+        """The settings-backed fields by name (derived values omitted)."""
+        return {
+            f.name: getattr(self, f.name)
+            for f in dataclasses.fields(self)
+            if f.init
+        }
+
+    def cache_key(self) -> str:
+        """
+        Stable hex digest of the field values.
+
+        Unlike ``hash()``, the digest is suitable for on-disk caches and
+        for comparing runs across interpreter sessions.
+        """
+        payload = repr(tuple(self.as_dict().values())).encode()
+        return hashlib.sha256(payload).hexdigest()[:16]
@@ -28,12 +28,64 @@ DATABENTO_API_KEY: str = os.environ.get("DATABENTO_API_KEY", "")
 DATA_START: str = "2019-01-01T00:00:00"
 DATA_END: str = "2024-01-01T00:00:00"
 
+# Partitioned download (data.downloader.download_partitioned): one request
+# per calendar month, DOWNLOAD_MAX_WORKERS in flight, each retried up to
+# DOWNLOAD_MAX_RETRIES times with exponential backoff.
+DOWNLOAD_MAX_WORKERS: int = 4
+DOWNLOAD_MAX_RETRIES: int = 3
+DOWNLOAD_RETRY_BACKOFF_SECONDS: float = 2.0
+
+# Raw M1 layout: "file" — one Parquet file (download()); "partitioned" —
+# year/month dataset (download_partitioned()), from which time-windowed
+# loads open only the overlapping months.
+RAW_DATA_LAYOUT: str = "file"
+
+# Raw M1 loading: "arrow" reads only timestamp/OHLCV/instrument_id columns
+# through pyarrow projection; "pandas" (reference) reads every column.
+LOAD_ENGINE: str = "arrow"
+
+# Integer-tick prices: OHLC are stored as whole multiples of TICK_SIZE from
+# load time onward, so fills are integer additions and PnL is
+# ticks_moved × TICK_VALUE. int32 holds 6E prices and halves price memory.
+PRICE_TICKS: bool = False
+PRICE_TICK_DTYPE: str = "int32"   # "int32" or "int64"
+
+# ---------------------------------------------------------------------------
+# Streaming ingestion (data/ingest.py)
+# ---------------------------------------------------------------------------
+# Bars buffered per consumer queue. When a queue is full:
+#   "block"       — the producer waits (backpressure; nothing is lost);
+#   "drop_oldest" — the oldest queued bar is discarded (freshest data wins);
+#   "drop_newest" — the incoming bar is discarded.
+INGEST_QUEUE_MAXSIZE: int = 10_000
+INGEST_OVERFLOW: str = "block"
+# Sleep between polls when tailing a file that has no new complete line.
+INGEST_POLL_SECONDS: float = 0.05
+
 # ---------------------------------------------------------------------------
 # Resampling
 # ---------------------------------------------------------------------------
 RESAMPLE_FREQ: str = "5min"       # Target bar frequency
 RESAMPLE_CLOSED: str = "left"     # Interval closure convention
 RESAMPLE_LABEL: str = "left"      # Bar label convention
+RESAMPLE_ENGINE: str = "numpy"    # "pandas" (reference) or "numpy" (array)
+
+# Streaming resample: read the raw M1 file in batches of STREAM_BATCH_ROWS
+# and write M5 bars incrementally. Peak memory is bounded by the batch.
+RESAMPLE_STREAMING: bool = False
+STREAM_BATCH_ROWS: int = 1_000_000
+
+# ---------------------------------------------------------------------------
+# M5 cache
+# Resampled bars are cached by raw-file hash + resample/session settings.
+# ---------------------------------------------------------------------------
+M5_CACHE_ENABLED: bool = True
+M5_CACHE_DIR: Path = DATA_DIR / "m5_cache"
+M5_CACHE_MAX_BYTES: int = 2 * 1024 ** 3   # LRU eviction above this size
+# Also store each entry as an uncompressed Arrow IPC file and serve hits by
+# memory-mapping it: columns are zero-copy read-only views, so concurrent
+# processes share one copy of the bars in the OS page cache.
+M5_CACHE_MMAP: bool = True
 
 # ---------------------------------------------------------------------------
 # Strategy parameters
@@ -52,7 +104,53 @@ IS_FRACTION: float = 0.70         # Proportion of data used for In-Sample
 # ---------------------------------------------------------------------------
 SLIPPAGE_TICKS: int = 1           # Ticks of adverse slippage per fill
 COMMISSION_PER_SIDE: float = 2.50 # USD per contract per side
-CONTRACTS: int = 1                # Fixed position size (single contract)
+# Fixed position size. Gross PnL and commission scale with it (before
+# RunConfig, CONTRACTS was ignored and trades were priced for 1 contract).
+CONTRACTS: int = 1
+
+# ---------------------------------------------------------------------------
+# Backtest engine
+# ---------------------------------------------------------------------------
+# "bar"   — reference loop over DataFrame rows (iloc per bar).
+# "array" — same logic over contiguous NumPy arrays; identical ledger.
+# "event" — visits only signal/roll bars; identical ledger.
+# "jit"   — numba-compiled state machine; falls back to "array" if numba
+#           is not installed.
+BACKTEST_ENGINE_MODE: str = "array"
+
+# Trade slots preallocated by each Ledger; storage doubles when full.
+LEDGER_INITIAL_CAPACITY: int = 1024
+
+# Equity curve: False steps only at trade exits; True also marks open
+# positions to each bar's close (drawdown/Sharpe see open-trade risk).
+EQUITY_MARK_TO_MARKET: bool = False
+
+# Performance/drawdown metrics: "pandas" (reference compute_performance +
+# compute_drawdown) or "fused" (one pass over the trade and equity arrays,
+# numba-compiled when available; no per-bar Series are allocated).
+METRICS_ENGINE: str = "fused"
+
+# ---------------------------------------------------------------------------
+# Parameter sweep
+# ---------------------------------------------------------------------------
+# Number of (fast, slow) pairs whose signals are materialised per batch.
+# Bounds peak memory at roughly n_bars × SWEEP_PAIR_BATCH × 8 bytes.
+SWEEP_PAIR_BATCH: int = 32
+
+# ---------------------------------------------------------------------------
+# Walk-forward optimisation (backtest/walk_forward.py)
+# ---------------------------------------------------------------------------
+# OOS windows of WALK_FORWARD_OOS_BARS bars, each optimised on the
+# WALK_FORWARD_IS_BARS bars before it (or on all prior bars if anchored).
+WALK_FORWARD_IS_BARS: int = 69_552      # ~1 trading year of M5 bars
+WALK_FORWARD_OOS_BARS: int = 17_388     # ~1 quarter
+WALK_FORWARD_ANCHORED: bool = False
+WALK_FORWARD_FAST_PERIODS: tuple[int, ...] = (10, 15, 20, 25, 30)
+WALK_FORWARD_SLOW_PERIODS: tuple[int, ...] = (40, 50, 60, 80, 100)
+# PerformanceSummary field maximised on each IS window; pairs with fewer
+# IS trades than WALK_FORWARD_MIN_TRADES are not eligible.
+WALK_FORWARD_OBJECTIVE: str = "sharpe_ratio"
+WALK_FORWARD_MIN_TRADES: int = 30
 
 # ---------------------------------------------------------------------------
 # Roll execution policy (Spec 1.3 — Minimalista)
@@ -72,6 +170,45 @@ ROLL_CLOSE_SLIPPAGE_TICKS: int = 2
 BOOTSTRAP_RESAMPLES: int = 1_000
 BOOTSTRAP_CONFIDENCE: float = 0.95
 BOOTSTRAP_RANDOM_SEED: int = 42
+# Resampling scheme:
+#   "iid"        — trades drawn independently (reference);
+#   "block"      — moving-block (Künsch): runs of BOOTSTRAP_BLOCK_LENGTH
+#                  consecutive trades, preserving serial correlation;
+#   "stationary" — Politis–Romano: geometric block lengths with mean
+#                  BOOTSTRAP_BLOCK_LENGTH, wrapping around the trade list.
+BOOTSTRAP_METHOD: str = "iid"
+# None: round(n_trades ** (1/3)), the usual rate-optimal order.
+BOOTSTRAP_BLOCK_LENGTH: int | None = None
+# Resamples are drawn in batches of BOOTSTRAP_BATCH_ELEMENTS // n_trades
+# rows. Bounds peak memory at roughly BOOTSTRAP_BATCH_ELEMENTS × 40 bytes
+# (stationary; about half for iid) whatever BOOTSTRAP_RESAMPLES is.
+BOOTSTRAP_BATCH_ELEMENTS: int = 2_000_000
+# False: keep only a quantile sketch of BOOTSTRAP_SKETCH_SIZE values per
+# level instead of the full resampled-expectancy array (CI bounds are then
+# approximate, within ~2/BOOTSTRAP_SKETCH_SIZE in rank).
+BOOTSTRAP_KEEP_DISTRIBUTION: bool = True
+BOOTSTRAP_SKETCH_SIZE: int = 4096
+# Resamples are split over BOOTSTRAP_WORKERS independent random streams
+# (SeedSequence.spawn), run in a "process" or "thread" pool. Results depend
+# on the seed and the worker count; 1 runs in-process on the seed itself.
+BOOTSTRAP_WORKERS: int = 1
+BOOTSTRAP_EXECUTOR: str = "process"
+
+# ---------------------------------------------------------------------------
+# Monte Carlo trade-sequence simulation (metrics/monte_carlo.py)
+# ---------------------------------------------------------------------------
+MONTE_CARLO_PATHS: int = 10_000
+# "shuffle" (permute the trades) or a bootstrap scheme: "iid", "block",
+# "stationary" (see BOOTSTRAP_METHOD).
+MONTE_CARLO_METHOD: str = "shuffle"
+MONTE_CARLO_BLOCK_LENGTH: int | None = None   # None: round(n ** (1/3))
+MONTE_CARLO_RANDOM_SEED: int = 42
+# Account equity before the first trade, and the loss (fraction of it)
+# that counts as ruin.
+MONTE_CARLO_INITIAL_CAPITAL: float = 25_000.0
+MONTE_CARLO_RUIN_LOSS: float = 0.50
+# Working-memory budget for one batch of (paths × trades) simulations.
+MONTE_CARLO_MEMORY_BYTES: int = 256 * 1024 ** 2
 
 # ---------------------------------------------------------------------------
 # Risk-free rate (annualised, for Sharpe calculation)
@@ -0,0 +1,320 @@
+"""
+dataset_store.py
+================
+Year/month partitioned Parquet datasets with a time-range index.
+
+Layout
+------
+    <root>/
+        _index.json
+        year=2019/month=01/part.parquet
+        year=2019/month=02/part.parquet
+        ...
+
+Each partition holds the rows of one UTC calendar month, with the
+DataFrame index stored as a timestamp column. This is the layout written
+by ``data.downloader.download_partitioned`` for raw M1 data, and by
+:meth:`PartitionedDataset.write` for any time-indexed frame (the
+pipeline's M5 bars, see ``data.loader.m5_dataset_dir``).
+
+Index
+-----
+``_index.json`` records, per partition file, its row count and first/last
+timestamp. The bounds come from the Parquet footer statistics, so
+indexing reads no data pages. Entries are keyed by file size and
+modification time and refreshed automatically when a partition is added
+or rewritten by another writer.
+
+:meth:`PartitionedDataset.load` consults the index and opens only the
+partitions overlapping the requested ``[start, end)`` window; one month
+of M1 is about 30k rows.
+
+This module does NOT cast dtypes or validate the raw schema (see
+``data/loader.py``).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from config import constants as C
+
+logger = logging.getLogger(__name__)
+
+_INDEX_FILE: str = "_index.json"
+_PART_FILE: str = "part.parquet"
+_PART_GLOB: str = "year=*/month=*/*.parquet"
+
+_NS_PER_UNIT: dict[str, int] = {"s": 10**9, "ms": 10**6, "us": 10**3, "ns": 1}
+
+
+@dataclass(slots=True)
+class PartitionInfo:
+    """
+    Index entry of one partition file.
+
+    Attributes
+    ----------
+    file : str
+        Path relative to the dataset root.
+    rows : int
+    start_ns, end_ns : int
+        First and last timestamp (inclusive) as UTC epoch nanoseconds.
+        Both are 0 for an empty partition.
+    size, mtime_ns : int
+        File size and modification time when indexed.
+    """
+    file: str
+    rows: int
+    start_ns: int
+    end_ns: int
+    size: int
+    mtime_ns: int
+
+
+def _utc_ns(value: str | pd.Timestamp) -> int:
+    """UTC epoch nanoseconds of a window bound (naive values are UTC)."""
+    ts = pd.Timestamp(value)
+    ts = ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC")
+    return ts.as_unit("ns").value
+
+
+def _overlapping(
+    infos: list[PartitionInfo],
+    start: Optional[str | pd.Timestamp],
+    end: Optional[str | pd.Timestamp],
+) -> list[PartitionInfo]:
+    """Non-empty partitions with rows possibly in ``[start, end)``."""
+    lo = None if start is None else _utc_ns(start)
+    hi = None if end is None else _utc_ns(end)
+    return [
+        info for info in infos
+        if info.rows
+        and (hi is None or info.start_ns < hi)
+        and (lo is None or info.end_ns >= lo)
+    ]
+
+
+def _read_partition_info(path: Path, relative: str) -> PartitionInfo:
+    """Index one partition from its Parquet footer."""
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    from data.loader import index_column
+
+    stat = path.stat()
+    parquet = pq.ParquetFile(path)
+    metadata = parquet.metadata
+    ts_column = index_column(parquet.schema_arrow.pandas_metadata)
+    scale = _NS_PER_UNIT[parquet.schema_arrow.field(ts_column).type.unit]
+
+    lows: list[int] = []
+    highs: list[int] = []
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        if row_group.num_rows == 0:
+            continue
+        for j in range(row_group.num_columns):
+            chunk = row_group.column(j)
+            if chunk.path_in_schema == ts_column:
+                break
+        else:
+            raise ValueError(f"{path} has no {ts_column!r} column.")
+        stats = chunk.statistics
+        if stats is None or not stats.has_min_max:
+            lows, highs = [], []
+            break
+        lows.append(stats.min_raw * scale)
+        highs.append(stats.max_raw * scale)
+
+    if metadata.num_rows and not lows:
+        # No usable statistics: read the timestamp column alone.
+        ts = parquet.read(columns=[ts_column]).column(0)
+        bounds = pc.min_max(ts.cast("int64"))
+        lows = [bounds["min"].as_py() * scale]
+        highs = [bounds["max"].as_py() * scale]
+
+    return PartitionInfo(
+        file=relative,
+        rows=metadata.num_rows,
+        start_ns=min(lows) if lows else 0,
+        end_ns=max(highs) if highs else 0,
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+    )
+
+
+class PartitionedDataset:
+    """
+    A year/month partitioned Parquet dataset rooted at ``root``.
+
+    Parameters
+    ----------
+    root : Path
+        Dataset directory (created on first :meth:`write`).
+    """
+
+    __slots__ = ("root",)
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def exists(self) -> bool:
+        """True if the root holds at least one partition file."""
+        return self.root.is_dir() and any(self.root.glob(_PART_GLOB))
+
+    def partitions(self) -> list[PartitionInfo]:
+        """
+        Return the index, refreshed against the files on disk.
+
+        Partitions whose size or modification time changed since they
+        were indexed are re-read from their footers; vanished files are
+        dropped. The index file is rewritten only if something changed.
+
+        Returns
+        -------
+        list[PartitionInfo]
+            Sorted by first timestamp.
+        """
+        index_path = self.root / _INDEX_FILE
+        cached: dict[str, PartitionInfo] = {}
+        if index_path.exists():
+            with open(index_path) as f:
+                cached = {
+                    entry["file"]: PartitionInfo(**entry)
+                    for entry in json.load(f)["partitions"]
+                }
+
+        current: dict[str, PartitionInfo] = {}
+        changed = False
+        for path in sorted(self.root.glob(_PART_GLOB)):
+            relative = path.relative_to(self.root).as_posix()
+            stat = path.stat()
+            info = cached.get(relative)
+            if (
+                info is None
+                or info.size != stat.st_size
+                or info.mtime_ns != stat.st_mtime_ns
+            ):
+                info = _read_partition_info(path, relative)
+                changed = True
+            current[relative] = info
+        changed = changed or current.keys() != cached.keys()
+
+        infos = sorted(current.values(), key=lambda p: (p.start_ns, p.file))
+        if changed and self.root.is_dir():
+            tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(
+                    {"partitions": [asdict(info) for info in infos]},
+                    f, indent=1,
+                )
+            os.replace(tmp_path, index_path)
+            logger.debug("Dataset index refreshed: %s", index_path)
+        return infos
+
+    def files(
+        self,
+        start: Optional[str | pd.Timestamp] = None,
+        end: Optional[str | pd.Timestamp] = None,
+    ) -> list[Path]:
+        """
+        Partition files that may hold rows in ``[start, end)``, in time
+        order. Empty partitions are skipped.
+        """
+        return [
+            self.root / info.file
+            for info in _overlapping(self.partitions(), start, end)
+        ]
+
+    def load(
+        self,
+        start: Optional[str | pd.Timestamp] = None,
+        end: Optional[str | pd.Timestamp] = None,
+        columns: Optional[list[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Load the rows in ``[start, end)`` from the overlapping partitions.
+
+        Parameters
+        ----------
+        start, end : str or pd.Timestamp, optional
+            Window bounds; naive values are UTC. Default: unbounded.
+        columns : list[str], optional
+            Columns to read (the index is always restored).
+
+        Returns
+        -------
+        pd.DataFrame
+            Rows in file order with the stored index, as written. Empty
+            if no partition overlaps the window.
+        """
+        infos = self.partitions()
+        files = [self.root / info.file for info in _overlapping(infos, start, end)]
+        if not files:
+            return pd.DataFrame(columns=columns)
+
+        frames = [pd.read_parquet(path, columns=columns) for path in files]
+        df = frames[0] if len(frames) == 1 else pd.concat(frames)
+
+        # Only the edge partitions can hold rows outside the window.
+        if start is not None:
+            df = df[df.index >= pd.Timestamp(_utc_ns(start), tz="UTC")]
+        if end is not None:
+            df = df[df.index < pd.Timestamp(_utc_ns(end), tz="UTC")]
+
+        logger.info(
+            "Loaded %d rows from %d of %d partitions in %s.",
+            len(df), len(files), len(infos), self.root,
+        )
+        return df
+
+    def write(self, df: pd.DataFrame) -> list[str]:
+        """
+        Write a time-indexed frame, one file per UTC calendar month.
+
+        Each touched partition is replaced as a whole (written to a
+        temporary file and renamed); untouched partitions are kept. The
+        index is refreshed afterwards.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Frame with a tz-aware DatetimeIndex.
+
+        Returns
+        -------
+        list[str]
+            Names of the partitions written (``"year=YYYY/month=MM"``).
+
+        Raises
+        ------
+        ValueError
+            If the index is not a tz-aware DatetimeIndex.
+        """
+        if not isinstance(df.index, pd.DatetimeIndex) or df.index.tz is None:
+            raise ValueError("Dataset frames need a tz-aware DatetimeIndex.")
+        if df.index.name is None:
+            df = df.rename_axis(C.COL_TS)
+
+        months = df.index.tz_convert("UTC").tz_localize(None).to_period("M")
+        written = []
+        for month, part in df.groupby(months, sort=True):
+            name = f"year={month.year:04d}/month={month.month:02d}"
+            path = self.root / name / _PART_FILE
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            part.to_parquet(tmp_path, index=True)
+            os.replace(tmp_path, path)
+            written.append(name)
+
+        self.partitions()   # refresh the index
+        logger.info("Wrote %d partition(s) to %s.", len(written), self.root)
+        return written
@@ -2,7 +2,17 @@
 downloader.py
 =============
 Responsible for fetching raw M1 OHLCV data from Databento and
-persisting it to disk as a Parquet file.
+persisting it to disk as Parquet.
+
+Two layouts are supported:
+
+  - :func:`download` — the whole range in one request, one file.
+  - :func:`download_partitioned` — one request per calendar month,
+    fetched concurrently with retry, written as a Hive-partitioned
+    dataset (``year=YYYY/month=MM/part.parquet``). The manifest records
+    each partition's requested range, row count, SHA-256, size and
+    mtime, so an interrupted run resumes where it stopped and extending
+    ``DATA_END`` fetches only the new months.
 
 This module performs NO transformation. Raw data is saved exactly
 as received from the provider.
@@ -13,7 +23,11 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Any, Optional
 
 import pandas as pd
 
@@ -23,7 +37,7 @@ from config import settings as S
 logger = logging.getLogger(__name__)
 
 
-def _compute_sha256(path: Path) -> str:
+def sha256_file(path: Path) -> str:
     """Return the SHA-256 hex digest of a file."""
     h = hashlib.sha256()
     with open(path, "rb") as f:
@@ -32,7 +46,7 @@ def _compute_sha256(path: Path) -> str:
     return h.hexdigest()
 
 
-def _raw_parquet_path() -> Path:
+def raw_parquet_path() -> Path:
     """Return the canonical path for the raw M1 Parquet file."""
     start = S.DATA_START[:10].replace("-", "")
     end = S.DATA_END[:10].replace("-", "")
@@ -42,22 +56,12 @@ def _raw_parquet_path() -> Path:
 
 def _manifest_path() -> Path:
     """Return the canonical path for the dataset manifest JSON."""
-    return _raw_parquet_path().with_suffix(".manifest.json")
+    return raw_parquet_path().with_suffix(".manifest.json")
 
 
-def download(force: bool = False) -> Path:
+def _databento_client() -> Any:
     """
-    Download raw M1 OHLCV data from Databento and save to Parquet.
-
-    Parameters
-    ----------
-    force : bool
-        If True, re-download even if the file already exists.
-
-    Returns
-    -------
-    Path
-        Path to the saved Parquet file.
+    Return a Databento Historical client for ``DATABENTO_API_KEY``.
 
     Raises
     ------
@@ -79,8 +83,34 @@ def download(force: bool = False) -> Path:
             "Install it with: pip install databento"
         ) from exc
 
+    return db.Historical(S.DATABENTO_API_KEY)
+
+
+def download(force: bool = False) -> Path:
+    """
+    Download raw M1 OHLCV data from Databento and save to Parquet.
+
+    Parameters
+    ----------
+    force : bool
+        If True, re-download even if the file already exists.
+
+    Returns
+    -------
+    Path
+        Path to the saved Parquet file.
+
+    Raises
+    ------
+    EnvironmentError
+        If DATABENTO_API_KEY is not set.
+    ImportError
+        If the `databento` package is not installed.
+    """
+    client = _databento_client()
+
     S.DATA_DIR.mkdir(parents=True, exist_ok=True)
-    out_path = _raw_parquet_path()
+    out_path = raw_parquet_path()
 
     if out_path.exists() and not force:
         logger.info("Raw data file already exists, skipping download: %s", out_path)
@@ -91,8 +121,6 @@ def download(force: bool = False) -> Path:
         C.SYMBOL_CONTINUOUS, S.DATA_START, S.DATA_END,
     )
 
-    client = db.Historical(S.DATABENTO_API_KEY)
-
     # Always estimate cost before committing to download.
     cost = client.metadata.get_cost(
         dataset=C.DATASET,
@@ -127,11 +155,15 @@ def download(force: bool = False) -> Path:
     return out_path
 
 
-def _write_manifest(parquet_path: Path) -> None:
-    """Write a dataset manifest JSON alongside the Parquet file."""
-    import databento as db  # type: ignore
+def _manifest_header() -> dict[str, Any]:
+    """Dataset description shared by both manifest layouts."""
+    try:
+        import databento as db  # type: ignore
+        sdk_version = getattr(db, "__version__", "unknown")
+    except ImportError:   # injected client
+        sdk_version = "unknown"
 
-    manifest = {
+    return {
         "dataset_root": C.INSTRUMENT,
         "roll_rule": C.SYMBOL_CONTINUOUS.split(".")[-1],
         "schema": C.SCHEMA,
@@ -139,14 +171,297 @@ def _write_manifest(parquet_path: Path) -> None:
         "start": S.DATA_START,
         "end": S.DATA_END,
         "spec_version": "1.2",
-        "databento_sdk_version": getattr(db, "__version__", "unknown"),
+        "databento_sdk_version": sdk_version,
         "python_version": __import__("sys").version,
         "download_timestamp_utc": pd.Timestamp.utcnow().isoformat(),
-        "sha256_raw_file": _compute_sha256(parquet_path),
     }
 
+
+def _write_manifest(parquet_path: Path) -> None:
+    """Write a dataset manifest JSON alongside the Parquet file."""
+    manifest = _manifest_header()
+    manifest["sha256_raw_file"] = sha256_file(parquet_path)
+
     manifest_path = _manifest_path()
     with open(manifest_path, "w") as f:
         json.dump(manifest, f, indent=2)
 
     logger.info("Manifest written to %s", manifest_path)
+
+
+# ---------------------------------------------------------------------------
+# Partitioned download
+# ---------------------------------------------------------------------------
+
+def raw_dataset_dir() -> Path:
+    """Return the root directory of the partitioned raw M1 dataset."""
+    return S.DATA_DIR / "6E_M1_continuous_c0"
+
+
+def _utc(value: str | pd.Timestamp) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC")
+
+
+def month_partitions(
+    start: str | pd.Timestamp,
+    end: str | pd.Timestamp,
+) -> list[tuple[str, pd.Timestamp, pd.Timestamp]]:
+    """
+    Split ``[start, end)`` into calendar-month pieces (UTC).
+
+    Returns
+    -------
+    list[tuple[str, pd.Timestamp, pd.Timestamp]]
+        ``(partition, part_start, part_end)`` in time order, where
+        ``partition`` is the Hive path ``"year=YYYY/month=MM"``. The first
+        and last pieces are clipped to ``start`` and ``end``.
+    """
+    start_ts, end_ts = _utc(start), _utc(end)
+    parts = []
+    month = start_ts.tz_localize(None).to_period("M")
+    while True:
+        lo = max(start_ts, month.start_time.tz_localize("UTC"))
+        hi = min(end_ts, (month + 1).start_time.tz_localize("UTC"))
+        if lo >= hi:
+            break
+        parts.append((f"year={month.year:04d}/month={month.month:02d}", lo, hi))
+        month += 1
+    return parts
+
+
+def _fetch_partition(
+    client: Any,
+    part_start: pd.Timestamp,
+    part_end: pd.Timestamp,
+    out_path: Path,
+) -> tuple[int, str]:
+    """
+    Fetch one partition with retry and write it atomically.
+
+    Returns
+    -------
+    tuple[int, str]
+        Row count and SHA-256 of the written file.
+
+    Raises
+    ------
+    Exception
+        The last error once ``DOWNLOAD_MAX_RETRIES`` retries are used up.
+    """
+    for attempt in range(S.DOWNLOAD_MAX_RETRIES + 1):
+        try:
+            data = client.timeseries.get_range(
+                dataset=C.DATASET,
+                symbols=[C.SYMBOL_CONTINUOUS],
+                stype_in=C.STYPE_IN,
+                stype_out=C.STYPE_OUT,
+                schema=C.SCHEMA,
+                start=part_start.isoformat(),
+                end=part_end.isoformat(),
+            )
+            df: pd.DataFrame = data.to_df()
+            break
+        except Exception as exc:
+            if attempt == S.DOWNLOAD_MAX_RETRIES:
+                raise
+            delay = S.DOWNLOAD_RETRY_BACKOFF_SECONDS * 2 ** attempt
+            logger.warning(
+                "Fetch %s – %s failed (%s); retry %d/%d in %.1f s.",
+                part_start, part_end, exc,
+                attempt + 1, S.DOWNLOAD_MAX_RETRIES, delay,
+            )
+            time.sleep(delay)
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    df.to_parquet(tmp_path, index=True)
+    os.replace(tmp_path, out_path)
+    return len(df), sha256_file(out_path)
+
+
+def _file_stamp(path: Path) -> dict[str, int]:
+    """Size and modification time of a file, as stored in the manifest."""
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _partition_is_current(
+    root: Path,
+    entry: Optional[dict[str, Any]],
+    part_start: pd.Timestamp,
+    part_end: pd.Timestamp,
+) -> bool:
+    """
+    True if a manifest entry covers the range and its file is intact.
+
+    A file whose size and mtime match the entry is trusted without
+    reading it. Otherwise it is hashed; if the SHA-256 still matches,
+    the entry's size and mtime are refreshed in place so the next run
+    skips the hash.
+    """
+    if entry is None:
+        return False
+    if (
+        entry["start"] != part_start.isoformat()
+        or entry["end"] != part_end.isoformat()
+    ):
+        return False
+    path = root / entry["file"]
+    if not path.exists():
+        return False
+    stamp = _file_stamp(path)
+    if all(entry.get(key) == value for key, value in stamp.items()):
+        return True
+    if sha256_file(path) != entry["sha256"]:
+        return False
+    entry.update(stamp)
+    return True
+
+
+def download_partitioned(
+    force: bool = False,
+    client: Any = None,
+    max_workers: Optional[int] = None,
+) -> Path:
+    """
+    Download ``[DATA_START, DATA_END)`` as monthly Parquet partitions.
+
+    Partitions already recorded in the manifest with the same requested
+    range and an unchanged file are kept; a file is re-hashed only when
+    its size or mtime differs from the manifest. The others — new
+    months, a month whose range grew because ``DATA_END`` moved, or
+    files that are missing or corrupt — are fetched concurrently. The
+    manifest is rewritten after every completed partition, so an
+    interrupted run resumes from there.
+
+    Partitions outside ``[DATA_START, DATA_END)``, left by an earlier and
+    wider range, stay on disk and in the manifest and are logged. The
+    manifest's ``wanted`` list names the partitions of the current range.
+
+    Parameters
+    ----------
+    force : bool
+        If True, re-fetch every partition.
+    client : object, optional
+        Object with the ``metadata.get_cost`` / ``timeseries.get_range``
+        interface of ``databento.Historical``. Default: a Databento
+        client for ``DATABENTO_API_KEY``.
+    max_workers : int, optional
+        Concurrent requests. Default: settings.DOWNLOAD_MAX_WORKERS.
+
+    Returns
+    -------
+    Path
+        Root directory of the dataset.
+
+    Raises
+    ------
+    EnvironmentError, ImportError
+        If no client is given and Databento is not configured.
+    RuntimeError
+        If some partitions still fail after all retries. Completed
+        partitions are kept in the manifest.
+    """
+    if max_workers is None:
+        max_workers = S.DOWNLOAD_MAX_WORKERS
+
+    root = raw_dataset_dir()
+    root.mkdir(parents=True, exist_ok=True)
+    manifest_path = root / "manifest.json"
+
+    recorded: dict[str, Any] = {}
+    if manifest_path.exists() and not force:
+        with open(manifest_path) as f:
+            recorded = json.load(f)
+    partitions: dict[str, dict[str, Any]] = recorded.get("partitions", {})
+    loaded = json.dumps(partitions, sort_keys=True)
+
+    wanted = month_partitions(S.DATA_START, S.DATA_END)
+    wanted_names = [name for name, _, _ in wanted]
+    missing = [
+        (name, lo, hi) for name, lo, hi in wanted
+        if not _partition_is_current(root, partitions.get(name), lo, hi)
+    ]
+    logger.info(
+        "%d monthly partitions in range, %d to fetch.",
+        len(wanted), len(missing),
+    )
+    outside = sorted(set(partitions) - set(wanted_names))
+    if outside:
+        logger.warning(
+            "%d partition(s) outside [%s, %s) kept on disk but not in "
+            "range: %s", len(outside), S.DATA_START, S.DATA_END, outside,
+        )
+
+    def write_manifest() -> None:
+        manifest = _manifest_header()
+        manifest["wanted"] = wanted_names
+        manifest["partitions"] = dict(sorted(partitions.items()))
+        tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+    if not missing:
+        # Persist refreshed file stamps or a changed range.
+        if (
+            json.dumps(partitions, sort_keys=True) != loaded
+            or recorded.get("wanted") != wanted_names
+        ):
+            write_manifest()
+        return root
+
+    if client is None:
+        client = _databento_client()
+
+    # Always estimate cost before committing to download.
+    cost = client.metadata.get_cost(
+        dataset=C.DATASET,
+        symbols=[C.SYMBOL_CONTINUOUS],
+        stype_in=C.STYPE_IN,
+        schema=C.SCHEMA,
+        start=missing[0][1].isoformat(),
+        end=missing[-1][2].isoformat(),
+    )
+    logger.info("Estimated download cost: $%.4f", cost)
+
+    failures: dict[str, BaseException] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(
+                _fetch_partition, client, lo, hi, root / name / "part.parquet"
+            ): (name, lo, hi)
+            for name, lo, hi in missing
+        }
+        # Manifest updates happen here, on the calling thread only.
+        for future in as_completed(futures):
+            name, lo, hi = futures[future]
+            try:
+                rows, digest = future.result()
+            except Exception as exc:
+                logger.error("Partition %s failed: %s", name, exc)
+                failures[name] = exc
+                continue
+            file = f"{name}/part.parquet"
+            partitions[name] = {
+                "file": file,
+                "start": lo.isoformat(),
+                "end": hi.isoformat(),
+                "rows": rows,
+                "sha256": digest,
+                **_file_stamp(root / file),
+            }
+            write_manifest()
+            logger.info("Partition %s: %d rows.", name, rows)
+
+    if failures:
+        write_manifest()
+        first = next(iter(failures.values()))
+        raise RuntimeError(
+            f"{len(failures)} partition(s) failed after retries: "
+            f"{sorted(failures)}. Re-run to resume."
+        ) from first
+
+    logger.info("Raw dataset complete: %s", root)
+    return root
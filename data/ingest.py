@@ -0,0 +1,520 @@
+"""
+ingest.py
+=========
+Asyncio market-data ingestion with bounded per-consumer queues.
+
+``download()`` in ``data/downloader.py`` is a one-shot blocking request
+that holds the whole response in memory. This module is its streaming
+counterpart: a *source* yields M1 bars as they arrive, and an
+:class:`IngestionService` fans each bar out to one bounded queue per
+*consumer* (e.g. the M5 resampler and the strategy driver). Reading the
+next bar overlaps with the consumers' processing of earlier ones.
+
+Sources
+-------
+A source is any async iterable of :class:`M1Bar`. Provided:
+
+  - :func:`tail_file`      — lines appended to a text file (``follow=True``
+                             waits for new lines, like ``tail -f``);
+  - :func:`read_socket`    — lines from a TCP socket;
+  - :func:`replay_parquet` — rows of a raw M1 Parquet file.
+
+Text sources use one bar per line:
+``ts_ns,open,high,low,close,volume[,instrument_id]`` (see
+:func:`format_bar_line`).
+
+Backpressure
+------------
+Each queue holds at most ``settings.INGEST_QUEUE_MAXSIZE`` bars. When a
+queue is full, ``settings.INGEST_OVERFLOW`` decides: ``"block"`` makes
+the producer wait (nothing is lost; a slow consumer slows ingestion),
+``"drop_oldest"`` / ``"drop_newest"`` discard a bar and count it.
+Historical replays should use ``"block"``.
+
+Metrics
+-------
+Per queue, :class:`IngestMetrics` tracks bars received, delivered and
+dropped, current and maximum depth, time the producer spent blocked, and
+queue lag (enqueue → dequeue) in microseconds.
+
+Example
+-------
+    driver = LiveDriver()
+    service = IngestionService(
+        replay_parquet(path),
+        {"strategy": lambda bar: driver.on_m1_bar(*bar)},
+    )
+    metrics = asyncio.run(service.run())
+
+This module does NOT resample or evaluate signals.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+)
+
+from config import constants as C
+from config import settings as S
+
+logger = logging.getLogger(__name__)
+
+_OVERFLOW_POLICIES: tuple[str, ...] = ("block", "drop_oldest", "drop_newest")
+
+
+class M1Bar(NamedTuple):
+    """
+    One raw M1 bar, in the argument order of
+    :meth:`backtest.live.LiveDriver.on_m1_bar`.
+
+    Prices are tick counts in integer-tick mode.
+    """
+    ts_ns: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    instrument_id: Optional[int] = None
+
+
+def format_bar_line(bar: M1Bar) -> str:
+    """Serialise a bar as one line of the text source format."""
+    fields = [str(v) for v in bar[:6]]
+    if bar.instrument_id is not None:
+        fields.append(str(bar.instrument_id))
+    return ",".join(fields) + "\n"
+
+
+def parse_bar_line(line: str, price_ticks: bool = False) -> M1Bar:
+    """
+    Parse one line of the text source format.
+
+    Parameters
+    ----------
+    line : str
+        ``ts_ns,open,high,low,close,volume[,instrument_id]``.
+    price_ticks : bool
+        Parse prices as integer tick counts instead of floats.
+
+    Raises
+    ------
+    ValueError
+        If the line does not have 6 or 7 fields or a field is malformed.
+    """
+    fields = line.strip().split(",")
+    if len(fields) not in (6, 7):
+        raise ValueError(f"Malformed bar line: {line!r}")
+    price = int if price_ticks else float
+    return M1Bar(
+        int(fields[0]),
+        price(fields[1]),
+        price(fields[2]),
+        price(fields[3]),
+        price(fields[4]),
+        int(fields[5]),
+        int(fields[6]) if len(fields) == 7 else None,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+
+async def tail_file(
+    path: Path,
+    follow: bool = False,
+    poll_seconds: Optional[float] = None,
+    price_ticks: Optional[bool] = None,
+) -> AsyncIterator[M1Bar]:
+    """
+    Yield bars from lines appended to a text file.
+
+    Parameters
+    ----------
+    path : Path
+        File in the text source format.
+    follow : bool
+        If True, wait for new lines at end of file instead of stopping.
+        A trailing line without a newline is treated as still being
+        written and is not read until it is complete.
+    poll_seconds : float, optional
+        Sleep between polls at end of file.
+        Default: settings.INGEST_POLL_SECONDS.
+    price_ticks : bool, optional
+        Default: settings.PRICE_TICKS.
+    """
+    if poll_seconds is None:
+        poll_seconds = S.INGEST_POLL_SECONDS
+    if price_ticks is None:
+        price_ticks = S.PRICE_TICKS
+
+    with open(path) as f:
+        while True:
+            pos = f.tell()
+            line = f.readline()
+            if line.endswith("\n"):
+                if line.strip():
+                    yield parse_bar_line(line, price_ticks)
+                continue
+            if not follow:
+                if line.strip():
+                    yield parse_bar_line(line, price_ticks)
+                return
+            f.seek(pos)   # partial line: re-read once complete
+            await asyncio.sleep(poll_seconds)
+
+
+async def read_socket(
+    host: str,
+    port: int,
+    price_ticks: Optional[bool] = None,
+) -> AsyncIterator[M1Bar]:
+    """
+    Yield bars from newline-delimited lines on a TCP connection.
+
+    Stops when the peer closes the connection.
+
+    Parameters
+    ----------
+    host, port
+        Address of the bar server.
+    price_ticks : bool, optional
+        Default: settings.PRICE_TICKS.
+    """
+    if price_ticks is None:
+        price_ticks = S.PRICE_TICKS
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        async for raw in reader:
+            line = raw.decode()
+            if line.strip():
+                yield parse_bar_line(line, price_ticks)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def iter_parquet_bars(
+    raw_path: Optional[Path] = None,
+    batch_rows: Optional[int] = None,
+) -> Iterator[M1Bar]:
+    """
+    Yield the bars of a raw M1 Parquet file (or, for a partitioned
+    dataset directory, of its partitions in time order).
+
+    The file is read in record batches of ``batch_rows`` rows with the
+    loader's dtype rules (tick counts when settings.PRICE_TICKS is set).
+
+    Parameters
+    ----------
+    raw_path : Path, optional
+        Default: the canonical location from settings.
+    batch_rows : int, optional
+        Default: settings.STREAM_BATCH_ROWS.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the raw file or dataset does not exist.
+    ValueError
+        If required columns are missing.
+    """
+    import pyarrow.parquet as pq
+
+    from data.loader import index_column, raw_sources
+    from preprocessing.stream_resampler import OHLCV_COLUMNS, batch_to_frame
+
+    if batch_rows is None:
+        batch_rows = S.STREAM_BATCH_ROWS
+    files = raw_sources(raw_path)
+
+    parquets = [pq.ParquetFile(path) for path in files]
+    schema = parquets[0].schema_arrow
+    ts_column = index_column(schema.pandas_metadata)
+
+    missing = [c for c in (ts_column, *OHLCV_COLUMNS) if c not in schema.names]
+    if missing:
+        raise ValueError(f"Missing required columns in raw data: {missing}")
+    has_instrument = C.COL_INSTRUMENT_ID in schema.names
+    columns = [ts_column, *OHLCV_COLUMNS]
+    if has_instrument:
+        columns.append(C.COL_INSTRUMENT_ID)
+
+    batches = (
+        batch
+        for parquet in parquets
+        for batch in parquet.iter_batches(batch_size=batch_rows, columns=columns)
+    )
+    for batch in batches:
+        if batch.num_rows == 0:
+            continue
+        chunk = batch_to_frame(batch, ts_column)
+        instruments = (
+            chunk[C.COL_INSTRUMENT_ID].tolist() if has_instrument
+            else [None] * len(chunk)
+        )
+        yield from map(M1Bar._make, zip(
+            chunk.index.as_unit("ns").asi8.tolist(),
+            chunk[C.COL_OPEN].tolist(),
+            chunk[C.COL_HIGH].tolist(),
+            chunk[C.COL_LOW].tolist(),
+            chunk[C.COL_CLOSE].tolist(),
+            chunk[C.COL_VOLUME].tolist(),
+            instruments,
+        ))
+
+
+async def replay_parquet(
+    raw_path: Optional[Path] = None,
+    batch_rows: Optional[int] = None,
+) -> AsyncIterator[M1Bar]:
+    """
+    Async source over :func:`iter_parquet_bars`.
+
+    The source itself never suspends; :class:`IngestionService` yields
+    to the consumers after every bar, so under ``"block"`` a replay runs
+    at consumer speed.
+    """
+    for bar in iter_parquet_bars(raw_path, batch_rows):
+        yield bar
+
+
+# ---------------------------------------------------------------------------
+# Queues and service
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True)
+class IngestMetrics:
+    """
+    Counters for one consumer queue.
+
+    Attributes
+    ----------
+    received : int
+        Bars offered to the queue.
+    delivered : int
+        Bars handed to the consumer.
+    dropped : int
+        Bars discarded by a drop overflow policy.
+    depth : int
+        Bars currently queued.
+    max_depth : int
+        Highest depth observed.
+    blocked_ns : int
+        Time the producer spent waiting on a full queue.
+    lag_total_ns, lag_max_ns : int
+        Sum and maximum of enqueue → dequeue delays of delivered bars.
+    """
+    received: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    depth: int = 0
+    max_depth: int = 0
+    blocked_ns: int = 0
+    lag_total_ns: int = 0
+    lag_max_ns: int = 0
+
+    @property
+    def lag_mean_us(self) -> float:
+        """Mean queue lag of delivered bars in microseconds."""
+        if self.delivered == 0:
+            return float("nan")
+        return self.lag_total_ns / self.delivered / 1_000
+
+    @property
+    def lag_max_us(self) -> float:
+        """Maximum queue lag in microseconds."""
+        return self.lag_max_ns / 1_000
+
+
+class BarQueue:
+    """
+    Bounded FIFO of bars for one consumer, with an overflow policy.
+
+    Parameters
+    ----------
+    maxsize : int
+        Capacity (must be positive).
+    overflow : str
+        ``"block"``, ``"drop_oldest"`` or ``"drop_newest"``.
+
+    Raises
+    ------
+    ValueError
+        If ``maxsize`` is not positive or ``overflow`` is unknown.
+    """
+
+    __slots__ = ("overflow", "metrics", "_queue")
+
+    def __init__(self, maxsize: int, overflow: str) -> None:
+        if maxsize <= 0:
+            raise ValueError(f"Queue size must be positive, got {maxsize}.")
+        if overflow not in _OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {overflow!r}; expected one of "
+                f"{_OVERFLOW_POLICIES}."
+            )
+        self.overflow = overflow
+        self.metrics = IngestMetrics()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    async def put(self, bar: M1Bar) -> None:
+        """Enqueue ``bar``, applying the overflow policy if full."""
+        metrics = self.metrics
+        queue = self._queue
+        metrics.received += 1
+        item = (time.perf_counter_ns(), bar)
+        if not queue.full():
+            queue.put_nowait(item)
+        elif self.overflow == "block":
+            t0 = time.perf_counter_ns()
+            await queue.put(item)
+            metrics.blocked_ns += time.perf_counter_ns() - t0
+        elif self.overflow == "drop_oldest":
+            queue.get_nowait()
+            queue.put_nowait(item)
+            metrics.dropped += 1
+        else:
+            metrics.dropped += 1
+        depth = queue.qsize()
+        metrics.depth = depth
+        if depth > metrics.max_depth:
+            metrics.max_depth = depth
+
+    async def close(self) -> None:
+        """Signal end of stream (waits for room, whatever the policy)."""
+        await self._queue.put((0, None))
+
+    async def get(self) -> Optional[M1Bar]:
+        """Next bar, or None once the queue is closed and drained."""
+        enqueued_ns, bar = await self._queue.get()
+        if bar is None:
+            return None
+        metrics = self.metrics
+        lag = time.perf_counter_ns() - enqueued_ns
+        metrics.delivered += 1
+        metrics.depth = self._queue.qsize()
+        metrics.lag_total_ns += lag
+        if lag > metrics.lag_max_ns:
+            metrics.lag_max_ns = lag
+        return bar
+
+
+class IngestionService:
+    """
+    Fans one bar source out to several consumers through bounded queues.
+
+    Parameters
+    ----------
+    source : AsyncIterable[M1Bar]
+        Bar source (see module docstring).
+    consumers : Mapping[str, Callable[[M1Bar], Any]]
+        Named consumers. Each is called once per bar, in order; it may be
+        a plain function or a coroutine function.
+    maxsize : int, optional
+        Per-consumer queue capacity. Default: settings.INGEST_QUEUE_MAXSIZE.
+    overflow : str, optional
+        Overflow policy. Default: settings.INGEST_OVERFLOW.
+
+    Raises
+    ------
+    ValueError
+        If no consumer is given, or on an invalid queue size or policy
+        (raised by :meth:`run`).
+    """
+
+    __slots__ = ("source", "consumers", "maxsize", "overflow", "queues")
+
+    def __init__(
+        self,
+        source: AsyncIterable[M1Bar],
+        consumers: Mapping[str, Callable[[M1Bar], Any]],
+        maxsize: Optional[int] = None,
+        overflow: Optional[str] = None,
+    ) -> None:
+        if not consumers:
+            raise ValueError("IngestionService needs at least one consumer.")
+        self.source = source
+        self.consumers = dict(consumers)
+        self.maxsize = S.INGEST_QUEUE_MAXSIZE if maxsize is None else maxsize
+        self.overflow = S.INGEST_OVERFLOW if overflow is None else overflow
+        self.queues: dict[str, BarQueue] = {}
+
+    async def run(self) -> dict[str, IngestMetrics]:
+        """
+        Ingest until the source is exhausted and every queue is drained.
+
+        Live metrics are readable from ``self.queues`` while running. If a
+        consumer raises, ingestion stops and the exception propagates.
+
+        Returns
+        -------
+        dict[str, IngestMetrics]
+            Final metrics per consumer.
+        """
+        self.queues = {
+            name: BarQueue(self.maxsize, self.overflow)
+            for name in self.consumers
+        }
+        queues = list(self.queues.values())
+
+        async def produce() -> None:
+            async for bar in self.source:
+                for queue in queues:
+                    await queue.put(bar)
+                # put() only suspends when a "block" queue is full; yield
+                # so consumers keep pace and drops reflect backpressure.
+                await asyncio.sleep(0)
+            for queue in queues:
+                await queue.close()
+
+        async def consume(queue: BarQueue, consumer: Callable) -> None:
+            is_async = inspect.iscoroutinefunction(consumer)
+            while True:
+                bar = await queue.get()
+                if bar is None:
+                    return
+                if is_async:
+                    await consumer(bar)
+                else:
+                    consumer(bar)
+
+        tasks = [asyncio.create_task(produce())] + [
+            asyncio.create_task(consume(self.queues[name], consumer))
+            for name, consumer in self.consumers.items()
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # A failed source or consumer would leave the others waiting.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        for name, queue in self.queues.items():
+            m = queue.metrics
+            logger.info(
+                "Ingest [%s]: %d received, %d delivered, %d dropped, "
+                "max depth %d, producer blocked %.3f s, "
+                "queue lag mean %.1f µs / max %.1f µs.",
+                name, m.received, m.delivered, m.dropped, m.max_depth,
+                m.blocked_ns / 1e9, m.lag_mean_us, m.lag_max_us,
+            )
+        return {name: q.metrics for name, q in self.queues.items()}
@@ -5,18 +5,39 @@ Loads the raw M1 Parquet file produced by downloader.py and validates
 that the schema contract between the data layer and the preprocessing
 layer is satisfied.
 
+Engines
+-------
+``settings.LOAD_ENGINE`` selects how the file is read:
+
+  - ``"pandas"`` — reference path: ``pd.read_parquet`` of every column
+    Databento delivered, followed by per-column dtype casts.
+  - ``"arrow"`` — projected path: pyarrow reads only the timestamp,
+    OHLCV and ``instrument_id`` columns, prunes row groups outside the
+    requested ``[start, end)`` window using the Parquet statistics, and
+    casts to the target dtypes before conversion. Numeric columns are
+    handed to pandas without consolidation copies and the UTC index is
+    built directly over the timestamp buffer.
+
+Both engines return the same frame for the columns they share. Each load
+logs its wall time, the frame size and the process peak RSS.
+
 This module does NOT resample or transform data.
 """
 
 from __future__ import annotations
 
 import logging
+import time
 from pathlib import Path
+from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 from config import constants as C
 from config import settings as S
+from data.dataset_store import PartitionedDataset
+from data.downloader import raw_dataset_dir, raw_parquet_path
 
 logger = logging.getLogger(__name__)
 
@@ -29,27 +50,169 @@ _REQUIRED_COLUMNS: tuple[str, ...] = (
     C.COL_VOLUME,
 )
 
+_PRICE_COLUMNS: tuple[str, ...] = (
+    C.COL_OPEN,
+    C.COL_HIGH,
+    C.COL_LOW,
+    C.COL_CLOSE,
+)
+
+
+def raw_data_path() -> Path:
+    """
+    Return the canonical raw M1 location for ``settings.RAW_DATA_LAYOUT``:
+    the single Parquet file or the partitioned dataset directory.
+
+    Raises
+    ------
+    ValueError
+        If the layout is unknown.
+    """
+    if S.RAW_DATA_LAYOUT == "file":
+        return raw_parquet_path()
+    if S.RAW_DATA_LAYOUT == "partitioned":
+        return raw_dataset_dir()
+    raise ValueError(
+        f"Unknown raw data layout {S.RAW_DATA_LAYOUT!r}; "
+        "expected 'file' or 'partitioned'."
+    )
+
+
+def m5_dataset_dir() -> Path:
+    """
+    Return the root of the partitioned M5 dataset.
+
+    With ``RAW_DATA_LAYOUT = "partitioned"`` the pipeline writes its
+    resampled bars there in the raw dataset's year/month layout; see
+    :func:`load_m5_bars`.
+    """
+    return S.DATA_DIR / "6E_M5_continuous_c0"
 
-def _raw_parquet_path() -> Path:
-    """Return the canonical path for the raw M1 Parquet file."""
-    start = S.DATA_START[:10].replace("-", "")
-    end = S.DATA_END[:10].replace("-", "")
-    filename = f"6E_M1_continuous_c0_{start}_{end}.parquet"
-    return S.DATA_DIR / filename
 
+def raw_window() -> tuple[Optional[str], Optional[str]]:
+    """
+    Return the ``(start, end)`` window the pipeline reads from
+    :func:`raw_data_path`.
 
-def load_raw_m1(path: Path | None = None) -> pd.DataFrame:
+    The partitioned dataset may hold months outside the configured range
+    (e.g. after ``DATA_START`` moved), so it is read over
+    ``[DATA_START, DATA_END)``. The single file holds exactly that range
+    and is read whole: ``(None, None)``.
+    """
+    if S.RAW_DATA_LAYOUT == "partitioned":
+        return S.DATA_START, S.DATA_END
+    return None, None
+
+
+def raw_sources(
+    path: Optional[Path] = None,
+    start: Optional[str | pd.Timestamp] = None,
+    end: Optional[str | pd.Timestamp] = None,
+) -> list[Path]:
+    """
+    Resolve a raw M1 location to the Parquet files to read, in time order.
+
+    ``path`` may be a single file or a partitioned dataset directory; for
+    a directory only the partitions overlapping ``[start, end)`` are
+    returned. Default: :func:`raw_data_path`.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file or dataset does not exist.
+    """
+    if path is None:
+        path = raw_data_path()
+    if path.is_dir():
+        dataset = PartitionedDataset(path)
+        if dataset.exists():
+            return dataset.files(start, end)
+    elif path.exists():
+        return [path]
+    raise FileNotFoundError(
+        f"Raw data file not found: {path}\n"
+        "Run downloader.download() first."
+    )
+
+
+def index_column(pandas_metadata: Optional[dict]) -> str:
+    """Name of the Parquet column holding the stored DataFrame index."""
+    if pandas_metadata:
+        for entry in pandas_metadata.get("index_columns", []):
+            if isinstance(entry, str):
+                return entry
+    return C.COL_TS
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (NaN if unavailable)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return float("nan")
+    # ru_maxrss is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def to_ticks(prices: np.ndarray) -> np.ndarray:
+    """
+    Convert float prices to whole multiples of TICK_SIZE.
+
+    The result has dtype ``settings.PRICE_TICK_DTYPE``.
+
+    Raises
+    ------
+    ValueError
+        If a tick count does not fit that dtype.
+    """
+    ticks = np.rint(prices / C.TICK_SIZE).astype(np.int64)
+    info = np.iinfo(S.PRICE_TICK_DTYPE)
+    if ticks.size and (ticks.min() < info.min or ticks.max() > info.max):
+        raise ValueError(
+            f"Tick prices do not fit {S.PRICE_TICK_DTYPE}; "
+            "set PRICE_TICK_DTYPE = 'int64'."
+        )
+    return ticks.astype(S.PRICE_TICK_DTYPE)
+
+
+def utc_bound(value: Optional[str | pd.Timestamp]) -> Optional[pd.Timestamp]:
+    """Parse a window bound as a UTC timestamp (naive values are UTC)."""
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC")
+
+
+def load_raw_m1(
+    path: Path | None = None,
+    start: Optional[str | pd.Timestamp] = None,
+    end: Optional[str | pd.Timestamp] = None,
+    price_ticks: Optional[bool] = None,
+    engine: Optional[str] = None,
+) -> pd.DataFrame:
     """
     Load the raw M1 Parquet file into a DataFrame.
 
-    The index is set to a UTC-aware DatetimeIndex. All OHLCV columns
-    are cast to float64. Volume is cast to int64.
+    The index is set to a UTC-aware DatetimeIndex. All OHLC columns
+    are cast to float64 (or integer ticks, see ``price_ticks``). Volume is
+    cast to int64.
 
     Parameters
     ----------
     path : Path, optional
-        Explicit path to the Parquet file. If None, the canonical path
-        derived from settings is used.
+        Explicit path to the Parquet file or partitioned dataset
+        directory. If None, the canonical location for
+        ``settings.RAW_DATA_LAYOUT`` is used.
+    start, end : str or pd.Timestamp, optional
+        Half-open time window ``[start, end)`` to load. Naive values are
+        interpreted as UTC. Default: the whole file. From a partitioned
+        dataset only the overlapping monthly partitions are opened.
+    price_ticks : bool, optional
+        If True, OHLC are returned as integer multiples of
+        ``constants.TICK_SIZE`` (dtype ``settings.PRICE_TICK_DTYPE``)
+        instead of float64 prices. Default: settings.PRICE_TICKS.
+    engine : str, optional
+        ``"arrow"`` or ``"pandas"``. Default: settings.LOAD_ENGINE.
 
     Returns
     -------
@@ -61,19 +224,116 @@ def load_raw_m1(path: Path | None = None) -> pd.DataFrame:
     FileNotFoundError
         If the Parquet file does not exist.
     ValueError
-        If required columns are missing or the index is not a DatetimeIndex.
+        If required columns are missing, the index is not a DatetimeIndex,
+        ``engine`` is unknown, or tick prices overflow their dtype.
     """
     if path is None:
-        path = _raw_parquet_path()
+        path = raw_data_path()
+    if engine is None:
+        engine = S.LOAD_ENGINE
+    if price_ticks is None:
+        price_ticks = S.PRICE_TICKS
+    if engine not in ("arrow", "pandas"):
+        raise ValueError(
+            f"Unknown load engine {engine!r}; expected 'arrow' or 'pandas'."
+        )
+
+    start_ts, end_ts = utc_bound(start), utc_bound(end)
+    files = raw_sources(path, start_ts, end_ts)
 
-    if not path.exists():
+    logger.info(
+        "Loading raw M1 data from %s (%d file(s), %s engine) ...",
+        path, len(files), engine,
+    )
+    rss_before = _peak_rss_mb()
+    t0 = time.perf_counter()
+    if not files:
+        df = _empty_m1_frame(price_ticks)
+    elif engine == "arrow":
+        df = _load_projected(files, start_ts, end_ts, price_ticks)
+    else:
+        df = _load_full(files, start_ts, end_ts, price_ticks)
+    elapsed = time.perf_counter() - t0
+    rss_after = _peak_rss_mb()
+
+    if df.empty:
+        logger.info("Loaded 0 rows in %.2f s.", elapsed)
+        return df
+
+    logger.info(
+        "Loaded %d rows from %s to %s.",
+        len(df),
+        df.index[0],
+        df.index[-1],
+    )
+    logger.info(
+        "Load: %.2f s, %d columns, %.1f MB in memory, "
+        "peak RSS %.0f MB (+%.0f MB during load).",
+        elapsed,
+        df.shape[1],
+        df.memory_usage(index=True, deep=True).sum() / 1e6,
+        rss_after,
+        rss_after - rss_before,
+    )
+    return df
+
+
+def load_m5_bars(
+    start: Optional[str | pd.Timestamp] = None,
+    end: Optional[str | pd.Timestamp] = None,
+    path: Optional[Path] = None,
+) -> pd.DataFrame:
+    """
+    Load resampled M5 bars in ``[start, end)`` from the partitioned M5
+    dataset, opening only the overlapping months.
+
+    Parameters
+    ----------
+    start, end : str or pd.Timestamp, optional
+        Window bounds; naive values are UTC. Default: unbounded.
+    path : Path, optional
+        Dataset root. Default: :func:`m5_dataset_dir`.
+
+    Returns
+    -------
+    pd.DataFrame
+        M5 OHLCV bars with the ``contains_roll`` column, as written.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the dataset does not exist.
+    """
+    if path is None:
+        path = m5_dataset_dir()
+    dataset = PartitionedDataset(path)
+    if not dataset.exists():
         raise FileNotFoundError(
-            f"Raw data file not found: {path}\n"
-            "Run downloader.download() first."
+            f"M5 dataset not found: {dataset.root}\n"
+            "Run the pipeline with RAW_DATA_LAYOUT = 'partitioned' first."
         )
+    return dataset.load(start, end)
+
+
+def _empty_m1_frame(price_ticks: bool) -> pd.DataFrame:
+    """Zero-row frame with the loader's columns and dtypes."""
+    price_dtype = S.PRICE_TICK_DTYPE if price_ticks else "float64"
+    columns = {col: pd.Series(dtype=price_dtype) for col in _PRICE_COLUMNS}
+    columns[C.COL_VOLUME] = pd.Series(dtype="int64")
+    return pd.DataFrame(
+        columns, index=pd.DatetimeIndex([], tz="UTC", name=C.COL_TS)
+    )
+
 
-    logger.info("Loading raw M1 data from %s ...", path)
-    df = pd.read_parquet(path)
+def _load_full(
+    files: list[Path],
+    start: Optional[pd.Timestamp],
+    end: Optional[pd.Timestamp],
+    price_ticks: bool,
+) -> pd.DataFrame:
+    """Reference loader: read every column, then cast."""
+    frames = [pd.read_parquet(path) for path in files]
+    df = frames[0] if len(frames) == 1 else pd.concat(frames)
 
     # Validate required columns.
     missing = [col for col in _REQUIRED_COLUMNS if col not in df.columns]
@@ -91,15 +351,98 @@ def load_raw_m1(path: Path | None = None) -> pd.DataFrame:
 
     df.index.name = C.COL_TS
 
+    if start is not None:
+        df = df[df.index >= start]
+    if end is not None:
+        df = df[df.index < end]
+
     # Enforce column dtypes.
-    for col in (C.COL_OPEN, C.COL_HIGH, C.COL_LOW, C.COL_CLOSE):
+    for col in _PRICE_COLUMNS:
         df[col] = df[col].astype("float64")
+        if price_ticks:
+            df[col] = to_ticks(df[col].to_numpy())
     df[C.COL_VOLUME] = df[C.COL_VOLUME].astype("int64")
+    return df
 
-    logger.info(
-        "Loaded %d rows from %s to %s.",
-        len(df),
-        df.index[0],
-        df.index[-1],
+
+def _load_projected(
+    files: list[Path],
+    start: Optional[pd.Timestamp],
+    end: Optional[pd.Timestamp],
+    price_ticks: bool,
+) -> pd.DataFrame:
+    """Projected loader: needed columns only, window pushed into the scan."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(files[0])
+    ts_column = index_column(schema.pandas_metadata)
+
+    missing = [col for col in _REQUIRED_COLUMNS if col not in schema.names]
+    if missing:
+        raise ValueError(f"Missing required columns in raw data: {missing}")
+    if ts_column not in schema.names or not pa.types.is_timestamp(
+        schema.field(ts_column).type
+    ):
+        raise ValueError("DataFrame index must be a DatetimeIndex.")
+
+    columns = [ts_column, *_REQUIRED_COLUMNS]
+    if C.COL_INSTRUMENT_ID in schema.names:
+        columns.append(C.COL_INSTRUMENT_ID)
+
+    # Row groups whose min/max statistics fall outside the window are
+    # skipped without being decoded.
+    filters = []
+    if start is not None:
+        filters.append((ts_column, ">=", start))
+    if end is not None:
+        filters.append((ts_column, "<", end))
+
+    tables = [
+        pq.read_table(
+            path,
+            columns=columns,
+            filters=filters or None,
+            use_pandas_metadata=False,
+        )
+        for path in files
+    ]
+    table = tables[0] if len(tables) == 1 else pa.concat_tables(tables)
+
+    # Timestamp buffer → UTC DatetimeIndex. The stored values are UTC
+    # epoch offsets whatever the declared zone, so no conversion is needed.
+    ts_type = table.schema.field(ts_column).type
+    ts_values = table.column(ts_column).combine_chunks()
+    ts_values = ts_values.cast(pa.timestamp(ts_type.unit))
+    index = pd.DatetimeIndex(
+        ts_values.to_numpy(zero_copy_only=False), name=C.COL_TS
+    ).tz_localize("UTC")
+    table = table.drop_columns([ts_column])
+
+    # Cast in Arrow, before conversion, so pandas receives final dtypes.
+    for col in _PRICE_COLUMNS:
+        i = table.schema.get_field_index(col)
+        values = table.column(i).cast(pa.float64())
+        if price_ticks:
+            values = pc.round(
+                pc.divide(values, C.TICK_SIZE), round_mode="half_to_even"
+            ).cast(pa.int64())
+            try:
+                values = values.cast(
+                    pa.from_numpy_dtype(np.dtype(S.PRICE_TICK_DTYPE))
+                )
+            except pa.ArrowInvalid as exc:
+                raise ValueError(
+                    f"Tick prices do not fit {S.PRICE_TICK_DTYPE}; "
+                    "set PRICE_TICK_DTYPE = 'int64'."
+                ) from exc
+        table = table.set_column(i, col, values)
+    i = table.schema.get_field_index(C.COL_VOLUME)
+    table = table.set_column(
+        i, C.COL_VOLUME, table.column(i).cast(pa.int64())
     )
+
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    df.index = index
     return df
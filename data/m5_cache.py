@@ -0,0 +1,448 @@
+"""
+m5_cache.py
+===========
+Content-addressed on-disk cache for resampled M5 bars.
+
+The M5 frame (OHLCV plus ``contains_roll``) depends only on:
+
+  - the raw M1 file contents (its SHA-256, taken from the downloader
+    manifest when present; for a partitioned dataset, the digest of the
+    per-partition SHA-256s of the months in the window, plus the
+    window itself);
+  - the resample settings (``RESAMPLE_FREQ``, ``RESAMPLE_CLOSED``,
+    ``RESAMPLE_LABEL``);
+  - the session definition (``SESSION_TIMEZONE``, ``SESSION_BREAK_START``,
+    ``SESSION_BREAK_END``);
+  - in integer-tick mode, the tick dtype (``PRICE_TICK_DTYPE``).
+
+These inputs are hashed into a key, and the M5 frame is stored as
+``<key>.parquet`` in ``settings.M5_CACHE_DIR`` together with the roll
+log as ``<key>.rolls.parquet``. A warm run reads the two files and skips
+loading, roll detection and resampling entirely.
+
+Memory-mapped entries
+---------------------
+With ``settings.M5_CACHE_MMAP`` the bars are also written as
+``<key>.arrow``, an uncompressed Arrow IPC file with one record batch.
+Hits then open that file with ``mmap`` instead of decoding Parquet:
+every column is a zero-copy, read-only NumPy view of the mapped file
+(booleans are stored as ``uint8`` so they can be viewed rather than
+unpacked). Only the index, 8 bytes per bar, is materialised per
+process, because pandas copies when attaching the UTC zone. N processes
+reading the same entry — sweep or bootstrap workers — share one physical
+copy in the OS page cache instead of holding N private frames. :func:`write_m5_ipc` and
+:func:`open_m5_ipc` are also used by ``backtest/parallel.py`` for its
+per-run worker hand-off.
+
+Eviction
+--------
+After every store, the least recently used entries are deleted until
+the cache fits ``settings.M5_CACHE_MAX_BYTES``. A cache hit refreshes
+the entry's modification time.
+
+This module does NOT resample; it only stores and retrieves results.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import constants as C
+from config import settings as S
+from data.dataset_store import PartitionedDataset
+from data.downloader import sha256_file
+from data.loader import raw_data_path
+
+logger = logging.getLogger(__name__)
+
+# Bump when the M5 output format or resampling semantics change.
+_CACHE_VERSION: int = 1
+
+_BARS_SUFFIX: str = ".parquet"
+_ROLLS_SUFFIX: str = ".rolls.parquet"
+_IPC_SUFFIX: str = ".arrow"
+
+# Schema metadata key of the IPC files.
+_IPC_METADATA_KEY: bytes = b"sffm_m5"
+
+
+def raw_file_sha256(
+    raw_path: Path,
+    start: Optional[str | pd.Timestamp] = None,
+    end: Optional[str | pd.Timestamp] = None,
+) -> str:
+    """
+    Return the SHA-256 of the raw M1 file.
+
+    The digest recorded in the downloader manifest is used when the
+    manifest exists; otherwise the file is hashed. A partitioned dataset
+    directory gets the combined digest of its partitions overlapping
+    ``[start, end)``; the window is ignored for a single file.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the raw file does not exist.
+    """
+    if not raw_path.exists():
+        raise FileNotFoundError(
+            f"Raw data file not found: {raw_path}\n"
+            "Run downloader.download() first."
+        )
+    if raw_path.is_dir():
+        return _dataset_sha256(raw_path, start, end)
+
+    manifest_path = raw_path.with_suffix(".manifest.json")
+    if manifest_path.exists():
+        with open(manifest_path) as f:
+            digest = json.load(f).get("sha256_raw_file")
+        if digest:
+            return digest
+
+    return sha256_file(raw_path)
+
+
+def _dataset_sha256(
+    root: Path,
+    start: Optional[str | pd.Timestamp] = None,
+    end: Optional[str | pd.Timestamp] = None,
+) -> str:
+    """
+    Digest of a partitioned raw dataset: the SHA-256 of every partition
+    overlapping ``[start, end)``, combined. A digest recorded in the
+    downloader manifest is used while the file's size and mtime still
+    match the entry.
+    """
+    recorded: dict[str, dict] = {}
+    manifest_path = root / "manifest.json"
+    if manifest_path.exists():
+        with open(manifest_path) as f:
+            recorded = {
+                entry["file"]: entry
+                for entry in json.load(f).get("partitions", {}).values()
+            }
+
+    digests = {}
+    for path in PartitionedDataset(root).files(start, end):
+        file = path.relative_to(root).as_posix()
+        entry = recorded.get(file)
+        stat = path.stat()
+        if (
+            entry is not None
+            and entry.get("size", stat.st_size) == stat.st_size
+            and entry.get("mtime_ns", stat.st_mtime_ns) == stat.st_mtime_ns
+        ):
+            digests[file] = entry["sha256"]
+        else:
+            digests[file] = sha256_file(path)
+    payload = json.dumps(digests, sort_keys=True).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def m5_cache_key(
+    raw_path: Optional[Path] = None,
+    start: Optional[str | pd.Timestamp] = None,
+    end: Optional[str | pd.Timestamp] = None,
+) -> str:
+    """
+    Compute the cache key for the M5 bars derived from ``raw_path``.
+
+    Parameters
+    ----------
+    raw_path : Path, optional
+        Raw M1 Parquet file or partitioned dataset directory.
+        Default: the canonical location from settings.
+    start, end : str or pd.Timestamp, optional
+        Window the bars are built from (see
+        :func:`data.loader.raw_window`). Only the partitions overlapping
+        it are hashed, and the window itself is part of the key.
+        Default: unbounded.
+
+    Returns
+    -------
+    str
+        Hex digest identifying the raw data and resample settings.
+    """
+    if raw_path is None:
+        raw_path = raw_data_path()
+
+    inputs = {
+        "version": _CACHE_VERSION,
+        "raw_sha256": raw_file_sha256(raw_path, start, end),
+        "resample_freq": S.RESAMPLE_FREQ,
+        "resample_closed": S.RESAMPLE_CLOSED,
+        "resample_label": S.RESAMPLE_LABEL,
+        "session_timezone": C.SESSION_TIMEZONE,
+        "session_break_start": C.SESSION_BREAK_START,
+        "session_break_end": C.SESSION_BREAK_END,
+    }
+    if start is not None or end is not None:
+        # Only when windowed, so whole-file keys are unchanged.
+        inputs["window"] = [
+            None if bound is None else pd.Timestamp(bound).isoformat()
+            for bound in (start, end)
+        ]
+    if S.PRICE_TICKS:
+        # Only in tick mode, so float-price keys are unchanged.
+        inputs["price_tick_dtype"] = S.PRICE_TICK_DTYPE
+    payload = json.dumps(inputs, sort_keys=True).encode()
+    return hashlib.sha256(payload).hexdigest()[:32]
+
+
+@contextmanager
+def _replacing(path: Path) -> Iterator[Path]:
+    """
+    Yield a unique temporary sibling of ``path`` to write, then rename it
+    over ``path``.
+
+    Each writer gets its own temporary file, so concurrent writers of one
+    key (``run_parallel`` workers, two pipeline runs) never interleave;
+    the last rename wins. The temporary file is removed on failure.
+    """
+    tmp_path = path.with_name(
+        f"{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+    )
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def write_m5_ipc(df_m5: pd.DataFrame, path: Path) -> int:
+    """
+    Write an M5 frame as an uncompressed, single-batch Arrow IPC file.
+
+    The index is stored as int64 in its own resolution and boolean
+    columns as uint8; :func:`open_m5_ipc` restores both. The file is
+    written to a temporary name and renamed.
+
+    Parameters
+    ----------
+    df_m5 : pd.DataFrame
+        Frame with a UTC DatetimeIndex and numeric or boolean columns.
+    path : Path
+        Destination file.
+
+    Returns
+    -------
+    int
+        Bytes written.
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    bool_columns = [
+        col for col in df_m5.columns
+        if pd.api.types.is_bool_dtype(df_m5[col].dtype)
+    ]
+    arrays = {C.COL_TS: pa.array(df_m5.index.asi8)}
+    for col in df_m5.columns:
+        values = df_m5[col].to_numpy()
+        if col in bool_columns:
+            values = values.view(np.uint8)
+        arrays[col] = pa.array(values)
+
+    metadata = {
+        "index_name": df_m5.index.name,
+        "index_unit": df_m5.index.unit,
+        "bool_columns": bool_columns,
+    }
+    # One chunk per column, so the file holds a single record batch.
+    table = pa.table(arrays).combine_chunks().replace_schema_metadata(
+        {_IPC_METADATA_KEY: json.dumps(metadata)}
+    )
+
+    with _replacing(path) as tmp_path:
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    return path.stat().st_size
+
+
+def open_m5_ipc(path: Path) -> pd.DataFrame:
+    """
+    Memory-map an IPC file written by :func:`write_m5_ipc`.
+
+    Returns
+    -------
+    pd.DataFrame
+        Frame whose columns are read-only views of the mapped file (the
+        index is a private copy). The mapping lives as long as any
+        column is referenced.
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    table = ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    metadata = json.loads(table.schema.metadata[_IPC_METADATA_KEY])
+
+    def view(name: str) -> np.ndarray:
+        column = table.column(name)
+        if column.num_chunks == 1:
+            return column.chunk(0).to_numpy(zero_copy_only=False)
+        return column.combine_chunks().to_numpy(zero_copy_only=False)
+
+    ts = view(C.COL_TS).view(f"datetime64[{metadata['index_unit']}]")
+    index = pd.DatetimeIndex(ts, name=metadata["index_name"])
+    columns = {}
+    for name in table.column_names:
+        if name == C.COL_TS:
+            continue
+        values = view(name)
+        if name in metadata["bool_columns"]:
+            values = values.view(bool)
+        columns[name] = values
+    return pd.DataFrame(columns, index=index.tz_localize("UTC"), copy=False)
+
+
+def load_cached_m5(key: str) -> Optional[tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Retrieve cached M5 bars and roll log.
+
+    Parameters
+    ----------
+    key : str
+        Output of :func:`m5_cache_key`.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, pd.DataFrame] or None
+        ``(df_m5, rolls)`` on a hit, None on a miss.
+    """
+    bars_path = S.M5_CACHE_DIR / f"{key}{_BARS_SUFFIX}"
+    rolls_path = S.M5_CACHE_DIR / f"{key}{_ROLLS_SUFFIX}"
+    if not (bars_path.exists() and rolls_path.exists()):
+        logger.info("M5 cache miss: %s", key)
+        return None
+
+    ipc_path = S.M5_CACHE_DIR / f"{key}{_IPC_SUFFIX}"
+    if S.M5_CACHE_MMAP and not ipc_path.exists():
+        # Entry stored without the IPC copy: add it once.
+        write_m5_ipc(pd.read_parquet(bars_path), ipc_path)
+    if S.M5_CACHE_MMAP:
+        df_m5 = open_m5_ipc(ipc_path)
+    else:
+        df_m5 = pd.read_parquet(bars_path)
+    rolls = pd.read_parquet(rolls_path)
+
+    # Mark as recently used for LRU eviction.
+    for path in (bars_path, rolls_path):
+        os.utime(path)
+
+    logger.info("M5 cache hit: %s (%d bars).", key, len(df_m5))
+    return df_m5, rolls
+
+
+def store_m5(key: str, df_m5: pd.DataFrame, rolls: pd.DataFrame) -> None:
+    """
+    Store M5 bars and roll log under ``key``, then enforce the size cap.
+
+    Files are written to a temporary name and renamed, so a concurrent
+    reader never sees a partially written entry.
+    """
+    S.M5_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    for frame, suffix in ((rolls, _ROLLS_SUFFIX), (df_m5, _BARS_SUFFIX)):
+        path = S.M5_CACHE_DIR / f"{key}{suffix}"
+        with _replacing(path) as tmp_path:
+            frame.to_parquet(tmp_path, index=True)
+    if S.M5_CACHE_MMAP:
+        write_m5_ipc(df_m5, S.M5_CACHE_DIR / f"{key}{_IPC_SUFFIX}")
+
+    logger.info("M5 cache stored: %s (%d bars).", key, len(df_m5))
+    evict_m5_cache(S.M5_CACHE_MAX_BYTES, keep=key)
+
+
+def adopt_m5_file(key: str, bars_file: Path, rolls: pd.DataFrame) -> Path:
+    """
+    Move an already-written M5 Parquet file into the cache under ``key``.
+
+    Used by the streaming resampler, which writes its output
+    incrementally. ``bars_file`` must be on the same filesystem as the
+    cache directory (e.g. inside ``settings.DATA_DIR``).
+
+    Returns
+    -------
+    Path
+        Final path of the cached bars file.
+    """
+    S.M5_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    rolls_path = S.M5_CACHE_DIR / f"{key}{_ROLLS_SUFFIX}"
+    with _replacing(rolls_path) as tmp_path:
+        rolls.to_parquet(tmp_path, index=True)
+
+    bars_path = S.M5_CACHE_DIR / f"{key}{_BARS_SUFFIX}"
+    os.replace(bars_file, bars_path)
+    if S.M5_CACHE_MMAP:
+        write_m5_ipc(
+            pd.read_parquet(bars_path), S.M5_CACHE_DIR / f"{key}{_IPC_SUFFIX}"
+        )
+
+    logger.info("M5 cache stored: %s (streamed).", key)
+    evict_m5_cache(S.M5_CACHE_MAX_BYTES, keep=key)
+    return bars_path
+
+
+def evict_m5_cache(max_bytes: int, keep: Optional[str] = None) -> int:
+    """
+    Delete least recently used cache entries until the total size of
+    the cache directory is at most ``max_bytes``.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Size cap for all entries combined.
+    keep : str, optional
+        Key that is never evicted (the entry just written).
+
+    Returns
+    -------
+    int
+        Number of entries evicted.
+    """
+    if not S.M5_CACHE_DIR.exists():
+        return 0
+
+    # Group bar and roll files by key; an entry is as recent as its
+    # most recently touched file.
+    entries: dict[str, list[Path]] = {}
+    for path in S.M5_CACHE_DIR.iterdir():
+        if path.name.endswith(_ROLLS_SUFFIX):
+            key = path.name[: -len(_ROLLS_SUFFIX)]
+        elif path.name.endswith(_BARS_SUFFIX):
+            key = path.name[: -len(_BARS_SUFFIX)]
+        elif path.name.endswith(_IPC_SUFFIX):
+            key = path.name[: -len(_IPC_SUFFIX)]
+        else:
+            continue
+        entries.setdefault(key, []).append(path)
+
+    def _mtime(paths: list[Path]) -> float:
+        return max(p.stat().st_mtime for p in paths)
+
+    total = sum(p.stat().st_size for paths in entries.values() for p in paths)
+    evicted = 0
+    for key, paths in sorted(entries.items(), key=lambda kv: _mtime(kv[1])):
+        if total <= max_bytes:
+            break
+        if key == keep:
+            continue
+        for path in paths:
+            total -= path.stat().st_size
+            path.unlink()
+        evicted += 1
+        logger.info("M5 cache evicted: %s", key)
+
+    return evicted
@@ -10,15 +10,20 @@ Responsibilities
 - Apply adverse slippage (normal or roll-close rate).
 - Return the fill price.
 
+Prices may be floats or, in integer-tick mode (``settings.PRICE_TICKS``),
+whole tick counts; :func:`compute_fill_ticks` is the integer counterpart
+of :func:`compute_fill_price` and needs no rounding.
+
 This module does NOT track position state and does NOT compute PnL.
 """
 
 from __future__ import annotations
 
 import logging
+from typing import Optional
 
 from config import constants as C
-from config import settings as S
+from config.run_config import RunConfig
 from execution.position_manager import Direction
 
 logger = logging.getLogger(__name__)
@@ -28,6 +33,8 @@ def compute_fill_price(
     direction: Direction,
     bar_open: float,
     is_roll_close: bool = False,
+    *,
+    config: Optional[RunConfig] = None,
 ) -> float:
     """
     Compute the fill price for a market order at bar open.
@@ -54,6 +61,10 @@ def compute_fill_price(
         If True, use ROLL_CLOSE_SLIPPAGE_TICKS instead of SLIPPAGE_TICKS.
         Set to True only for forced position closes triggered by a roll event.
         Default: False.
+    config : RunConfig, optional
+        Run configuration supplying the slippage (keyword-only). The
+        backtest resolves it once per run. Default:
+        ``RunConfig.from_settings()``.
 
     Returns
     -------
@@ -67,9 +78,15 @@ def compute_fill_price(
     """
     if direction == Direction.FLAT:
         raise ValueError("Cannot compute fill price for Direction.FLAT.")
+    if config is None:
+        config = RunConfig.from_settings()
 
-    ticks = S.ROLL_CLOSE_SLIPPAGE_TICKS if is_roll_close else S.SLIPPAGE_TICKS
-    slippage_amount = ticks * C.TICK_SIZE
+    if is_roll_close:
+        ticks = config.roll_close_slippage_ticks
+        slippage_amount = config.roll_slippage_amount
+    else:
+        ticks = config.slippage_ticks
+        slippage_amount = config.slippage_amount
 
     if direction == Direction.LONG:
         fill = bar_open + slippage_amount
@@ -82,7 +99,54 @@ def compute_fill_price(
         "  [ROLL CLOSE]" if is_roll_close else "",
     )
     return fill
-    return fill
+
+
+def compute_fill_ticks(
+    direction: Direction,
+    bar_open_ticks: int,
+    is_roll_close: bool = False,
+    *,
+    config: Optional[RunConfig] = None,
+) -> int:
+    """
+    Integer-tick variant of :func:`compute_fill_price`.
+
+    Slippage is added as a whole number of ticks, so the result is an
+    exact tick count and never needs :func:`round_to_tick`.
+
+    Parameters
+    ----------
+    direction : Direction
+        Direction of this particular fill (LONG buy or SHORT sell).
+    bar_open_ticks : int
+        Open of the execution bar in ticks.
+    is_roll_close : bool, optional
+        If True, use the roll-close slippage. Default: False.
+    config : RunConfig, optional
+        Run configuration supplying the slippage (keyword-only). The
+        backtest resolves it once per run. Default:
+        ``RunConfig.from_settings()``.
+
+    Returns
+    -------
+    int
+        Fill price in ticks after slippage.
+
+    Raises
+    ------
+    ValueError
+        If direction is FLAT (cannot fill a flat order).
+    """
+    if direction == Direction.FLAT:
+        raise ValueError("Cannot compute fill price for Direction.FLAT.")
+    if config is None:
+        config = RunConfig.from_settings()
+
+    ticks = (
+        config.roll_close_slippage_ticks if is_roll_close
+        else config.slippage_ticks
+    )
+    return int(bar_open_ticks) + direction.value * ticks
 
 
 def round_to_tick(price: float) -> float:
@@ -102,5 +166,25 @@ def round_to_tick(price: float) -> float:
     float
         Price rounded to the nearest TICK_SIZE.
     """
-    tick = C.TICK_SIZE
-    return round(round(price / tick) * tick, 10)
+    return ticks_to_price(round(price / C.TICK_SIZE))
+
+
+def ticks_to_price(ticks: int) -> float:
+    """
+    Convert an integer tick count to a price.
+
+    This is the second half of :func:`round_to_tick`, exposed for callers
+    that have already reduced a price to whole ticks (e.g. compiled
+    kernels working on primitive arrays).
+
+    Parameters
+    ----------
+    ticks : int
+        Price expressed as a whole number of TICK_SIZE increments.
+
+    Returns
+    -------
+    float
+        ``ticks × TICK_SIZE`` rounded to 10 decimals.
+    """
+    return round(ticks * C.TICK_SIZE, 10)
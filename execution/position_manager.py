@@ -10,6 +10,10 @@ Responsibilities
   or no action (same direction as current position).
 - Produce an action descriptor that the execution engine acts on.
 
+Actions are immutable, and the only five distinct ones (no-op, open
+long, open short, reverse to long, reverse to short) are module-level
+singletons, so evaluating a signal never allocates.
+
 This module does NOT compute prices, apply slippage, or record PnL.
 """
 
@@ -26,11 +30,14 @@ class Direction(IntEnum):
     SHORT = -1
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Action:
     """
     Describes the trading action required for a given bar.
 
+    Instances are shared; use the module constants rather than
+    constructing new ones.
+
     Attributes
     ----------
     close_existing : bool
@@ -45,7 +52,20 @@ class Action:
     new_direction: Direction = Direction.FLAT
 
 
-@dataclass
+NO_ACTION: Action = Action()
+
+# Keyed by the desired direction's integer code (+1 / -1).
+_OPEN_ACTIONS: dict[int, Action] = {
+    d.value: Action(close_existing=False, open_new=True, new_direction=d)
+    for d in (Direction.LONG, Direction.SHORT)
+}
+_REVERSE_ACTIONS: dict[int, Action] = {
+    d.value: Action(close_existing=True, open_new=True, new_direction=d)
+    for d in (Direction.LONG, Direction.SHORT)
+}
+
+
+@dataclass(slots=True)
 class PositionManager:
     """
     Maintains the current open position state.
@@ -78,23 +98,29 @@ class PositionManager:
         Returns
         -------
         Action
-            Descriptor of what the execution engine should do.
+            Shared descriptor of what the execution engine should do.
+
+        Raises
+        ------
+        ValueError
+            If ``signal`` is not -1, 0 or +1.
         """
         if signal == 0:
-            return Action()  # nothing to do
+            return NO_ACTION  # nothing to do
 
-        desired = Direction(signal)
+        if signal not in _OPEN_ACTIONS:
+            raise ValueError(f"{signal!r} is not a valid Direction")
 
-        if self.current_direction == desired:
+        if self.current_direction == signal:
             # Already in the desired direction — no action.
-            return Action()
+            return NO_ACTION
 
-        if self.is_flat():
+        if self.current_direction == Direction.FLAT:
             # Flat → open new position.
-            return Action(close_existing=False, open_new=True, new_direction=desired)
+            return _OPEN_ACTIONS[signal]
 
         # Existing position in opposite direction → reversal.
-        return Action(close_existing=True, open_new=True, new_direction=desired)
+        return _REVERSE_ACTIONS[signal]
 
     def on_open(self, direction: Direction, bar_index: int) -> None:
         """
@@ -16,21 +16,37 @@ Warmup
 ------
 The first ``warmup_bars`` values are set to NaN, irrespective of the EMA
 calculation. Signal generation must check for NaN before acting.
+
+Incremental form
+----------------
+:class:`IncrementalEMA` holds the recursion state of one EMA and
+consumes one close at a time in O(1). It reproduces the pandas
+recursion operation for operation, so its outputs equal
+:func:`compute_ema` bit for bit on any history of at least
+``warmup_bars`` closes.
 """
 
 from __future__ import annotations
 
 import logging
+import math
+from dataclasses import dataclass
+from typing import Sequence
 
 import numpy as np
 import pandas as pd
 
 from config import settings as S
+from config.run_config import RunConfig
 
 logger = logging.getLogger(__name__)
 
 
-def compute_ema(series: pd.Series, period: int) -> pd.Series:
+def compute_ema(
+    series: pd.Series,
+    period: int,
+    warmup_bars: int | None = None,
+) -> pd.Series:
     """
     Compute the EMA of a price series.
 
@@ -40,12 +56,15 @@ def compute_ema(series: pd.Series, period: int) -> pd.Series:
         Price series (typically Close prices).
     period : int
         EMA period. Must be >= 2.
+    warmup_bars : int, optional
+        Number of leading values masked as NaN
+        (default: settings.WARMUP_BARS).
 
     Returns
     -------
     pd.Series
         EMA values with the same index as ``series``.
-        First ``S.WARMUP_BARS`` values are NaN.
+        First ``warmup_bars`` values are NaN.
 
     Raises
     ------
@@ -65,7 +84,7 @@ def compute_ema(series: pd.Series, period: int) -> pd.Series:
 
     # Enforce warmup: mask the first WARMUP_BARS values as NaN so that
     # the signal module never fires before the indicators have stabilised.
-    warmup = S.WARMUP_BARS
+    warmup = warmup_bars if warmup_bars is not None else S.WARMUP_BARS
     if len(ema) >= warmup:
         ema.iloc[:warmup] = np.nan
 
@@ -76,6 +95,7 @@ def compute_ema_pair(
     close: pd.Series,
     fast_period: int | None = None,
     slow_period: int | None = None,
+    config: RunConfig | None = None,
 ) -> tuple[pd.Series, pd.Series]:
     """
     Compute the fast and slow EMA pair used by SFFM v1.2.
@@ -85,20 +105,26 @@ def compute_ema_pair(
     close : pd.Series
         Close price series.
     fast_period : int, optional
-        Override for the fast EMA period (default: settings.EMA_FAST).
+        Override for the fast EMA period (default: config.ema_fast).
     slow_period : int, optional
-        Override for the slow EMA period (default: settings.EMA_SLOW).
+        Override for the slow EMA period (default: config.ema_slow).
+    config : RunConfig, optional
+        Supplies default periods and warmup. Default: a snapshot of the
+        current settings.
 
     Returns
     -------
     tuple[pd.Series, pd.Series]
         (ema_fast, ema_slow) — both share the same index as ``close``.
     """
-    fp = fast_period if fast_period is not None else S.EMA_FAST
-    sp = slow_period if slow_period is not None else S.EMA_SLOW
+    if config is None:
+        config = RunConfig.from_settings()
+
+    fp = fast_period if fast_period is not None else config.ema_fast
+    sp = slow_period if slow_period is not None else config.ema_slow
 
-    ema_fast = compute_ema(close, fp)
-    ema_slow = compute_ema(close, sp)
+    ema_fast = compute_ema(close, fp, config.warmup_bars)
+    ema_slow = compute_ema(close, sp, config.warmup_bars)
 
     logger.debug(
         "Computed EMA(%d) and EMA(%d) over %d bars.",
@@ -106,3 +132,114 @@ def compute_ema_pair(
     )
 
     return ema_fast, ema_slow
+
+
+def compute_ema_matrix(
+    close: pd.Series,
+    periods: Sequence[int],
+    warmup_bars: int | None = None,
+) -> np.ndarray:
+    """
+    Compute one EMA per distinct period as columns of a 2-D matrix.
+
+    Each column is produced by :func:`compute_ema`, so values (including
+    the warmup mask) are identical to the single-pair path. Duplicate
+    periods are not recomputed.
+
+    Parameters
+    ----------
+    close : pd.Series
+        Close price series.
+    periods : sequence of int
+        EMA periods, one per output column. Must be distinct.
+    warmup_bars : int, optional
+        Passed to :func:`compute_ema`.
+
+    Returns
+    -------
+    np.ndarray
+        Float64 array of shape ``(len(close), len(periods))``.
+
+    Raises
+    ------
+    ValueError
+        If ``periods`` contains duplicates.
+    """
+    if len(set(periods)) != len(periods):
+        raise ValueError("EMA matrix periods must be distinct.")
+
+    matrix = np.empty((len(close), len(periods)), dtype=np.float64)
+    for col, period in enumerate(periods):
+        matrix[:, col] = compute_ema(close, int(period), warmup_bars).to_numpy()
+
+    logger.debug(
+        "Computed EMA matrix for %d periods over %d bars.",
+        len(periods), len(close),
+    )
+    return matrix
+
+
+@dataclass(slots=True)
+class IncrementalEMA:
+    """
+    Streaming EMA that updates in O(1) per new close.
+
+    Attributes
+    ----------
+    period : int
+        EMA period. Must be >= 2.
+    warmup_bars : int
+        Number of leading outputs masked as NaN.
+    value : float
+        Current (unmasked) EMA value; NaN before the first close.
+    old_weight : float
+        Weight of ``value`` in the next update (pandas' ``old_wt``).
+    count : int
+        Number of closes consumed.
+    """
+    period: int
+    warmup_bars: int
+    value: float = math.nan
+    old_weight: float = 1.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        if self.period < 2:
+            raise ValueError(f"EMA period must be >= 2, got {self.period}.")
+
+    @property
+    def alpha(self) -> float:
+        """
+        Smoothing factor 2 / (period + 1), in the form pandas uses.
+
+        pandas converts ``alpha`` to a centre of mass and back, which can
+        change the last bit; doing the same keeps results identical.
+        """
+        alpha = 2.0 / (self.period + 1)
+        com = (1 - alpha) / alpha
+        return 1.0 / (1.0 + com)
+
+    def update(self, close: float) -> float:
+        """
+        Consume one close and return the EMA for that bar.
+
+        Returns
+        -------
+        float
+            EMA value, or NaN while the bar is inside the warmup window.
+        """
+        alpha = self.alpha
+        is_observation = close == close
+        if self.value == self.value:
+            self.old_weight *= 1.0 - alpha
+            if is_observation:
+                if self.value != close:
+                    self.value = (
+                        self.old_weight * self.value + alpha * close
+                    ) / (self.old_weight + alpha)
+                self.old_weight = 1.0
+        elif is_observation:
+            self.value = close
+
+        self.count += 1
+        return self.value if self.count > self.warmup_bars else math.nan
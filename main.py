@@ -30,6 +30,7 @@ Environment variables required
 from __future__ import annotations
 
 import logging
+import os
 import sys
 from pathlib import Path
 
@@ -46,39 +47,104 @@ logging.basicConfig(
 logger = logging.getLogger("sffm.main")
 
 
-def run_pipeline() -> None:
-    """Execute the complete SFFM v1.2 backtest pipeline."""
+def prepare_m5_bars() -> pd.DataFrame:
+    """
+    Run pipeline steps 1–3: load raw M1, log rolls, resample to M5.
+
+    When ``settings.M5_CACHE_ENABLED`` is set, the result is looked up in
+    the content-addressed M5 cache first (``data/m5_cache.py``); a hit
+    skips all three steps and only rewrites the roll log.
+
+    Shared by :func:`run_pipeline` and the multi-configuration runner in
+    ``backtest/parallel.py``, which backtests many settings against the
+    same prepared bars.
 
+    Returns
+    -------
+    pd.DataFrame
+        M5 OHLCV DataFrame with the ``contains_roll`` column.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the raw M1 Parquet file has not been downloaded.
+    """
     from config import settings as S
-    from config import constants as C
 
-    from data.loader import load_raw_m1
+    from data.dataset_store import PartitionedDataset
+    from data.loader import (
+        load_m5_bars,
+        load_raw_m1,
+        m5_dataset_dir,
+        raw_window,
+    )
+    from data.m5_cache import (
+        adopt_m5_file,
+        load_cached_m5,
+        m5_cache_key,
+        store_m5,
+    )
     from data.roll_manager import detect_rolls, save_roll_log, annotate_rolls
-    from preprocessing.resampler import resample_m1_to_m5
-    from indicators.ema import compute_ema_pair
-    from signals.crossover import generate_crossover_signals
-    from backtest.engine import run_backtest
-    from backtest.equity import build_equity_curve, split_equity
-    from metrics.performance import compute_performance
-    from metrics.drawdown import compute_drawdown
-    from metrics.bootstrap import run_bootstrap
+    from preprocessing.resampler import (
+        resample_m1_to_m5,
+        resample_m1_to_m5_numpy,
+    )
+    from preprocessing.stream_resampler import stream_resample_parquet
 
     S.DATA_DIR.mkdir(parents=True, exist_ok=True)
     S.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    roll_log_path = S.OUTPUT_DIR / "roll_log.csv"
+
+    # [DATA_START, DATA_END) for the partitioned layout; whole file otherwise.
+    start, end = raw_window()
+
+    cache_key = None
+    if S.M5_CACHE_ENABLED:
+        cache_key = m5_cache_key(start=start, end=end)
+        cached = load_cached_m5(cache_key)
+        if cached is not None:
+            logger.info("=== STEPS 1–3: M5 bars loaded from cache ===")
+            df_m5, rolls = cached
+            if not rolls.empty:
+                save_roll_log(rolls, roll_log_path)
+            return df_m5
+
+    if S.RESAMPLE_STREAMING:
+        # Steps 1–3 fused: batches of M1 rows are loaded, roll-annotated
+        # and resampled, and M5 bars are appended to disk as they form.
+        logger.info("=== STEPS 1–3: Streaming M1 → M5 ===")
+        if S.RAW_DATA_LAYOUT == "partitioned":
+            # Bars go to the partitioned M5 dataset, month by month.
+            rolls = stream_resample_parquet(
+                m5_dataset_dir(), start=start, end=end, partitioned=True
+            )
+            if not rolls.empty:
+                save_roll_log(rolls, roll_log_path)
+            df_m5 = load_m5_bars(start, end)
+            if cache_key is not None:
+                store_m5(cache_key, df_m5, rolls)
+            return df_m5
+        # Per-process name: two pipeline runs may stream concurrently.
+        stream_path = S.DATA_DIR / f"m5_stream.{os.getpid()}.parquet.tmp"
+        rolls = stream_resample_parquet(stream_path, start=start, end=end)
+        if not rolls.empty:
+            save_roll_log(rolls, roll_log_path)
+        if cache_key is not None:
+            bars_path = adopt_m5_file(cache_key, stream_path, rolls)
+            cached = load_cached_m5(cache_key)
+            if cached is None:
+                # A concurrent run evicted part of the entry meanwhile.
+                return pd.read_parquet(bars_path)
+            return cached[0]
+        df_m5 = pd.read_parquet(stream_path)
+        stream_path.unlink()
+        return df_m5
 
     # ------------------------------------------------------------------
     # Step 1 — Load raw M1 data.
     # ------------------------------------------------------------------
     logger.info("=== STEP 1: Loading raw M1 data ===")
-    try:
-        df_m1 = load_raw_m1()
-    except FileNotFoundError:
-        logger.error(
-            "Raw data not found. Run downloader.download() first "
-            "or set DATABENTO_API_KEY and call:\n"
-            "    from data.downloader import download; download()"
-        )
-        sys.exit(1)
+    df_m1 = load_raw_m1(start=start, end=end)
 
     # ------------------------------------------------------------------
     # Step 2 — Detect and log contract rolls; annotate M1 with is_roll.
@@ -88,7 +154,6 @@ def run_pipeline() -> None:
     logger.info("=== STEP 2: Detecting contract rolls ===")
     rolls = detect_rolls(df_m1)
     if not rolls.empty:
-        roll_log_path = S.OUTPUT_DIR / "roll_log.csv"
         save_roll_log(rolls, roll_log_path)
     else:
         logger.info("No roll events detected (instrument_id column absent or constant).")
@@ -101,13 +166,53 @@ def run_pipeline() -> None:
     # The resampler propagates is_roll → contains_roll using .any().
     # ------------------------------------------------------------------
     logger.info("=== STEP 3: Resampling M1 → M5 ===")
-    df_m5 = resample_m1_to_m5(df_m1)
+    if S.RESAMPLE_ENGINE == "numpy":
+        df_m5 = resample_m1_to_m5_numpy(df_m1)
+    else:
+        df_m5 = resample_m1_to_m5(df_m1)
+
+    if S.RAW_DATA_LAYOUT == "partitioned":
+        PartitionedDataset(m5_dataset_dir()).write(df_m5)
+    if cache_key is not None:
+        store_m5(cache_key, df_m5, rolls)
+    return df_m5
+
+
+def run_pipeline() -> None:
+    """Execute the complete SFFM v1.2 backtest pipeline."""
+
+    from config import settings as S
+    from config import constants as C
+    from config.run_config import RunConfig
+
+    from indicators.ema import compute_ema_pair
+    from signals.crossover import generate_crossover_signals
+    from backtest.engine import run_backtest
+    from backtest.equity import build_equity_curve, split_equity
+    from metrics.fused import compute_metrics
+    from metrics.bootstrap import run_bootstrap
+
+    # ------------------------------------------------------------------
+    # Steps 1–3 — Load, roll detection, resample.
+    # ------------------------------------------------------------------
+    try:
+        df_m5 = prepare_m5_bars()
+    except FileNotFoundError:
+        logger.error(
+            "Raw data not found. Run downloader.download() first "
+            "or set DATABENTO_API_KEY and call:\n"
+            "    from data.downloader import download; download()"
+        )
+        sys.exit(1)
+
+    # Run-dependent settings are resolved once and passed explicitly.
+    config = RunConfig.from_settings()
 
     # ------------------------------------------------------------------
     # Step 4 — Compute EMA pair (full dataset, no split reset).
     # ------------------------------------------------------------------
     logger.info("=== STEP 4: Computing EMA indicators ===")
-    ema_fast, ema_slow = compute_ema_pair(df_m5[C.COL_CLOSE])
+    ema_fast, ema_slow = compute_ema_pair(df_m5[C.COL_CLOSE], config=config)
 
     # ------------------------------------------------------------------
     # Step 5 — Generate crossover signals.
@@ -131,14 +236,16 @@ def run_pipeline() -> None:
     # Step 7 — Run backtest (full dataset, IS+OOS in one pass).
     # ------------------------------------------------------------------
     logger.info("=== STEP 7: Running backtest ===")
-    state = run_backtest(df_m5, signals)
+    state = run_backtest(df_m5, signals, config=config)
 
     # ------------------------------------------------------------------
     # Step 8 — Build equity curve; split into IS and OOS.
     # ------------------------------------------------------------------
     logger.info("=== STEP 8: Building equity curve ===")
     trade_df = state.ledger.to_dataframe()
-    equity_full = build_equity_curve(trade_df, df_m5.index)
+    equity_full = build_equity_curve(
+        trade_df, df_m5.index, close=df_m5[C.COL_CLOSE], config=config
+    )
     equity_is, equity_oos = split_equity(equity_full, split_ts)
 
     # Split trades by exit bar.
@@ -166,8 +273,7 @@ def run_pipeline() -> None:
         if t_df.empty:
             logger.warning("No trades in period: %s. Skipping metrics.", label)
             continue
-        perf = compute_performance(t_df, eq)
-        dd = compute_drawdown(eq)
+        perf, dd = compute_metrics(t_df, eq)
         results[label] = {"perf": perf, "dd": dd, "trades": t_df}
 
     # ------------------------------------------------------------------
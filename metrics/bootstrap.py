@@ -6,18 +6,45 @@ of the expectancy (mean net PnL per trade).
 
 Method
 ------
-IID bootstrap over completed trades:
-  1. Resample N trades with replacement (N = number of original trades).
+Over completed trades, in time order:
+  1. Build a resample of N trades (N = number of original trades).
   2. Compute mean net PnL of the resample.
   3. Repeat B times.
   4. Report the 2.5th and 97.5th percentiles as the 95% CI.
 
-Limitation acknowledged
------------------------
-IID bootstrap does not preserve serial autocorrelation. In a
-trend-following system, consecutive trades may be correlated. The result
-should be interpreted as an approximation. Block bootstrap is deferred
-to a future spec version.
+Step 1 follows settings.BOOTSTRAP_METHOD:
+  - ``"iid"``: N trades drawn independently with replacement.
+  - ``"block"`` (moving-block, Künsch 1989): concatenated runs of L
+    consecutive trades starting at uniform positions, truncated to N.
+  - ``"stationary"`` (Politis & Romano 1994): runs with geometric lengths
+    of mean L; each next trade continues the run (wrapping around the end
+    of the list) with probability 1 − 1/L or starts a new one at a
+    uniform position.
+
+The block schemes keep the serial correlation of consecutive trades,
+which an IID bootstrap destroys: in a trend-following system winners and
+losers cluster, and the IID interval is too narrow.
+
+Memory
+------
+Resamples are generated in batches of about
+settings.BOOTSTRAP_BATCH_ELEMENTS trade indices, and only their means are
+kept. With settings.BOOTSTRAP_KEEP_DISTRIBUTION the B means are stored
+(8 bytes each) and the CI is exact; without it they feed a
+:class:`QuantileSketch` of fixed size and no per-resample storage is
+kept at all, so memory stays flat as B grows. Every scheme makes one
+row-major draw per batch, so batching takes values from the random
+generator in the same order as a single draw and results do not depend
+on the batch size.
+
+Statistics and parallelism
+--------------------------
+:func:`bootstrap_statistics` computes expectancy, profit factor, win
+rate, trade-level Sharpe and max drawdown on the same resamples. With
+settings.BOOTSTRAP_WORKERS > 1 the resamples are split over a process
+(or thread) pool; each worker draws from its own child of
+``SeedSequence(BOOTSTRAP_RANDOM_SEED).spawn``, so results are fixed by
+the seed and the worker count.
 
 This module does NOT modify the original trade list.
 """
@@ -25,7 +52,9 @@ This module does NOT modify the original trade list.
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import Optional, Sequence
 
 import numpy as np
 import pandas as pd
@@ -34,6 +63,13 @@ from config import settings as S
 
 logger = logging.getLogger(__name__)
 
+_METHODS: tuple[str, ...] = ("iid", "block", "stationary")
+
+# Statistics available to bootstrap_statistics.
+STATISTICS: tuple[str, ...] = (
+    "expectancy", "profit_factor", "win_rate", "sharpe", "max_drawdown",
+)
+
 
 @dataclass(frozen=True)
 class BootstrapResult:
@@ -52,71 +88,605 @@ class BootstrapResult:
         Confidence level used (e.g. 0.95).
     n_resamples : int
         Number of bootstrap iterations performed.
-    expectancy_distribution : np.ndarray
-        Full distribution of resampled expectancy values.
+    expectancy_distribution : np.ndarray or None
+        Full distribution of resampled expectancy values, or None if it
+        was not kept (CI bounds then come from a quantile sketch).
+    method : str
+        Resampling scheme (``"iid"``, ``"block"`` or ``"stationary"``).
+    block_length : int
+        Block length (mean length for ``"stationary"``); 1 for ``"iid"``.
     """
     observed_expectancy: float
     ci_lower: float
     ci_upper: float
     confidence_level: float
     n_resamples: int
-    expectancy_distribution: np.ndarray
+    expectancy_distribution: Optional[np.ndarray]
+    method: str = "iid"
+    block_length: int = 1
 
 
-def run_bootstrap(trade_df: pd.DataFrame) -> BootstrapResult:
+@dataclass(frozen=True)
+class MultiBootstrapResult:
     """
-    Run trade-level bootstrap on the net PnL column.
+    Joint bootstrap of several trade statistics.
+
+    Attributes
+    ----------
+    observed : dict[str, float]
+        Each statistic on the original trade sequence.
+    ci_lower, ci_upper : dict[str, float]
+        Confidence interval bounds per statistic.
+    confidence_level : float
+    n_resamples : int
+    distributions : dict[str, np.ndarray] or None
+        Resampled values per statistic (resample *i* at position *i* in
+        every array), or None if only quantile sketches were kept.
+    method : str
+    block_length : int
+    workers : int
+        Number of independent random streams the resamples came from.
+    """
+    observed: dict[str, float]
+    ci_lower: dict[str, float]
+    ci_upper: dict[str, float]
+    confidence_level: float
+    n_resamples: int
+    distributions: Optional[dict[str, np.ndarray]]
+    method: str
+    block_length: int
+    workers: int
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per statistic: observed, ci_lower, ci_upper."""
+        return pd.DataFrame(
+            {
+                "observed": self.observed,
+                "ci_lower": self.ci_lower,
+                "ci_upper": self.ci_upper,
+            }
+        ).rename_axis("statistic")
+
+
+class QuantileSketch:
+    """
+    Fixed-memory streaming quantile estimator (KLL-style compactors).
+
+    Values enter level 0 with weight 1. When a level holds more than
+    ``size`` values it is sorted and every other value — alternating
+    between odd and even positions on successive compactions — moves up
+    one level with twice the weight. Memory is O(size · log(n / size))
+    and the rank error of :meth:`quantile` is a small multiple of
+    1/size (about 2/size after merges). Until the first compaction the
+    sketch holds every value and is exact.
 
     Parameters
     ----------
-    trade_df : pd.DataFrame
-        Output of ``Ledger.to_dataframe()``.
-        Must contain column ``net_pnl``.
+    size : int
+        Values per level before compaction. Default:
+        settings.BOOTSTRAP_SKETCH_SIZE.
+    """
+
+    __slots__ = ("size", "n", "_levels", "_parity")
+
+    def __init__(self, size: Optional[int] = None) -> None:
+        self.size: int = S.BOOTSTRAP_SKETCH_SIZE if size is None else size
+        if self.size < 2:
+            raise ValueError("QuantileSketch size must be at least 2.")
+        self.n: int = 0
+        self._levels: list[np.ndarray] = [np.empty(0)]
+        self._parity: list[int] = [0]
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of values."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        self.n += values.size
+        self._levels[0] = np.concatenate((self._levels[0], values))
+        self._compact()
+
+    def merge(self, other: QuantileSketch) -> None:
+        """Add every value summarised by another sketch."""
+        for level, items in enumerate(other._levels):
+            if level == len(self._levels):
+                self._levels.append(np.empty(0))
+                self._parity.append(0)
+            self._levels[level] = np.concatenate((self._levels[level], items))
+        self.n += other.n
+        self._compact()
+
+    def _compact(self) -> None:
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if items.size > self.size:
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                    self._parity.append(0)
+                items = np.sort(items)
+                # An odd leftover stays at this level with its own weight.
+                keep = items[:items.size % 2]
+                pairs = items[items.size % 2:]
+                promoted = pairs[self._parity[level]::2]
+                self._parity[level] ^= 1
+                self._levels[level] = keep
+                self._levels[level + 1] = np.concatenate(
+                    (self._levels[level + 1], promoted)
+                )
+            level += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the ``q`` quantile (0 ≤ q ≤ 1).
+
+        Raises
+        ------
+        ValueError
+            If the sketch is empty.
+        """
+        if self.n == 0:
+            raise ValueError("Cannot take a quantile of an empty sketch.")
+        if len(self._levels) == 1:
+            return float(np.percentile(self._levels[0], 100 * q))
+
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([
+            np.full(items.size, 2.0 ** level)
+            for level, items in enumerate(self._levels)
+        ])
+        order = np.argsort(values, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        # Weighted analogue of the lower-median rank convention.
+        target = q * (cumulative[-1] - 1) + 1
+        pos = min(int(np.searchsorted(cumulative, target)), values.size - 1)
+        return float(values[order[pos]])
+
+
+def resample_indices(
+    rng: np.random.Generator,
+    n_trades: int,
+    rows: int,
+    method: str,
+    block_length: int,
+) -> np.ndarray:
+    """
+    Draw the trade indices of ``rows`` resamples.
+
+    Used by the bootstrap workers of this module and by the Monte Carlo
+    simulator in ``metrics/monte_carlo.py``.
+
+    Parameters
+    ----------
+    rng : np.random.Generator
+        Source of randomness.
+    n_trades : int
+        Length of the trade sequence being resampled.
+    rows : int
+        Number of resamples.
+    method : str
+        ``"iid"``, ``"block"`` (moving blocks) or ``"stationary"``
+        (geometric run lengths); not validated here.
+    block_length : int
+        Block length, or mean run length for ``"stationary"``.
 
     Returns
     -------
-    BootstrapResult
+    np.ndarray
+        Integer indices into the trade sequence, shape
+        ``(rows, n_trades)``.
+    """
+    if method == "iid":
+        return rng.integers(0, n_trades, size=(rows, n_trades))
 
-    Raises
-    ------
-    ValueError
-        If trade_df is empty or missing net_pnl column.
+    if method == "block":
+        n_blocks = -(-n_trades // block_length)
+        starts = rng.integers(
+            0, n_trades - block_length + 1, size=(rows, n_blocks)
+        )
+        runs = starts[:, :, None] + np.arange(block_length)
+        return runs.reshape(rows, n_blocks * block_length)[:, :n_trades]
+
+    # Stationary: position t continues the run of the last restart r ≤ t,
+    # so its index is start[r] + (t − r), wrapped around the trade list.
+    # One draw per cell, uniform over n_trades × block_length: it restarts
+    # with probability 1/block_length, and is then a uniform start. A
+    # single row-major draw keeps the rows independent of the batch size.
+    starts = rng.integers(0, n_trades * block_length, size=(rows, n_trades))
+    restart = starts < n_trades
+    restart[:, 0] = True
+    starts %= n_trades
+    position = np.arange(n_trades)
+    last = np.where(restart, position, 0)
+    np.maximum.accumulate(last, axis=1, out=last)
+    indices = np.take_along_axis(starts, last, axis=1)
+    indices += position - last
+    indices %= n_trades
+    return indices
+
+
+def _compute_statistics(
+    values: np.ndarray,
+    statistics: Sequence[str],
+    sharpe_scale: float,
+) -> dict[str, np.ndarray]:
+    """
+    Each statistic over the last axis of a trade-PnL array: one value per
+    row of a ``(rows, n_trades)`` batch, or a scalar for a 1-D sequence.
+    """
+    out: dict[str, np.ndarray] = {}
+    for name in statistics:
+        if name == "expectancy":
+            out[name] = values.mean(axis=-1)
+        elif name == "win_rate":
+            wins = np.count_nonzero(values > 0, axis=-1)
+            out[name] = wins / values.shape[-1]
+        elif name == "profit_factor":
+            # Same split as compute_performance: winners have net_pnl > 0.
+            gross_profit = np.maximum(values, 0.0).sum(axis=-1)
+            gross_loss = np.minimum(values, 0.0).sum(axis=-1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out[name] = np.where(
+                    gross_loss != 0, gross_profit / np.abs(gross_loss), np.inf
+                )
+        elif name == "sharpe":
+            if values.shape[-1] < 2:
+                out[name] = np.full(values.shape[:-1], np.nan)
+                continue
+            std = values.std(axis=-1, ddof=1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out[name] = np.where(
+                    std > 0, values.mean(axis=-1) / std * sharpe_scale, np.nan
+                )
+        else:   # max_drawdown
+            # Equity starts at 0 before the first trade, as in the curve
+            # built by backtest.equity.
+            equity = np.cumsum(values, axis=-1)
+            peak = np.maximum.accumulate(equity, axis=-1)
+            np.maximum(peak, 0.0, out=peak)
+            equity -= peak
+            out[name] = equity.min(axis=-1)
+    return out
+
+
+def _sharpe_scale(trade_df: pd.DataFrame) -> float:
+    """
+    sqrt(trades per year) from the entry/exit span of the trades; 1.0
+    (per-trade Sharpe) if the span is unknown or empty.
+    """
+    if not {"entry_bar", "exit_bar"} <= set(trade_df.columns):
+        return 1.0
+    span = trade_df["exit_bar"].iloc[-1] - trade_df["entry_bar"].iloc[0]
+    years = span / pd.Timedelta(days=365.25)
+    if not years > 0:
+        return 1.0
+    return float(np.sqrt(len(trade_df) / years))
+
+
+@dataclass(frozen=True, slots=True)
+class _ShareTask:
+    """One worker's share of the resamples, with everything it needs."""
+    pnl: np.ndarray
+    n_resamples: int
+    seed: int | np.random.SeedSequence
+    method: str
+    block_length: int
+    statistics: tuple[str, ...]
+    sharpe_scale: float
+    keep_distribution: bool
+    batch_elements: int
+    sketch_size: int
+
+
+def _run_share(task: _ShareTask) -> dict[str, np.ndarray | QuantileSketch]:
     """
+    Draw one share of resamples batch by batch.
+
+    Returns, per statistic, the resampled values in draw order or a
+    :class:`QuantileSketch` of them.
+    """
+    rng = np.random.default_rng(task.seed)
+    n_trades = task.pnl.size
+    batch_rows = max(1, task.batch_elements // n_trades)
+
+    if task.keep_distribution:
+        out = {
+            name: np.empty(task.n_resamples, dtype=np.float64)
+            for name in task.statistics
+        }
+    else:
+        out = {
+            name: QuantileSketch(task.sketch_size)
+            for name in task.statistics
+        }
+
+    for lo in range(0, task.n_resamples, batch_rows):
+        rows = min(batch_rows, task.n_resamples - lo)
+        indices = resample_indices(
+            rng, n_trades, rows, task.method, task.block_length
+        )
+        values = _compute_statistics(
+            task.pnl[indices], task.statistics, task.sharpe_scale
+        )
+        for name, batch in values.items():
+            if task.keep_distribution:
+                out[name][lo:lo + rows] = batch
+            else:
+                out[name].update(batch)
+    return out
+
+
+def _bootstrap(
+    trade_df: pd.DataFrame,
+    statistics: tuple[str, ...],
+    method: Optional[str],
+    block_length: Optional[int],
+    n_resamples: Optional[int],
+    keep_distribution: Optional[bool],
+    workers: Optional[int],
+    executor: Optional[str],
+) -> MultiBootstrapResult:
+    """Validate arguments, fill defaults from settings and run the shares."""
     if trade_df.empty:
         raise ValueError("Cannot bootstrap: no trades found.")
     if "net_pnl" not in trade_df.columns:
         raise ValueError("trade_df must contain 'net_pnl' column.")
+    unknown = [name for name in statistics if name not in STATISTICS]
+    if unknown or not statistics:
+        raise ValueError(
+            f"Unknown bootstrap statistics {unknown}; expected a subset of "
+            f"{STATISTICS}."
+        )
+
+    method = S.BOOTSTRAP_METHOD if method is None else method
+    if method not in _METHODS:
+        raise ValueError(
+            f"Unknown bootstrap method {method!r}; expected one of {_METHODS}."
+        )
+    if n_resamples is None:
+        n_resamples = S.BOOTSTRAP_RESAMPLES
+    if keep_distribution is None:
+        keep_distribution = S.BOOTSTRAP_KEEP_DISTRIBUTION
+    workers = S.BOOTSTRAP_WORKERS if workers is None else workers
+    executor = S.BOOTSTRAP_EXECUTOR if executor is None else executor
+    if workers < 1:
+        raise ValueError("Bootstrap workers must be at least 1.")
+    if executor not in ("process", "thread"):
+        raise ValueError(
+            f"Unknown bootstrap executor {executor!r}; "
+            "expected 'process' or 'thread'."
+        )
 
     pnl_values: np.ndarray = trade_df["net_pnl"].to_numpy(dtype=np.float64)
     n_trades = len(pnl_values)
-    observed_expectancy = float(pnl_values.mean())
 
-    rng = np.random.default_rng(S.BOOTSTRAP_RANDOM_SEED)
-    n_resamples = S.BOOTSTRAP_RESAMPLES
+    if method == "iid":
+        block_length = 1
+    else:
+        if block_length is None:
+            block_length = S.BOOTSTRAP_BLOCK_LENGTH
+        if block_length is None:
+            block_length = max(1, round(n_trades ** (1 / 3)))
+        if block_length < 1:
+            raise ValueError("Bootstrap block length must be at least 1.")
+        block_length = min(block_length, n_trades)
+
+    sharpe_scale = _sharpe_scale(trade_df)
+    observed = {
+        name: float(value)
+        for name, value in _compute_statistics(
+            pnl_values, statistics, sharpe_scale
+        ).items()
+    }
 
-    # Vectorised bootstrap: draw all samples at once.
-    indices = rng.integers(0, n_trades, size=(n_resamples, n_trades))
-    resampled_means = pnl_values[indices].mean(axis=1)
+    # One worker draws from default_rng(seed) itself; several workers
+    # draw from independent child streams, one per contiguous share.
+    workers = min(workers, max(1, n_resamples))
+    if workers == 1:
+        seeds: list = [S.BOOTSTRAP_RANDOM_SEED]
+    else:
+        seeds = np.random.SeedSequence(S.BOOTSTRAP_RANDOM_SEED).spawn(workers)
+    base, extra = divmod(n_resamples, workers)
+    tasks = [
+        _ShareTask(
+            pnl=pnl_values,
+            n_resamples=base + (k < extra),
+            seed=seed,
+            method=method,
+            block_length=block_length,
+            statistics=statistics,
+            sharpe_scale=sharpe_scale,
+            keep_distribution=keep_distribution,
+            batch_elements=S.BOOTSTRAP_BATCH_ELEMENTS,
+            sketch_size=S.BOOTSTRAP_SKETCH_SIZE,
+        )
+        for k, seed in enumerate(seeds)
+    ]
+
+    if workers == 1:
+        shares = [_run_share(tasks[0])]
+    else:
+        pool_class = (
+            ProcessPoolExecutor if executor == "process"
+            else ThreadPoolExecutor
+        )
+        with pool_class(max_workers=workers) as pool:
+            shares = list(pool.map(_run_share, tasks))
 
     alpha = 1.0 - S.BOOTSTRAP_CONFIDENCE
-    ci_lower = float(np.percentile(resampled_means, 100 * alpha / 2))
-    ci_upper = float(np.percentile(resampled_means, 100 * (1 - alpha / 2)))
+    ci_lower: dict[str, float] = {}
+    ci_upper: dict[str, float] = {}
+    distributions: Optional[dict[str, np.ndarray]] = None
+    if keep_distribution:
+        distributions = {
+            name: np.concatenate([share[name] for share in shares])
+            for name in statistics
+        }
+        for name, values in distributions.items():
+            ci_lower[name] = float(np.percentile(values, 100 * alpha / 2))
+            ci_upper[name] = float(
+                np.percentile(values, 100 * (1 - alpha / 2))
+            )
+    else:
+        for name in statistics:
+            sketch = shares[0][name]
+            for share in shares[1:]:
+                sketch.merge(share[name])
+            ci_lower[name] = sketch.quantile(alpha / 2)
+            ci_upper[name] = sketch.quantile(1 - alpha / 2)
+
+    return MultiBootstrapResult(
+        observed=observed,
+        ci_lower=ci_lower,
+        ci_upper=ci_upper,
+        confidence_level=S.BOOTSTRAP_CONFIDENCE,
+        n_resamples=n_resamples,
+        distributions=distributions,
+        method=method,
+        block_length=block_length,
+        workers=workers,
+    )
+
+
+def run_bootstrap(
+    trade_df: pd.DataFrame,
+    method: Optional[str] = None,
+    block_length: Optional[int] = None,
+    n_resamples: Optional[int] = None,
+    keep_distribution: Optional[bool] = None,
+    workers: Optional[int] = None,
+) -> BootstrapResult:
+    """
+    Run trade-level bootstrap on the net PnL column.
+
+    Parameters
+    ----------
+    trade_df : pd.DataFrame
+        Output of ``Ledger.to_dataframe()``.
+        Must contain column ``net_pnl``; rows in time order.
+    method : str, optional
+        ``"iid"``, ``"block"`` or ``"stationary"``.
+        Default: settings.BOOTSTRAP_METHOD.
+    block_length : int, optional
+        Block length (mean length for ``"stationary"``), capped at the
+        number of trades. Default: settings.BOOTSTRAP_BLOCK_LENGTH, or
+        ``round(n_trades ** (1/3))`` if that is None. Ignored for
+        ``"iid"``.
+    n_resamples : int, optional
+        Default: settings.BOOTSTRAP_RESAMPLES.
+    keep_distribution : bool, optional
+        Keep every resampled expectancy (exact CI) instead of a quantile
+        sketch. Default: settings.BOOTSTRAP_KEEP_DISTRIBUTION.
+    workers : int, optional
+        Pool size; see :func:`bootstrap_statistics`.
+        Default: settings.BOOTSTRAP_WORKERS.
+
+    Returns
+    -------
+    BootstrapResult
+
+    Raises
+    ------
+    ValueError
+        If trade_df is empty or missing net_pnl column, or if the method
+        or block length is invalid.
+    """
+    result = _bootstrap(
+        trade_df, ("expectancy",), method, block_length, n_resamples,
+        keep_distribution, workers, None,
+    )
 
     logger.info(
-        "Bootstrap (%d resamples): expectancy=%.2f  "
+        "Bootstrap (%s, block %d, %d resamples): expectancy=%.2f  "
         "CI[%.0f%%]: [%.2f, %.2f]",
-        n_resamples,
-        observed_expectancy,
+        result.method,
+        result.block_length,
+        result.n_resamples,
+        result.observed["expectancy"],
         S.BOOTSTRAP_CONFIDENCE * 100,
-        ci_lower,
-        ci_upper,
+        result.ci_lower["expectancy"],
+        result.ci_upper["expectancy"],
     )
 
     return BootstrapResult(
-        observed_expectancy=observed_expectancy,
-        ci_lower=ci_lower,
-        ci_upper=ci_upper,
-        confidence_level=S.BOOTSTRAP_CONFIDENCE,
-        n_resamples=n_resamples,
-        expectancy_distribution=resampled_means,
+        observed_expectancy=result.observed["expectancy"],
+        ci_lower=result.ci_lower["expectancy"],
+        ci_upper=result.ci_upper["expectancy"],
+        confidence_level=result.confidence_level,
+        n_resamples=result.n_resamples,
+        expectancy_distribution=(
+            None if result.distributions is None
+            else result.distributions["expectancy"]
+        ),
+        method=result.method,
+        block_length=result.block_length,
+    )
+
+
+def bootstrap_statistics(
+    trade_df: pd.DataFrame,
+    statistics: Sequence[str] = STATISTICS,
+    method: Optional[str] = None,
+    block_length: Optional[int] = None,
+    n_resamples: Optional[int] = None,
+    keep_distribution: Optional[bool] = None,
+    workers: Optional[int] = None,
+    executor: Optional[str] = None,
+) -> MultiBootstrapResult:
+    """
+    Bootstrap several trade statistics from the same resamples.
+
+    Every resample is one trade sequence; each statistic is computed on
+    it, so the distributions are joint. ``sharpe`` is the trade-level
+    Sharpe ratio, mean / std of net PnL per trade annualised by the
+    number of trades per year over the entry–exit span (unlike the
+    bar-level ``PerformanceSummary.sharpe_ratio``). ``max_drawdown`` is
+    the deepest fall of the cumulative PnL of the resampled sequence
+    below its running peak (starting from 0), in USD.
+
+    Parallelism
+    -----------
+    With ``workers`` > 1 the resamples are split into ``workers``
+    contiguous shares. Share *k* draws from its own generator, seeded by
+    the *k*-th child of ``SeedSequence(BOOTSTRAP_RANDOM_SEED).spawn``, so
+    the result depends on the seed and the worker count only — never on
+    scheduling. ``workers=1`` runs in-process on
+    ``default_rng(BOOTSTRAP_RANDOM_SEED)`` and matches :func:`run_bootstrap`.
+
+    Parameters
+    ----------
+    trade_df : pd.DataFrame
+        Output of ``Ledger.to_dataframe()``; rows in time order.
+    statistics : sequence of str
+        Subset of :data:`STATISTICS`. Default: all of them.
+    method, block_length, n_resamples, keep_distribution
+        As in :func:`run_bootstrap`.
+    workers : int, optional
+        Pool size. Default: settings.BOOTSTRAP_WORKERS.
+    executor : str, optional
+        ``"process"`` or ``"thread"``. Default: settings.BOOTSTRAP_EXECUTOR.
+
+    Returns
+    -------
+    MultiBootstrapResult
+
+    Raises
+    ------
+    ValueError
+        If trade_df is empty or missing net_pnl column, or if a statistic,
+        the method, the block length, the worker count or the executor is
+        invalid.
+    """
+    result = _bootstrap(
+        trade_df, tuple(statistics), method, block_length, n_resamples,
+        keep_distribution, workers, executor,
+    )
+    logger.info(
+        "Bootstrap (%s, block %d, %d resamples, %d worker(s)): %s",
+        result.method, result.block_length, result.n_resamples,
+        result.workers,
+        "  ".join(
+            f"{name}={result.observed[name]:.4g} "
+            f"[{result.ci_lower[name]:.4g}, {result.ci_upper[name]:.4g}]"
+            for name in result.observed
+        ),
     )
+    return result
@@ -7,12 +7,22 @@ Drawdown at bar[i] is defined as the decline from the running peak:
     dd[i] = equity[i] - max(equity[0..i])
 
 Maximum drawdown is the largest single trough below any preceding peak.
+
+The per-bar ``drawdown_series`` and ``peak_series`` of a
+:class:`DrawdownResult` may be passed in, or derived from its ``equity``
+when first read, so callers that need just the maxima (parameter
+sweeps, ``metrics/fused.py``) never allocate them.
+
+:func:`path_drawdowns` applies the same definition to a 2-D batch of
+trade-PnL sequences at once (one cumulative sum and one running maximum
+along each row), for Monte Carlo and bootstrap resamples.
 """
 
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
 
 import numpy as np
 import pandas as pd
@@ -20,11 +30,16 @@ import pandas as pd
 logger = logging.getLogger(__name__)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, init=False)
 class DrawdownResult:
     """
     Drawdown statistics for an equity curve.
 
+    Construct it either with both series, as
+    ``DrawdownResult(max_usd, max_pct, drawdown_series, peak_series)``,
+    or with ``equity=`` only; the series are then derived from the
+    equity curve on first access and kept.
+
     Attributes
     ----------
     max_drawdown_usd : float
@@ -36,11 +51,54 @@ class DrawdownResult:
         Bar-resolution drawdown series (USD).
     peak_series : pd.Series
         Running equity peak series.
+    equity : pd.Series or None
+        The equity curve the statistics were computed from, if given.
+
+    Raises
+    ------
+    TypeError
+        If a series is missing and no equity curve is given.
     """
     max_drawdown_usd: float
     max_drawdown_pct: float
-    drawdown_series: pd.Series
-    peak_series: pd.Series
+    drawdown_series: pd.Series = field(repr=False, compare=False)
+    peak_series: pd.Series = field(repr=False, compare=False)
+    equity: Optional[pd.Series] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def __init__(
+        self,
+        max_drawdown_usd: float,
+        max_drawdown_pct: float,
+        drawdown_series: Optional[pd.Series] = None,
+        peak_series: Optional[pd.Series] = None,
+        equity: Optional[pd.Series] = None,
+    ) -> None:
+        if equity is None and (drawdown_series is None or peak_series is None):
+            raise TypeError(
+                "DrawdownResult needs drawdown_series and peak_series, "
+                "or equity."
+            )
+        object.__setattr__(self, "max_drawdown_usd", max_drawdown_usd)
+        object.__setattr__(self, "max_drawdown_pct", max_drawdown_pct)
+        object.__setattr__(self, "equity", equity)
+        # Series not given are left unset; __getattr__ derives them.
+        if drawdown_series is not None:
+            object.__setattr__(self, "drawdown_series", drawdown_series)
+        if peak_series is not None:
+            object.__setattr__(self, "peak_series", peak_series)
+
+    def __getattr__(self, name: str) -> pd.Series:
+        # Only reached for attributes that were never set.
+        if name == "peak_series":
+            value = self.equity.cummax()
+        elif name == "drawdown_series":
+            value = self.equity - self.peak_series
+        else:
+            raise AttributeError(name)
+        object.__setattr__(self, name, value)
+        return value
 
 
 def compute_drawdown(equity: pd.Series) -> DrawdownResult:
@@ -69,7 +127,6 @@ def compute_drawdown(equity: pd.Series) -> DrawdownResult:
     with np.errstate(invalid="ignore", divide="ignore"):
         dd_pct = np.where(peak != 0, drawdown_usd / peak, np.nan)
 
-    dd_pct_series = pd.Series(dd_pct, index=equity.index)
     max_dd_pct = float(np.nanmin(dd_pct))
 
     logger.info(
@@ -83,3 +140,108 @@ def compute_drawdown(equity: pd.Series) -> DrawdownResult:
         drawdown_series=drawdown_usd,
         peak_series=peak,
     )
+
+
+@dataclass(frozen=True)
+class PathDrawdowns:
+    """
+    Drawdown statistics of a batch of trade sequences, one value per row.
+
+    Attributes
+    ----------
+    max_drawdown_usd : np.ndarray
+        Largest decline below the running peak (negative or 0).
+    max_drawdown_pct : np.ndarray
+        Largest decline as a fraction of the peak it fell from. NaN where
+        every peak is zero, as in :func:`compute_drawdown`.
+    max_underwater_trades : np.ndarray
+        Longest run of consecutive trades that end below the running
+        peak (time under water, in trades).
+    underwater_fraction : np.ndarray
+        Fraction of trades that end below the running peak.
+    min_equity : np.ndarray
+        Lowest equity reached, including the starting equity.
+    final_equity : np.ndarray
+        Equity after the last trade.
+    """
+    max_drawdown_usd: np.ndarray
+    max_drawdown_pct: np.ndarray
+    max_underwater_trades: np.ndarray
+    underwater_fraction: np.ndarray
+    min_equity: np.ndarray
+    final_equity: np.ndarray
+
+
+def path_drawdowns(
+    pnl_paths: np.ndarray,
+    initial_capital: float = 0.0,
+) -> PathDrawdowns:
+    """
+    Drawdown statistics of many trade-PnL sequences at once.
+
+    Row *r* is the equity curve ``initial_capital`` followed by
+    ``initial_capital + cumsum(pnl_paths[r])`` — the trade-exit steps of
+    ``backtest.equity.build_equity_curve`` — so for a single row the
+    drawdown figures equal :func:`compute_drawdown` on that curve.
+
+    Parameters
+    ----------
+    pnl_paths : np.ndarray
+        Net PnL per trade, shape ``(n_paths, n_trades)``.
+    initial_capital : float
+        Equity before the first trade.
+
+    Returns
+    -------
+    PathDrawdowns
+
+    Raises
+    ------
+    ValueError
+        If ``pnl_paths`` is not 2-D or has no trades.
+    """
+    if pnl_paths.ndim != 2 or pnl_paths.shape[1] == 0:
+        raise ValueError("pnl_paths must have shape (n_paths, n_trades >= 1).")
+    n_trades = pnl_paths.shape[1]
+
+    equity = np.cumsum(pnl_paths, axis=1, dtype=np.float64)
+    equity += initial_capital
+    final_equity = equity[:, -1].copy()
+    min_equity = np.minimum(equity.min(axis=1), initial_capital)
+
+    peak = np.maximum.accumulate(equity, axis=1)
+    np.maximum(peak, initial_capital, out=peak)
+    drawdown = equity   # reuse the buffer: equity is not needed below
+    drawdown -= peak
+    max_dd_usd = drawdown.min(axis=1)
+
+    underwater = drawdown < 0
+    underwater_fraction = np.count_nonzero(underwater, axis=1) / n_trades
+
+    # Longest underwater run: distance from the last trade at a peak
+    # (position 0 is the starting equity, always at its peak).
+    position = np.arange(1, n_trades + 1)
+    last_peak = np.where(underwater, 0, position)
+    del underwater
+    np.maximum.accumulate(last_peak, axis=1, out=last_peak)
+    np.subtract(position, last_peak, out=last_peak)
+    max_underwater = last_peak.max(axis=1)
+    del last_peak
+
+    # Percentage drawdown, NaN where the peak is zero.
+    zero_peak = peak == 0
+    np.divide(drawdown, peak, out=peak, where=~zero_peak)
+    peak[zero_peak] = np.nan
+    max_dd_pct = np.fmin.reduce(peak, axis=1)
+    if initial_capital != 0:
+        # The starting point itself: drawdown 0 below a non-zero peak.
+        np.fmin(max_dd_pct, 0.0, out=max_dd_pct)
+
+    return PathDrawdowns(
+        max_drawdown_usd=max_dd_usd,
+        max_drawdown_pct=max_dd_pct,
+        max_underwater_trades=max_underwater,
+        underwater_fraction=underwater_fraction,
+        min_equity=min_equity,
+        final_equity=final_equity,
+    )
@@ -0,0 +1,235 @@
+"""
+fused.py
+========
+Computes the ``PerformanceSummary`` and ``DrawdownResult`` of a run in
+one pass over the trade PnL array and one pass over the equity array.
+
+Method
+------
+The reference functions (``compute_performance``, ``compute_drawdown``)
+filter the trade frame into winner/loser copies, reduce them several
+times, and build ``diff``, ``cummax``, drawdown and percentage Series
+over the equity curve — several full-length allocations per run. Here:
+
+  - one loop over ``net_pnl``/``is_winner`` accumulates the winner
+    count and the gross profit and loss (everything else in the summary
+    derives from those and the trade count);
+  - one loop over the equity values carries the running peak, the
+    deepest drawdown in USD and as a fraction of its peak, and
+    Welford's running mean/variance of the bar-to-bar equity changes
+    for the Sharpe ratio.
+
+No bar-length array is allocated. The per-bar drawdown and peak series
+of the returned ``DrawdownResult`` are built only if read.
+
+Both loops are numba-compiled when numba is installed
+(``utils.jit.NUMBA_AVAILABLE``). Without it the same quantities
+come from a few in-place NumPy passes that reuse one scratch buffer.
+
+Results equal the reference functions up to floating-point summation
+order (about 1e-12 relative).
+
+This module does NOT modify trades or equity data.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from config import settings as S
+from metrics.drawdown import DrawdownResult, compute_drawdown
+from metrics.performance import (
+    M5_BARS_PER_YEAR,
+    PerformanceSummary,
+    cagr_from_values,
+    compute_performance,
+)
+from utils.jit import NUMBA_AVAILABLE, njit
+
+logger = logging.getLogger(__name__)
+
+
+@njit(cache=True)
+def _trade_kernel(pnl, is_winner):
+    """Winner count, gross profit and gross loss in one pass."""
+    n_win = 0
+    gross_profit = 0.0
+    gross_loss = 0.0
+    for k in range(pnl.size):
+        if is_winner[k]:
+            n_win += 1
+            gross_profit += pnl[k]
+        else:
+            gross_loss += pnl[k]
+    return n_win, gross_profit, gross_loss
+
+
+@njit(cache=True)
+def _equity_kernel(equity):
+    """
+    Max drawdown (USD and fraction of peak) and the mean and sum of
+    squared deviations of the bar-to-bar changes, in one pass.
+    """
+    peak = equity[0]
+    max_dd = 0.0
+    # The first bar is at its peak: 0 % drawdown (signed like the
+    # reference's 0 / peak) unless the peak is 0.
+    max_pct = 0.0 / peak if peak != 0 else np.nan
+    mean = 0.0
+    m2 = 0.0
+    for i in range(1, equity.size):
+        value = equity[i]
+        if value > peak:
+            peak = value
+        dd = value - peak
+        if dd < max_dd:
+            max_dd = dd
+        if peak != 0:
+            pct = dd / peak
+            if not pct >= max_pct:   # also replaces a NaN max_pct
+                max_pct = pct
+        change = value - equity[i - 1]
+        delta = change - mean
+        mean += delta / i
+        m2 += delta * (change - mean)
+    return max_dd, max_pct, mean, m2
+
+
+def _trade_numpy(
+    pnl: np.ndarray,
+    is_winner: np.ndarray,
+) -> tuple[int, float, float]:
+    """NumPy form of :func:`_trade_kernel`."""
+    n_win = int(np.count_nonzero(is_winner))
+    gross_profit = float(np.sum(pnl, where=is_winner))
+    gross_loss = float(np.sum(pnl, where=~is_winner))
+    return n_win, gross_profit, gross_loss
+
+
+def _equity_numpy(equity: np.ndarray) -> tuple[float, float, float, float]:
+    """NumPy form of :func:`_equity_kernel`, in two reused buffers."""
+    peak = np.maximum.accumulate(equity)
+    drawdown = np.subtract(equity, peak)
+    max_dd = float(drawdown.min())
+
+    nonzero = peak != 0
+    np.divide(drawdown, peak, out=drawdown, where=nonzero)
+    max_pct = (
+        float(np.min(drawdown, where=nonzero, initial=np.inf))
+        if nonzero.any() else float("nan")
+    )
+
+    if equity.size < 2:
+        return max_dd, max_pct, 0.0, 0.0
+    changes = np.subtract(equity[1:], equity[:-1], out=peak[:-1])
+    mean = float(changes.mean())
+    changes -= mean
+    return max_dd, max_pct, mean, float(np.dot(changes, changes))
+
+
+def compute_metrics(
+    trade_df: pd.DataFrame,
+    equity: pd.Series | np.ndarray,
+    engine: Optional[str] = None,
+) -> tuple[PerformanceSummary, DrawdownResult]:
+    """
+    Compute the performance summary and drawdown statistics of a run.
+
+    Parameters
+    ----------
+    trade_df : pd.DataFrame
+        Output of ``Ledger.to_dataframe()``.
+        Required columns: net_pnl, is_winner.
+    equity : pd.Series or np.ndarray
+        Bar-resolution equity curve (cumulative net PnL).
+    engine : str, optional
+        ``"fused"`` (single pass) or ``"pandas"`` (reference
+        ``compute_performance`` + ``compute_drawdown``).
+        Default: settings.METRICS_ENGINE.
+
+    Returns
+    -------
+    tuple[PerformanceSummary, DrawdownResult]
+
+    Raises
+    ------
+    ValueError
+        If trade_df is empty, equity is empty, or the engine is unknown.
+    """
+    engine = S.METRICS_ENGINE if engine is None else engine
+    if not isinstance(equity, pd.Series):
+        equity = pd.Series(equity, copy=False)
+    if engine == "pandas":
+        return compute_performance(trade_df, equity), compute_drawdown(equity)
+    if engine != "fused":
+        raise ValueError(f"Unknown metrics engine: {engine!r}.")
+
+    if trade_df.empty:
+        raise ValueError("Cannot compute performance: no trades found.")
+    if equity.empty:
+        raise ValueError("Cannot compute drawdown on an empty equity series.")
+
+    pnl = trade_df["net_pnl"].to_numpy(dtype=np.float64)
+    is_winner = trade_df["is_winner"].to_numpy(dtype=bool)
+    values = equity.to_numpy(dtype=np.float64)
+
+    if NUMBA_AVAILABLE:
+        n_win, gross_profit, gross_loss = _trade_kernel(pnl, is_winner)
+        max_dd, max_pct, mean, m2 = _equity_kernel(values)
+    else:
+        n_win, gross_profit, gross_loss = _trade_numpy(pnl, is_winner)
+        max_dd, max_pct, mean, m2 = _equity_numpy(values)
+
+    total = len(pnl)
+    n_loss = total - n_win
+    # Same scalar types as the reference: NumPy sums, or Python 0.0 for
+    # a side with no trades.
+    gross_profit = np.float64(gross_profit) if n_win else 0.0
+    gross_loss = np.float64(gross_loss) if n_loss else 0.0
+    profit_factor = (
+        gross_profit / abs(gross_loss) if gross_loss != 0 else float("inf")
+    )
+
+    n_changes = values.size - 1
+    sharpe = float("nan")
+    if n_changes >= 2:
+        std = float(np.sqrt(m2 / (n_changes - 1)))
+        if std != 0:
+            sharpe = (mean / std) * np.sqrt(M5_BARS_PER_YEAR)
+    cagr = (
+        cagr_from_values(values[0], values[-1], values.size)
+        if values.size >= 2 else float("nan")
+    )
+
+    summary = PerformanceSummary(
+        total_trades=total,
+        winning_trades=n_win,
+        losing_trades=n_loss,
+        win_rate=n_win / total,
+        gross_profit=gross_profit,
+        gross_loss=gross_loss,
+        net_profit=gross_profit + gross_loss,
+        profit_factor=profit_factor,
+        expectancy=float((gross_profit + gross_loss) / total),
+        avg_win=gross_profit / n_win if n_win else float("nan"),
+        avg_loss=gross_loss / n_loss if n_loss else float("nan"),
+        cagr=cagr,
+        sharpe_ratio=sharpe,
+    )
+    drawdown = DrawdownResult(
+        max_drawdown_usd=max_dd,
+        max_drawdown_pct=max_pct,
+        equity=equity,
+    )
+
+    logger.info(
+        "Performance: trades=%d  win_rate=%.1f%%  PF=%.2f  "
+        "expectancy=%.2f  CAGR=%.2f%%  Sharpe=%.2f  MaxDD=%.2f USD",
+        total, summary.win_rate * 100, profit_factor,
+        summary.expectancy, cagr * 100, sharpe, max_dd,
+    )
+    return summary, drawdown
@@ -0,0 +1,292 @@
+"""
+monte_carlo.py
+==============
+Monte Carlo simulation of the trade sequence for drawdown and
+risk-of-ruin distributions.
+
+Method
+------
+The ledger's net PnL sequence is resampled into many alternative
+orderings (paths) of the same length:
+  - ``"shuffle"``: a random permutation — the same trades in another
+    order, so every path has the same final PnL and only the path
+    risk changes;
+  - ``"iid"``, ``"block"``, ``"stationary"``: the bootstrap schemes of
+    ``metrics/bootstrap.py`` (draws with replacement; the block schemes
+    keep runs of consecutive trades together).
+
+Each path starts at settings.MONTE_CARLO_INITIAL_CAPITAL and is scored
+with ``metrics.drawdown.path_drawdowns``: maximum drawdown (USD and %),
+the longest run of trades under water, the fraction of trades under
+water, and whether equity ever fell to the ruin level
+``capital × (1 − MONTE_CARLO_RUIN_LOSS)``. The ruin probability is the
+fraction of paths that did.
+
+Memory
+------
+Paths are simulated in batches whose working set (indices, equity, peak
+and masks for a ``(rows, n_trades)`` block) fits
+settings.MONTE_CARLO_MEMORY_BYTES. Only the per-path statistics are
+kept: a few numbers per path, whatever the number of trades.
+
+This module does NOT modify the trade list or size positions.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config import settings as S
+from metrics.bootstrap import resample_indices
+from metrics.drawdown import path_drawdowns
+
+logger = logging.getLogger(__name__)
+
+_METHODS: tuple[str, ...] = ("shuffle", "iid", "block", "stationary")
+
+# Peak working memory per (path, trade) cell of a batch: int64 indices,
+# gathered PnL, equity/drawdown, peak, run positions and masks.
+_BYTES_PER_CELL: int = 48
+
+
+@dataclass(frozen=True)
+class MonteCarloResult:
+    """
+    Per-path risk statistics of a Monte Carlo run.
+
+    Attributes
+    ----------
+    method : str
+    block_length : int
+        Block length (mean length for ``"stationary"``); 1 otherwise.
+    n_paths : int
+    initial_capital : float
+    ruin_equity : float
+        Equity at or below which a path counts as ruined.
+    max_drawdown_usd : np.ndarray
+        Per path; negative or 0.
+    max_drawdown_pct : np.ndarray
+        Per path, as a fraction of the peak equity; negative or 0.
+    max_underwater_trades : np.ndarray
+        Per path: longest run of trades ending below the running peak.
+    underwater_fraction : np.ndarray
+        Per path: fraction of trades ending below the running peak.
+    final_pnl : np.ndarray
+        Per path: cumulative net PnL after the last trade.
+    ruined : np.ndarray
+        Per path: True if equity reached ``ruin_equity``.
+    """
+    method: str
+    block_length: int
+    n_paths: int
+    initial_capital: float
+    ruin_equity: float
+    max_drawdown_usd: np.ndarray
+    max_drawdown_pct: np.ndarray
+    max_underwater_trades: np.ndarray
+    underwater_fraction: np.ndarray
+    final_pnl: np.ndarray
+    ruined: np.ndarray
+
+    @property
+    def ruin_probability(self) -> float:
+        """Fraction of paths that reached the ruin level."""
+        return float(self.ruined.mean())
+
+    def drawdown_at_risk(self, confidence: float = 0.95) -> float:
+        """
+        Maximum drawdown (USD) not exceeded by ``confidence`` of paths,
+        i.e. the ``1 − confidence`` quantile of ``max_drawdown_usd``.
+        """
+        return float(np.quantile(self.max_drawdown_usd, 1.0 - confidence))
+
+    def summary(
+        self,
+        quantiles: Sequence[float] = (0.01, 0.05, 0.5, 0.95, 0.99),
+    ) -> pd.DataFrame:
+        """
+        Mean and quantiles of each per-path statistic.
+
+        Drawdowns are negative, so the low quantiles are the bad tail;
+        for the underwater statistics the high quantiles are.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per statistic; columns ``mean`` and ``q<quantile>``.
+        """
+        rows = {
+            "max_drawdown_usd": self.max_drawdown_usd,
+            "max_drawdown_pct": self.max_drawdown_pct,
+            "max_underwater_trades": self.max_underwater_trades,
+            "underwater_fraction": self.underwater_fraction,
+            "final_pnl": self.final_pnl,
+        }
+        table = {
+            name: {
+                "mean": float(np.mean(values)),
+                **{
+                    f"q{q:g}": float(np.quantile(values, q))
+                    for q in quantiles
+                },
+            }
+            for name, values in rows.items()
+        }
+        return pd.DataFrame.from_dict(table, orient="index")
+
+
+def _shuffle_indices(
+    rng: np.random.Generator,
+    n_trades: int,
+    rows: int,
+) -> np.ndarray:
+    """``rows`` independent permutations of the trade indices."""
+    indices = np.tile(np.arange(n_trades), (rows, 1))
+    return rng.permuted(indices, axis=1, out=indices)
+
+
+def run_monte_carlo(
+    trade_df: pd.DataFrame,
+    n_paths: Optional[int] = None,
+    method: Optional[str] = None,
+    block_length: Optional[int] = None,
+    initial_capital: Optional[float] = None,
+    ruin_loss: Optional[float] = None,
+    memory_bytes: Optional[int] = None,
+) -> MonteCarloResult:
+    """
+    Simulate alternative trade sequences and collect their risk statistics.
+
+    Parameters
+    ----------
+    trade_df : pd.DataFrame
+        Output of ``Ledger.to_dataframe()``.
+        Must contain column ``net_pnl``; rows in time order.
+    n_paths : int, optional
+        Default: settings.MONTE_CARLO_PATHS.
+    method : str, optional
+        ``"shuffle"``, ``"iid"``, ``"block"`` or ``"stationary"``.
+        Default: settings.MONTE_CARLO_METHOD.
+    block_length : int, optional
+        For ``"block"``/``"stationary"``, capped at the number of trades.
+        Default: settings.MONTE_CARLO_BLOCK_LENGTH, or
+        ``round(n_trades ** (1/3))`` if that is None.
+    initial_capital : float, optional
+        Equity before the first trade.
+        Default: settings.MONTE_CARLO_INITIAL_CAPITAL.
+    ruin_loss : float, optional
+        Loss, as a fraction of ``initial_capital``, that counts as ruin.
+        Default: settings.MONTE_CARLO_RUIN_LOSS.
+    memory_bytes : int, optional
+        Working-memory budget per batch.
+        Default: settings.MONTE_CARLO_MEMORY_BYTES.
+
+    Returns
+    -------
+    MonteCarloResult
+
+    Raises
+    ------
+    ValueError
+        If trade_df is empty or missing net_pnl column, or if the method,
+        path count, block length, capital or ruin loss is invalid.
+    """
+    if trade_df.empty:
+        raise ValueError("Cannot run Monte Carlo: no trades found.")
+    if "net_pnl" not in trade_df.columns:
+        raise ValueError("trade_df must contain 'net_pnl' column.")
+
+    method = S.MONTE_CARLO_METHOD if method is None else method
+    if method not in _METHODS:
+        raise ValueError(
+            f"Unknown Monte Carlo method {method!r}; expected one of "
+            f"{_METHODS}."
+        )
+    if n_paths is None:
+        n_paths = S.MONTE_CARLO_PATHS
+    if initial_capital is None:
+        initial_capital = S.MONTE_CARLO_INITIAL_CAPITAL
+    if ruin_loss is None:
+        ruin_loss = S.MONTE_CARLO_RUIN_LOSS
+    if memory_bytes is None:
+        memory_bytes = S.MONTE_CARLO_MEMORY_BYTES
+    if n_paths < 1:
+        raise ValueError("Monte Carlo needs at least one path.")
+    if initial_capital <= 0:
+        raise ValueError("Monte Carlo initial capital must be positive.")
+    if not 0 < ruin_loss <= 1:
+        raise ValueError("Monte Carlo ruin loss must be in (0, 1].")
+
+    pnl_values: np.ndarray = trade_df["net_pnl"].to_numpy(dtype=np.float64)
+    n_trades = len(pnl_values)
+
+    if method in ("shuffle", "iid"):
+        block_length = 1
+    else:
+        if block_length is None:
+            block_length = S.MONTE_CARLO_BLOCK_LENGTH
+        if block_length is None:
+            block_length = max(1, round(n_trades ** (1 / 3)))
+        if block_length < 1:
+            raise ValueError("Monte Carlo block length must be at least 1.")
+        block_length = min(block_length, n_trades)
+
+    ruin_equity = initial_capital * (1.0 - ruin_loss)
+    batch_rows = max(1, memory_bytes // (n_trades * _BYTES_PER_CELL))
+    rng = np.random.default_rng(S.MONTE_CARLO_RANDOM_SEED)
+
+    max_dd_usd = np.empty(n_paths)
+    max_dd_pct = np.empty(n_paths)
+    max_underwater = np.empty(n_paths, dtype=np.int64)
+    underwater_fraction = np.empty(n_paths)
+    final_pnl = np.empty(n_paths)
+    ruined = np.empty(n_paths, dtype=bool)
+
+    for lo in range(0, n_paths, batch_rows):
+        rows = min(batch_rows, n_paths - lo)
+        if method == "shuffle":
+            indices = _shuffle_indices(rng, n_trades, rows)
+        else:
+            indices = resample_indices(
+                rng, n_trades, rows, method, block_length
+            )
+        paths = pnl_values[indices]
+        del indices
+        dd = path_drawdowns(paths, initial_capital)
+        del paths
+
+        hi = lo + rows
+        max_dd_usd[lo:hi] = dd.max_drawdown_usd
+        max_dd_pct[lo:hi] = dd.max_drawdown_pct
+        max_underwater[lo:hi] = dd.max_underwater_trades
+        underwater_fraction[lo:hi] = dd.underwater_fraction
+        final_pnl[lo:hi] = dd.final_equity - initial_capital
+        ruined[lo:hi] = dd.min_equity <= ruin_equity
+
+    result = MonteCarloResult(
+        method=method,
+        block_length=block_length,
+        n_paths=n_paths,
+        initial_capital=initial_capital,
+        ruin_equity=ruin_equity,
+        max_drawdown_usd=max_dd_usd,
+        max_drawdown_pct=max_dd_pct,
+        max_underwater_trades=max_underwater,
+        underwater_fraction=underwater_fraction,
+        final_pnl=final_pnl,
+        ruined=ruined,
+    )
+
+    logger.info(
+        "Monte Carlo (%s, %d paths x %d trades): median max DD %.2f USD, "
+        "95%% DD-at-risk %.2f USD, ruin probability %.2f%%",
+        method, n_paths, n_trades,
+        float(np.median(max_dd_usd)), result.drawdown_at_risk(0.95),
+        result.ruin_probability * 100,
+    )
+    return result
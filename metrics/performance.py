@@ -151,12 +151,17 @@ def _compute_cagr(equity: pd.Series) -> float:
     """
     if len(equity) < 2:
         return float("nan")
+    return cagr_from_values(equity.iloc[0], equity.iloc[-1], len(equity))
 
-    n_bars = len(equity)
-    years = n_bars / M5_BARS_PER_YEAR
 
-    start = equity.iloc[0]
-    end = equity.iloc[-1]
+def cagr_from_values(start: float, end: float, n_bars: int) -> float:
+    """
+    CAGR from the first and last equity values of an ``n_bars`` curve.
+
+    Shared by :func:`_compute_cagr` and ``metrics/fused.py``. Returns NaN
+    when ``start`` is 0 or the ratio ``end / start`` is not positive.
+    """
+    years = n_bars / M5_BARS_PER_YEAR
 
     if start == 0:
         # Curve starts at 0 — use total return over the period instead.
@@ -0,0 +1,189 @@
+"""
+bar_builder.py
+==============
+Incremental M1 → M5 aggregation for live or replayed feeds.
+
+M1 bars are pushed one at a time. Each bar is checked against the CME
+session break (17:00–17:59 CT, DST-aware) and folded into the M5 bin it
+belongs to. Bins are left-closed and left-labelled, exactly as in
+``preprocessing/resampler.py``, so the completed bars equal the batch
+resampler's output bar for bar.
+
+Bin edges
+---------
+With a fixed width that divides one hour, bins anchored at local
+midnight (pandas' ``origin="start_day"``) coincide with bins anchored at
+the UTC epoch, because the session zone's UTC offset is a whole number
+of hours. A bar's bin is therefore ``ts // width * width``; no history
+is needed to place it.
+
+Local time
+----------
+The session zone's UTC offset is looked up once per UTC hour and cached;
+only an hour that contains a DST transition is resolved per minute.
+
+This module does NOT detect rolls or evaluate signals.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
+
+from config import constants as C
+from config import settings as S
+
+logger = logging.getLogger(__name__)
+
+_NS_PER_SECOND: int = 1_000_000_000
+_NS_PER_MINUTE: int = 60 * _NS_PER_SECOND
+_NS_PER_HOUR: int = 60 * _NS_PER_MINUTE
+_NS_PER_DAY: int = 24 * _NS_PER_HOUR
+
+
+@dataclass(slots=True)
+class M5Bar:
+    """
+    One M5 bar, open or completed.
+
+    Attributes
+    ----------
+    ts_ns : int
+        Bin label (bar open time) as UTC epoch nanoseconds.
+    open, high, low, close : float
+        Prices (tick counts in integer-tick mode).
+    volume : int
+    contains_roll : bool
+        True if any constituent M1 bar was a roll bar.
+    """
+    ts_ns: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    contains_roll: bool
+
+
+class M5BarBuilder:
+    """
+    Aggregates a time-ordered stream of M1 bars into M5 bars.
+
+    Usage: for every M1 bar call :meth:`in_session`; for session bars,
+    :meth:`is_new_bin` tells whether the bar opens a new M5 bin (the
+    previous one must then be taken with :meth:`complete`), and
+    :meth:`add` folds it in. :meth:`is_last_minute` reports that the
+    current bin can receive no further M1 bars.
+
+    Raises
+    ------
+    ValueError
+        On construction, if the resample settings are not a fixed width
+        dividing one hour with left-closed, left-labelled bins.
+    """
+
+    __slots__ = (
+        "_width", "_zone", "_break_start", "_break_end",
+        "_hour", "_hour_offset", "current",
+    )
+
+    def __init__(self) -> None:
+        freq = to_offset(S.RESAMPLE_FREQ)
+        if (
+            not isinstance(freq, Tick)
+            or _NS_PER_HOUR % freq.nanos != 0
+            or S.RESAMPLE_CLOSED != "left"
+            or S.RESAMPLE_LABEL != "left"
+        ):
+            raise ValueError(
+                "Incremental M5 bars require left-closed, left-labelled "
+                "bins whose width divides one hour."
+            )
+        self._width: int = freq.nanos
+        self._zone = ZoneInfo(C.SESSION_TIMEZONE)
+        self._break_start: int = pd.Timedelta(C.SESSION_BREAK_START + ":00").value
+        self._break_end: int = pd.Timedelta(C.SESSION_BREAK_END + ":00").value
+        self._hour: int = -1
+        self._hour_offset: Optional[int] = None
+        self.current: Optional[M5Bar] = None
+
+    def _utc_offset_ns(self, ts_ns: int) -> int:
+        """UTC offset of the session zone at ``ts_ns``."""
+        seconds = ts_ns // _NS_PER_SECOND
+        return int(
+            datetime.fromtimestamp(seconds, self._zone)
+            .utcoffset()
+            .total_seconds()
+        ) * _NS_PER_SECOND
+
+    def in_session(self, ts_ns: int) -> bool:
+        """False if the M1 bar at ``ts_ns`` falls in the session break."""
+        hour = ts_ns // _NS_PER_HOUR
+        if hour != self._hour:
+            self._hour = hour
+            first = self._utc_offset_ns(hour * _NS_PER_HOUR)
+            last = self._utc_offset_ns((hour + 1) * _NS_PER_HOUR - 1)
+            self._hour_offset = first if first == last else None
+
+        offset = self._hour_offset
+        if offset is None:   # DST transition inside this hour
+            offset = self._utc_offset_ns(ts_ns)
+        time_of_day = (ts_ns + offset) % _NS_PER_DAY
+        return time_of_day < self._break_start or time_of_day > self._break_end
+
+    def bin_start(self, ts_ns: int) -> int:
+        """Label (open time) of the M5 bin containing ``ts_ns``."""
+        return ts_ns - ts_ns % self._width
+
+    def is_new_bin(self, ts_ns: int) -> bool:
+        """True if the M1 bar at ``ts_ns`` does not belong to the open bin."""
+        return self.current is None or (
+            ts_ns - ts_ns % self._width != self.current.ts_ns
+        )
+
+    def is_last_minute(self, ts_ns: int) -> bool:
+        """True if the M1 bar at ``ts_ns`` is the last one its bin can hold."""
+        return (ts_ns % self._width) + _NS_PER_MINUTE >= self._width
+
+    def add(
+        self,
+        ts_ns: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: int,
+        is_roll: bool,
+    ) -> None:
+        """
+        Fold one in-session M1 bar into the current bin.
+
+        Starts a new bin if ``ts_ns`` lies outside the current one; the
+        caller must have taken the previous bin with :meth:`complete`.
+        """
+        bar = self.current
+        if bar is None or ts_ns - ts_ns % self._width != bar.ts_ns:
+            self.current = M5Bar(
+                ts_ns - ts_ns % self._width,
+                open_, high, low, close, volume, is_roll,
+            )
+            return
+        if high > bar.high:
+            bar.high = high
+        if low < bar.low:
+            bar.low = low
+        bar.close = close
+        bar.volume += volume
+        bar.contains_roll = bar.contains_roll or is_roll
+
+    def complete(self) -> Optional[M5Bar]:
+        """Close and return the current bin (None if no bin is open)."""
+        bar, self.current = self.current, None
+        return bar
@@ -19,13 +19,26 @@ Critical design decisions
 
 4. The output index is converted back to UTC for consistency with the
    rest of the pipeline.
+
+Array implementation
+--------------------
+:func:`resample_m1_to_m5_numpy` produces the same frame without copying
+the M1 data or converting its index. The Chicago UTC offsets are
+precomputed once per call from the DST transitions in the data range,
+the session-break mask is integer arithmetic on int64 epoch
+nanoseconds, and OHLCV plus the roll flag are aggregated in one grouped
+pass (``ufunc.reduceat``) over contiguous arrays. Bins with no M1 bars
+never form a group, which is equivalent to dropping empty bars.
 """
 
 from __future__ import annotations
 
 import logging
 
+import numpy as np
 import pandas as pd
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
 
 from config import constants as C
 from config import settings as S
@@ -145,6 +158,12 @@ def resample_m1_to_m5(df_m1: pd.DataFrame) -> pd.DataFrame:
     # because the roll event itself generates trades.
     df_m5_ct = df_m5_ct.dropna(subset=[C.COL_OPEN])
 
+    # Integer-tick prices were widened to float by the empty bins; with
+    # those dropped, restore the input dtype.
+    for col in (C.COL_OPEN, C.COL_HIGH, C.COL_LOW, C.COL_CLOSE):
+        if pd.api.types.is_integer_dtype(df_m1[col].dtype):
+            df_m5_ct[col] = df_m5_ct[col].astype(df_m1[col].dtype)
+
     # Step 5 — Convert back to UTC.
     df_m5 = df_m5_ct.copy()
     df_m5.index = df_m5_ct.index.tz_convert("UTC")
@@ -156,3 +175,166 @@ def resample_m1_to_m5(df_m1: pd.DataFrame) -> pd.DataFrame:
     )
 
     return df_m5
+
+
+_NS_PER_MINUTE: int = 60 * 1_000_000_000
+_NS_PER_HOUR: int = 60 * _NS_PER_MINUTE
+_NS_PER_DAY: int = 24 * _NS_PER_HOUR
+
+
+def _utc_offsets_ns(ts_ns: np.ndarray, tz: str) -> np.ndarray:
+    """
+    Return the UTC offset of ``tz`` (in ns) at each timestamp.
+
+    The offset is piecewise constant between DST transitions. The
+    transitions covering the data range are located once — on an hourly
+    grid, refined to the minute — and each timestamp is then mapped to
+    its segment with a single ``searchsorted``.
+    """
+    start = pd.Timestamp(int(ts_ns.min()), tz="UTC").floor("h")
+    end = pd.Timestamp(int(ts_ns.max()), tz="UTC").ceil("h") + pd.Timedelta("1h")
+
+    def offsets(grid: pd.DatetimeIndex) -> np.ndarray:
+        local = grid.tz_convert(tz).tz_localize(None).as_unit("ns").asi8
+        return local - grid.as_unit("ns").asi8
+
+    hours = pd.date_range(start, end, freq="h")
+    hour_offsets = offsets(hours)
+
+    bounds = [int(hours.as_unit("ns").asi8[0])]
+    values = [int(hour_offsets[0])]
+    for k in np.flatnonzero(np.diff(hour_offsets)) + 1:
+        minutes = pd.date_range(hours[k - 1], hours[k], freq="min")
+        minute_offsets = offsets(minutes)
+        j = int(np.argmax(minute_offsets != hour_offsets[k - 1]))
+        bounds.append(int(minutes.as_unit("ns").asi8[j]))
+        values.append(int(minute_offsets[j]))
+
+    segment = np.searchsorted(np.asarray(bounds), ts_ns, side="right") - 1
+    return np.asarray(values, dtype=np.int64)[segment]
+
+
+def _fast_path_supported(df_m1: pd.DataFrame) -> bool:
+    """
+    True if :func:`resample_m1_to_m5_numpy` reproduces the pandas result.
+
+    Requires left-closed/left-labelled bins of a fixed width that divides
+    one hour (so DST shifts keep bin edges aligned), a sorted index, and
+    no NaN prices (pandas ``first``/``last`` skip NaN; reduceat does not).
+    """
+    freq = to_offset(S.RESAMPLE_FREQ)
+    if not isinstance(freq, Tick) or _NS_PER_HOUR % freq.nanos != 0:
+        return False
+    if S.RESAMPLE_CLOSED != "left" or S.RESAMPLE_LABEL != "left":
+        return False
+    if not df_m1.index.is_monotonic_increasing:
+        return False
+    prices = (C.COL_OPEN, C.COL_HIGH, C.COL_LOW, C.COL_CLOSE)
+    return not any(
+        np.isnan(df_m1[c].to_numpy(dtype=np.float64)).any()
+        for c in prices
+        if not pd.api.types.is_integer_dtype(df_m1[c].dtype)
+    )
+
+
+def resample_m1_to_m5_numpy(df_m1: pd.DataFrame) -> pd.DataFrame:
+    """
+    Array implementation of :func:`resample_m1_to_m5`.
+
+    Produces the same bars, dtypes and UTC index (same resolution as the
+    input). Falls back to :func:`resample_m1_to_m5` when the input or the
+    resample settings fall outside what the array path reproduces
+    exactly (see :func:`_fast_path_supported`).
+
+    Parameters
+    ----------
+    df_m1 : pd.DataFrame
+        Raw M1 data with UTC DatetimeIndex and columns:
+        open, high, low, close, volume (optionally is_roll).
+
+    Returns
+    -------
+    pd.DataFrame
+        M5 OHLCV DataFrame with UTC DatetimeIndex and ``contains_roll``.
+
+    Raises
+    ------
+    ValueError
+        If required OHLCV columns are missing.
+    """
+    required = (C.COL_OPEN, C.COL_HIGH, C.COL_LOW, C.COL_CLOSE, C.COL_VOLUME)
+    missing = [c for c in required if c not in df_m1.columns]
+    if missing:
+        raise ValueError(f"Missing columns for resampling: {missing}")
+
+    if df_m1.empty or not _fast_path_supported(df_m1):
+        logger.info("Array resampler not applicable; using pandas resampler.")
+        return resample_m1_to_m5(df_m1)
+
+    unit = df_m1.index.unit
+    ts_ns = df_m1.index.as_unit("ns").asi8
+
+    # Session break: local time-of-day within [break_start, break_end].
+    local_ns = ts_ns + _utc_offsets_ns(ts_ns, C.SESSION_TIMEZONE)
+    time_of_day = local_ns % _NS_PER_DAY
+    break_start = pd.Timedelta(C.SESSION_BREAK_START + ":00").value
+    break_end = pd.Timedelta(C.SESSION_BREAK_END + ":00").value
+    keep = (time_of_day < break_start) | (time_of_day > break_end)
+    del local_ns, time_of_day
+
+    removed = int(keep.size - np.count_nonzero(keep))
+    if removed > 0:
+        logger.debug("Excluded %d M1 bars in session break.", removed)
+
+    rows = np.flatnonzero(keep)
+    if rows.size == 0:
+        return resample_m1_to_m5(df_m1)
+    ts_kept = ts_ns[rows]
+
+    # Bins are anchored at local midnight of the first kept bar, as in
+    # pandas' default origin="start_day".
+    width = to_offset(S.RESAMPLE_FREQ).nanos
+    origin = (
+        pd.Timestamp(int(ts_kept[0]), tz="UTC")
+        .tz_convert(C.SESSION_TIMEZONE)
+        .normalize()
+        .as_unit("ns")
+        .value
+    )
+    bin_id = (ts_kept - origin) // width
+    starts = np.flatnonzero(np.diff(bin_id, prepend=bin_id[0] - 1))
+    ends = np.append(starts[1:], bin_id.size) - 1
+
+    def column(name: str, dtype: str) -> np.ndarray:
+        return df_m1[name].to_numpy(dtype=dtype)[rows]
+
+    # Integer-tick prices keep their dtype; everything else is float64.
+    price_dtype = "float64"
+    if pd.api.types.is_integer_dtype(df_m1[C.COL_OPEN].dtype):
+        price_dtype = df_m1[C.COL_OPEN].dtype.name
+
+    out = {
+        C.COL_OPEN: column(C.COL_OPEN, price_dtype)[starts],
+        C.COL_HIGH: np.maximum.reduceat(column(C.COL_HIGH, price_dtype), starts),
+        C.COL_LOW: np.minimum.reduceat(column(C.COL_LOW, price_dtype), starts),
+        C.COL_CLOSE: column(C.COL_CLOSE, price_dtype)[ends],
+        C.COL_VOLUME: np.add.reduceat(column(C.COL_VOLUME, "int64"), starts),
+    }
+    if "is_roll" in df_m1.columns:
+        out["contains_roll"] = np.logical_or.reduceat(
+            column("is_roll", "bool"), starts
+        )
+    else:
+        out["contains_roll"] = np.zeros(starts.size, dtype=bool)
+
+    labels = pd.DatetimeIndex(
+        origin + bin_id[starts] * width, tz="UTC", name=df_m1.index.name
+    ).as_unit(unit)
+    df_m5 = pd.DataFrame(out, index=labels)
+
+    logger.info(
+        "Resampled M1 (%d bars) → M5 (%d bars) [array].",
+        len(df_m1),
+        len(df_m5),
+    )
+    return df_m5
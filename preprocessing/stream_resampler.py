@@ -0,0 +1,285 @@
+"""
+stream_resampler.py
+===================
+Chunked M1 → M5 resampling for raw histories that do not fit in memory.
+
+The raw Parquet file is read in record batches through pyarrow (only
+the timestamp, OHLCV and instrument_id columns). Each batch goes through
+the same steps as the in-memory pipeline — dtype enforcement, roll
+annotation, session-aware resampling — and the resulting M5 bars are
+appended to an output Parquet file as they are produced — or, with
+``partitioned=True``, written month by month to a year/month
+:class:`~data.dataset_store.PartitionedDataset`.
+
+Chunk boundaries
+----------------
+Two pieces of state are carried from one batch to the next so that the
+output is identical to resampling the whole file at once:
+
+  - the last ``instrument_id`` seen, so a contract change that falls
+    exactly on a batch boundary is still flagged as a roll;
+  - the M1 rows of the trailing, possibly incomplete M5 bin, which are
+    prepended to the next batch instead of being aggregated early.
+
+Peak memory is therefore bounded by the batch size, not the dataset.
+
+Requirements
+------------
+Bin edges must not depend on where a batch starts, which holds for the
+settings supported by the array resampler (fixed width dividing one
+hour, left-closed/left-labelled). The raw file must be time-sorted.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
+
+from config import constants as C
+from config import settings as S
+from data.dataset_store import PartitionedDataset
+from data.loader import index_column, raw_sources, to_ticks, utc_bound
+from preprocessing.resampler import resample_m1_to_m5_numpy
+
+logger = logging.getLogger(__name__)
+
+# Columns read from every raw batch, besides the timestamp column.
+OHLCV_COLUMNS: tuple[str, ...] = (
+    C.COL_OPEN,
+    C.COL_HIGH,
+    C.COL_LOW,
+    C.COL_CLOSE,
+    C.COL_VOLUME,
+)
+
+
+def batch_to_frame(batch, ts_column: str) -> pd.DataFrame:
+    """
+    Convert a record batch to a UTC-indexed M1 frame with loader dtypes.
+
+    Prices become float64 (or integer ticks when ``S.PRICE_TICKS`` is
+    set) and volume int64, matching :func:`data.loader.load_raw_m1`.
+    Also used by :func:`data.ingest.iter_parquet_bars`.
+    """
+    frame = pd.DataFrame(
+        {name: batch.column(name).to_numpy() for name in batch.schema.names}
+    )
+    index = pd.DatetimeIndex(frame.pop(ts_column), name=C.COL_TS)
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+    else:
+        index = index.tz_convert("UTC")
+    frame.index = index
+
+    for col in (C.COL_OPEN, C.COL_HIGH, C.COL_LOW, C.COL_CLOSE):
+        frame[col] = frame[col].astype("float64")
+        if S.PRICE_TICKS:
+            frame[col] = to_ticks(frame[col].to_numpy())
+    frame[C.COL_VOLUME] = frame[C.COL_VOLUME].astype("int64")
+    return frame
+
+
+def stream_resample_parquet(
+    out_path: Path,
+    raw_path: Optional[Path] = None,
+    batch_rows: Optional[int] = None,
+    start: Optional[str | pd.Timestamp] = None,
+    end: Optional[str | pd.Timestamp] = None,
+    partitioned: bool = False,
+) -> pd.DataFrame:
+    """
+    Resample a raw M1 Parquet file to M5 batch by batch.
+
+    Parameters
+    ----------
+    out_path : Path
+        Destination Parquet file for the M5 bars (OHLCV plus
+        ``contains_roll``). Overwritten if it exists. With
+        ``partitioned``, the root of a :class:`PartitionedDataset`.
+    raw_path : Path, optional
+        Raw M1 Parquet file or partitioned dataset directory (partitions
+        are streamed in time order). Default: the canonical location
+        from settings.
+    batch_rows : int, optional
+        M1 rows per batch (default: settings.STREAM_BATCH_ROWS).
+    start, end : str or pd.Timestamp, optional
+        Half-open window ``[start, end)`` of M1 rows to resample, as in
+        :func:`data.loader.load_raw_m1`. From a partitioned dataset only
+        the overlapping partitions are opened. Default: unbounded.
+    partitioned : bool
+        Write one partition per UTC month through
+        :meth:`PartitionedDataset.write`, replacing the months produced
+        and keeping the others. Bars of the month being formed are
+        buffered, so at most one month of M5 is held in memory.
+
+    Returns
+    -------
+    pd.DataFrame
+        Roll log in the format of ``data.roll_manager.detect_rolls``.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the raw file does not exist.
+    ValueError
+        If required columns are missing, the resample settings are not
+        batch-invariant, the file is not sorted by time, or no partition
+        overlaps the window.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if batch_rows is None:
+        batch_rows = S.STREAM_BATCH_ROWS
+    start_ts, end_ts = utc_bound(start), utc_bound(end)
+    files = raw_sources(raw_path, start_ts, end_ts)
+    if not files:
+        raise ValueError(f"No raw M1 partitions in [{start}, {end}).")
+
+    freq = to_offset(S.RESAMPLE_FREQ)
+    if (
+        not isinstance(freq, Tick)
+        or (3_600 * 1_000_000_000) % freq.nanos != 0
+        or S.RESAMPLE_CLOSED != "left"
+        or S.RESAMPLE_LABEL != "left"
+    ):
+        raise ValueError(
+            "Streaming resample requires left-closed, left-labelled bins "
+            "whose width divides one hour."
+        )
+    width = freq.nanos
+
+    parquets = [pq.ParquetFile(path) for path in files]
+    schema = parquets[0].schema_arrow
+    ts_column = index_column(schema.pandas_metadata)
+
+    missing = [c for c in (ts_column, *OHLCV_COLUMNS) if c not in schema.names]
+    if missing:
+        raise ValueError(f"Missing required columns in raw data: {missing}")
+    has_instrument = C.COL_INSTRUMENT_ID in schema.names
+    columns = [ts_column, *OHLCV_COLUMNS]
+    if has_instrument:
+        columns.append(C.COL_INSTRUMENT_ID)
+
+    logger.info(
+        "Streaming %d M1 rows from %d file(s) in batches of %d ...",
+        sum(p.metadata.num_rows for p in parquets), len(files), batch_rows,
+    )
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    dataset = PartitionedDataset(out_path) if partitioned else None
+    month_bars: Optional[pd.DataFrame] = None
+    writer: Optional[pq.ParquetWriter] = None
+    carry: Optional[pd.DataFrame] = None
+    prev_instrument: Optional[int] = None
+    last_ts: Optional[int] = None
+    roll_frames: list[pd.DataFrame] = []
+    n_m1 = 0
+    n_m5 = 0
+
+    def write(df_m5: pd.DataFrame) -> None:
+        nonlocal writer, month_bars, n_m5
+        if df_m5.empty:
+            return
+        n_m5 += len(df_m5)
+        if dataset is not None:
+            # Flush every month before the one still being formed.
+            if month_bars is not None:
+                df_m5 = pd.concat([month_bars, df_m5])
+            months = df_m5.index.tz_convert("UTC").tz_localize(None)
+            months = months.to_period("M")
+            done = months < months[-1]
+            if done.any():
+                dataset.write(df_m5[done])
+            month_bars = df_m5[~done]
+            return
+        table = pa.Table.from_pandas(df_m5, preserve_index=True)
+        if writer is None:
+            writer = pq.ParquetWriter(out_path, table.schema)
+        writer.write_table(table)
+
+    try:
+        batches = (
+            batch
+            for parquet in parquets
+            for batch in parquet.iter_batches(
+                batch_size=batch_rows, columns=columns
+            )
+        )
+        for batch in batches:
+            if batch.num_rows == 0:
+                continue
+            chunk = batch_to_frame(batch, ts_column)
+            if start_ts is not None:
+                chunk = chunk[chunk.index >= start_ts]
+            if end_ts is not None:
+                chunk = chunk[chunk.index < end_ts]
+            if chunk.empty:
+                continue
+            n_m1 += len(chunk)
+
+            ts = chunk.index.as_unit("ns").asi8
+            if (last_ts is not None and ts[0] < last_ts) or np.any(np.diff(ts) < 0):
+                raise ValueError("Raw M1 data must be sorted by timestamp.")
+            last_ts = int(ts[-1])
+
+            # Roll annotation, seeded with the previous batch's last id.
+            if has_instrument:
+                instrument = chunk[C.COL_INSTRUMENT_ID]
+                prev = instrument.shift(1)
+                if prev_instrument is not None:
+                    prev.iloc[0] = prev_instrument
+                roll_mask = (instrument != prev) & prev.notna()
+                chunk["is_roll"] = roll_mask
+                if roll_mask.any():
+                    rolls = chunk.loc[roll_mask, [C.COL_INSTRUMENT_ID]].copy()
+                    rolls.insert(0, "prev_instrument_id", prev[roll_mask].values)
+                    rolls.rename(
+                        columns={C.COL_INSTRUMENT_ID: "new_instrument_id"},
+                        inplace=True,
+                    )
+                    roll_frames.append(rolls)
+                prev_instrument = instrument.iloc[-1]
+            else:
+                chunk["is_roll"] = False
+
+            if carry is not None:
+                chunk = pd.concat([carry, chunk])
+
+            # Hold back the trailing bin: later rows may still belong to it.
+            ts = chunk.index.as_unit("ns").asi8
+            split = int(np.searchsorted(ts, (ts[-1] // width) * width))
+            ready, carry = chunk.iloc[:split], chunk.iloc[split:]
+            if not ready.empty:
+                write(resample_m1_to_m5_numpy(ready))
+
+        if carry is not None and not carry.empty:
+            write(resample_m1_to_m5_numpy(carry))
+        if month_bars is not None:
+            dataset.write(month_bars)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if n_m5 == 0:
+        raise ValueError(f"No M5 bars produced from {files}.")
+
+    logger.info(
+        "Streamed M1 (%d bars) → M5 (%d bars) into %s.", n_m1, n_m5, out_path
+    )
+
+    if roll_frames:
+        rolls = pd.concat(roll_frames)
+    else:
+        rolls = pd.DataFrame(
+            columns=["prev_instrument_id", "new_instrument_id"],
+            index=pd.DatetimeIndex([], tz="UTC", name=C.COL_TS),
+        )
+    logger.info("Detected %d roll event(s).", len(rolls))
+    return rolls
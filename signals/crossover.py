@@ -14,17 +14,39 @@ Signal encoding
   +1  →  Long  (fast crossed above slow on this bar close)
   -1  →  Short (fast crossed below slow on this bar close)
    0  →  No crossover on this bar
+
+Incremental form
+----------------
+:class:`IncrementalCrossover` keeps the two EMA states and the previous
+diff, and turns each new close into a signal in O(1). Its state can be
+written to a JSON checkpoint and restored, so a restarted process
+resumes without replaying history. Signals equal
+:func:`generate_crossover_signals` on the same closes whenever the
+history spans at least ``warmup_bars`` bars (the batch path does not
+mask shorter histories at all).
 """
 
 from __future__ import annotations
 
+import json
 import logging
+import math
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
 
 import numpy as np
 import pandas as pd
 
+from config.run_config import RunConfig
+from indicators.ema import IncrementalEMA
+
 logger = logging.getLogger(__name__)
 
+# Bump when the checkpoint layout changes.
+_CHECKPOINT_VERSION: int = 1
+
 
 def generate_crossover_signals(
     ema_fast: pd.Series,
@@ -77,3 +99,264 @@ def generate_crossover_signals(
     )
 
     return signal
+
+
+def generate_crossover_signal_matrix(
+    ema_matrix: np.ndarray,
+    fast_cols: np.ndarray,
+    slow_cols: np.ndarray,
+) -> np.ndarray:
+    """
+    Batched form of :func:`generate_crossover_signals` for many EMA pairs.
+
+    Pair ``k`` uses ``ema_matrix[:, fast_cols[k]]`` as the fast EMA and
+    ``ema_matrix[:, slow_cols[k]]`` as the slow EMA. All pairs are
+    evaluated in a single NumPy pass with the same crossover rule and
+    NaN handling as the single-pair function.
+
+    Parameters
+    ----------
+    ema_matrix : np.ndarray
+        EMA values, shape ``(n_bars, n_periods)`` (see
+        ``indicators.ema.compute_ema_matrix``).
+    fast_cols, slow_cols : np.ndarray[int]
+        Column indices of the fast and slow EMA for each pair.
+
+    Returns
+    -------
+    np.ndarray[int8]
+        Signal matrix of shape ``(n_bars, n_pairs)`` with values in
+        {-1, 0, +1}.
+
+    Raises
+    ------
+    ValueError
+        If ``fast_cols`` and ``slow_cols`` differ in length.
+    """
+    fast_cols = np.asarray(fast_cols, dtype=np.intp)
+    slow_cols = np.asarray(slow_cols, dtype=np.intp)
+    if fast_cols.shape != slow_cols.shape:
+        raise ValueError("fast_cols and slow_cols must have the same length.")
+
+    diff = ema_matrix[:, fast_cols] - ema_matrix[:, slow_cols]
+    signal = np.zeros(diff.shape, dtype=np.int8)
+    if diff.shape[0] < 2:
+        return signal
+
+    cur = diff[1:]
+    prev = diff[:-1]
+    # NaN comparisons are False, which gives the same strict validity
+    # rule as the single-pair implementation.
+    signal[1:][(cur > 0) & (prev <= 0)] = 1
+    signal[1:][(cur < 0) & (prev >= 0)] = -1
+
+    return signal
+
+
+def _nan_to_none(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def _none_to_nan(value: Optional[float]) -> float:
+    return math.nan if value is None else float(value)
+
+
+@dataclass(slots=True)
+class IncrementalCrossover:
+    """
+    Bar-by-bar EMA crossover signal generator.
+
+    Attributes
+    ----------
+    fast, slow : IncrementalEMA
+        EMA states.
+    prev_diff : float
+        ``ema_fast - ema_slow`` at the previous bar (NaN in warmup).
+    last_ts : pd.Timestamp or None
+        Timestamp of the last bar consumed, if supplied to
+        :meth:`update`.
+    """
+    fast: IncrementalEMA
+    slow: IncrementalEMA
+    prev_diff: float = math.nan
+    last_ts: Optional[pd.Timestamp] = None
+
+    @classmethod
+    def from_config(
+        cls,
+        config: RunConfig | None = None,
+    ) -> "IncrementalCrossover":
+        """
+        Create a fresh generator for the EMA periods and warmup of ``config``.
+
+        Parameters
+        ----------
+        config : RunConfig, optional
+            Default: a snapshot of the current settings.
+        """
+        if config is None:
+            config = RunConfig.from_settings()
+        return cls(
+            fast=IncrementalEMA(config.ema_fast, config.warmup_bars),
+            slow=IncrementalEMA(config.ema_slow, config.warmup_bars),
+        )
+
+    def update(self, close: float, ts: Optional[pd.Timestamp] = None) -> int:
+        """
+        Consume the close of a new bar and return its signal.
+
+        Parameters
+        ----------
+        close : float
+            Bar close.
+        ts : pd.Timestamp, optional
+            Bar timestamp, recorded for checkpoints.
+
+        Returns
+        -------
+        int
+            +1 (long), -1 (short) or 0, as in
+            :func:`generate_crossover_signals`.
+
+        Raises
+        ------
+        ValueError
+            If ``ts`` is not after the last recorded timestamp.
+        """
+        if ts is not None:
+            if self.last_ts is not None and ts <= self.last_ts:
+                raise ValueError(
+                    f"Bar {ts} is not after the last bar {self.last_ts}."
+                )
+            self.last_ts = ts
+
+        diff = self.fast.update(close) - self.slow.update(close)
+        prev = self.prev_diff
+        self.prev_diff = diff
+
+        # NaN comparisons are False: both bars must be out of warmup.
+        if diff > 0 and prev <= 0:
+            return 1
+        if diff < 0 and prev >= 0:
+            return -1
+        return 0
+
+    def checkpoint(self) -> dict[str, Any]:
+        """
+        Return the full state as a JSON-serialisable dict.
+
+        Floats are stored exactly (JSON uses their shortest repr), so a
+        restored generator continues bit for bit.
+        """
+        def ema_state(ema: IncrementalEMA) -> dict[str, Any]:
+            return {
+                "period": ema.period,
+                "warmup_bars": ema.warmup_bars,
+                "value": _nan_to_none(ema.value),
+                "old_weight": ema.old_weight,
+                "count": ema.count,
+            }
+
+        return {
+            "version": _CHECKPOINT_VERSION,
+            "fast": ema_state(self.fast),
+            "slow": ema_state(self.slow),
+            "prev_diff": _nan_to_none(self.prev_diff),
+            "last_ts": (
+                None if self.last_ts is None else self.last_ts.isoformat()
+            ),
+        }
+
+    @classmethod
+    def from_checkpoint(
+        cls,
+        state: dict[str, Any],
+        config: RunConfig | None = None,
+    ) -> "IncrementalCrossover":
+        """
+        Rebuild a generator from :meth:`checkpoint` output.
+
+        Parameters
+        ----------
+        state : dict
+            Checkpoint contents.
+        config : RunConfig, optional
+            If given, the checkpoint's periods and warmup must match it.
+
+        Raises
+        ------
+        ValueError
+            If the checkpoint version is unknown or does not match
+            ``config``.
+        """
+        if state.get("version") != _CHECKPOINT_VERSION:
+            raise ValueError(
+                "Unsupported crossover checkpoint version: "
+                f"{state.get('version')!r}."
+            )
+
+        def ema(entry: dict[str, Any]) -> IncrementalEMA:
+            return IncrementalEMA(
+                period=int(entry["period"]),
+                warmup_bars=int(entry["warmup_bars"]),
+                value=_none_to_nan(entry["value"]),
+                old_weight=float(entry["old_weight"]),
+                count=int(entry["count"]),
+            )
+
+        restored = cls(
+            fast=ema(state["fast"]),
+            slow=ema(state["slow"]),
+            prev_diff=_none_to_nan(state["prev_diff"]),
+            last_ts=(
+                None if state["last_ts"] is None
+                else pd.Timestamp(state["last_ts"])
+            ),
+        )
+        if config is not None:
+            expected = (config.ema_fast, config.ema_slow, config.warmup_bars)
+            actual = (
+                restored.fast.period,
+                restored.slow.period,
+                restored.fast.warmup_bars,
+            )
+            if actual != expected:
+                raise ValueError(
+                    f"Checkpoint (fast, slow, warmup) = {actual} does not "
+                    f"match the run configuration {expected}."
+                )
+        return restored
+
+    def save(self, path: Path) -> None:
+        """Write :meth:`checkpoint` to ``path`` atomically."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.checkpoint(), f, indent=2)
+        os.replace(tmp_path, path)
+        logger.debug("Crossover checkpoint saved to %s.", path)
+
+    @classmethod
+    def load(
+        cls,
+        path: Path,
+        config: RunConfig | None = None,
+    ) -> "IncrementalCrossover":
+        """
+        Read a checkpoint written by :meth:`save`.
+
+        Raises
+        ------
+        FileNotFoundError
+            If ``path`` does not exist.
+        ValueError
+            See :meth:`from_checkpoint`.
+        """
+        with open(path) as f:
+            state = json.load(f)
+        restored = cls.from_checkpoint(state, config)
+        logger.info(
+            "Crossover state restored from %s (%d bars, last bar %s).",
+            path, restored.fast.count, restored.last_ts,
+        )
+        return restored
@@ -0,0 +1,108 @@
+"""
+conftest.py
+===========
+Shared fixtures: small synthetic M1 and M5 frames built from a seeded
+random walk on the 6E tick grid.
+
+The frames have the shapes the pipeline produces (UTC ``ts_event``
+index, OHLCV columns, ``instrument_id`` on M1 and ``contains_roll`` on
+M5), so the parity tests can run every engine against the reference
+implementation without downloaded data.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import constants as C
+
+_PRICE_COLUMNS: tuple[str, ...] = (
+    C.COL_OPEN, C.COL_HIGH, C.COL_LOW, C.COL_CLOSE,
+)
+
+
+def _make_m1(
+    n_minutes: int = 20_000,
+    seed: int = 0,
+    start: str = "2021-03-01",
+    n_rolls: int = 3,
+) -> pd.DataFrame:
+    """Raw-like M1 bars with ~5 % missing minutes and contract rolls."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=n_minutes, freq="1min", tz="UTC")
+    index = index[rng.random(n_minutes) > 0.05]
+    n = len(index)
+
+    steps = rng.integers(-3, 4, size=n)
+    close_ticks = 22_000 + np.cumsum(steps)
+    open_ticks = close_ticks - steps
+    high_ticks = np.maximum(open_ticks, close_ticks) + rng.integers(0, 3, n)
+    low_ticks = np.minimum(open_ticks, close_ticks) - rng.integers(0, 3, n)
+
+    instrument = np.full(n, 1000, dtype=np.int64)
+    for k, cut in enumerate(np.sort(rng.choice(np.arange(100, n), n_rolls))):
+        instrument[cut:] = 1001 + k
+
+    df = pd.DataFrame(
+        {
+            C.COL_OPEN: open_ticks * C.TICK_SIZE,
+            C.COL_HIGH: high_ticks * C.TICK_SIZE,
+            C.COL_LOW: low_ticks * C.TICK_SIZE,
+            C.COL_CLOSE: close_ticks * C.TICK_SIZE,
+            C.COL_VOLUME: rng.integers(1, 100, size=n),
+            C.COL_INSTRUMENT_ID: instrument,
+        },
+        index=index,
+    )
+    df.index.name = C.COL_TS
+    return df
+
+
+def _make_m5(
+    opens_ticks: np.ndarray,
+    rolls: np.ndarray | None = None,
+    start: str = "2021-03-01",
+) -> pd.DataFrame:
+    """M5 bars whose OHLC all equal the given open prices (in ticks)."""
+    opens_ticks = np.asarray(opens_ticks, dtype=np.int64)
+    n = len(opens_ticks)
+    index = pd.date_range(
+        start, periods=n, freq="5min", tz="UTC", name=C.COL_TS
+    )
+    prices = opens_ticks * C.TICK_SIZE
+    df = pd.DataFrame(
+        {col: prices for col in _PRICE_COLUMNS}, index=index
+    )
+    df[C.COL_VOLUME] = np.ones(n, dtype=np.int64)
+    df["contains_roll"] = (
+        np.zeros(n, dtype=bool) if rolls is None
+        else np.asarray(rolls, dtype=bool)
+    )
+    return df
+
+
+def _to_tick_frame(df: pd.DataFrame, dtype: str = "int32") -> pd.DataFrame:
+    """Copy of a float-price frame with OHLC as integer tick counts."""
+    ticks = df.copy()
+    for col in _PRICE_COLUMNS:
+        ticks[col] = np.rint(df[col].to_numpy() / C.TICK_SIZE).astype(dtype)
+    return ticks
+
+
+@pytest.fixture
+def make_m1() -> Callable[..., pd.DataFrame]:
+    return _make_m1
+
+
+@pytest.fixture
+def make_m5() -> Callable[..., pd.DataFrame]:
+    return _make_m5
+
+
+@pytest.fixture
+def to_tick_frame() -> Callable[..., pd.DataFrame]:
+    return _to_tick_frame
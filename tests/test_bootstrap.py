@@ -0,0 +1,158 @@
+"""
+test_bootstrap.py
+=================
+The default IID bootstrap must stay bit-identical to the original
+single-draw implementation, whatever the batch size. Block and
+stationary resamples must have the documented run structure. For a fixed
+seed and worker count, results must not depend on scheduling (process
+or thread pool, repeated runs). Quantile-sketch CIs must lie within the
+sketch's rank error of the exact quantiles.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import settings as S
+from metrics.bootstrap import (
+    QuantileSketch,
+    bootstrap_statistics,
+    resample_indices,
+    run_bootstrap,
+)
+
+
+@pytest.fixture
+def trades() -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    pnl = np.round(rng.normal(3.0, 60.0, 237), 2)
+    exits = pd.date_range("2021-01-04", periods=pnl.size, freq="7h", tz="UTC")
+    return pd.DataFrame({
+        "entry_bar": exits - pd.Timedelta(hours=3),
+        "exit_bar": exits,
+        "net_pnl": pnl,
+    })
+
+
+def _previous_iid(pnl: np.ndarray) -> tuple[np.ndarray, float, float]:
+    """The original implementation: one draw of the whole index matrix."""
+    rng = np.random.default_rng(S.BOOTSTRAP_RANDOM_SEED)
+    indices = rng.integers(0, pnl.size, size=(S.BOOTSTRAP_RESAMPLES, pnl.size))
+    means = pnl[indices].mean(axis=1)
+    alpha = 1.0 - S.BOOTSTRAP_CONFIDENCE
+    return (
+        means,
+        float(np.percentile(means, 100 * alpha / 2)),
+        float(np.percentile(means, 100 * (1 - alpha / 2))),
+    )
+
+
+@pytest.mark.parametrize("batch_elements", [None, 1_000, 237 * 3 + 1])
+def test_default_iid_matches_previous(
+    trades, monkeypatch, batch_elements
+) -> None:
+    if batch_elements is not None:
+        monkeypatch.setattr(S, "BOOTSTRAP_BATCH_ELEMENTS", batch_elements)
+    means, lower, upper = _previous_iid(trades["net_pnl"].to_numpy())
+
+    result = run_bootstrap(trades)
+
+    assert result.method == "iid"
+    np.testing.assert_array_equal(result.expectancy_distribution, means)
+    assert (result.ci_lower, result.ci_upper) == (lower, upper)
+    assert result.observed_expectancy == trades["net_pnl"].mean()
+
+
+def test_block_indices_are_runs() -> None:
+    rng = np.random.default_rng(0)
+    indices = resample_indices(rng, 50, 200, "block", 7)
+
+    assert indices.shape == (200, 50)
+    runs = indices[:, :49].reshape(200, 7, 7)
+    np.testing.assert_array_equal(np.diff(runs, axis=-1), 1)
+    assert indices.min() >= 0 and indices.max() < 50
+    assert (runs[:, :, 0] <= 50 - 7).all()
+
+
+def test_stationary_indices_continue_or_restart() -> None:
+    rng = np.random.default_rng(0)
+    indices = resample_indices(rng, 50, 2_000, "stationary", 5)
+
+    assert indices.min() >= 0 and indices.max() < 50
+    continues = indices[:, 1:] == (indices[:, :-1] + 1) % 50
+    # A restart happens with probability 1/L (and may land on the
+    # continuation by chance), so runs average about L trades.
+    assert 1 - continues.mean() == pytest.approx(1 / 5, abs=0.02)
+
+
+@pytest.mark.parametrize("method", ["iid", "block", "stationary"])
+def test_workers_deterministic(trades, method) -> None:
+    kwargs = dict(
+        method=method, block_length=5, n_resamples=2_001,
+        keep_distribution=True, workers=3,
+    )
+    first = bootstrap_statistics(trades, executor="process", **kwargs)
+    again = bootstrap_statistics(trades, executor="process", **kwargs)
+    threads = bootstrap_statistics(trades, executor="thread", **kwargs)
+
+    assert first.workers == 3
+    for other in (again, threads):
+        assert other.ci_lower == first.ci_lower
+        assert other.ci_upper == first.ci_upper
+        for name, values in first.distributions.items():
+            np.testing.assert_array_equal(other.distributions[name], values)
+
+
+def test_single_worker_matches_run_bootstrap(trades) -> None:
+    multi = bootstrap_statistics(trades, workers=1)
+    single = run_bootstrap(trades, workers=1)
+    np.testing.assert_array_equal(
+        multi.distributions["expectancy"], single.expectancy_distribution
+    )
+
+
+def test_sketch_within_rank_error() -> None:
+    rng = np.random.default_rng(3)
+    values = rng.standard_normal(100_000) * 40
+    size = 256
+
+    sketches = []
+    for part in np.array_split(values, 4):
+        sketch = QuantileSketch(size)
+        for batch in np.array_split(part, 9):
+            sketch.update(batch)
+        sketches.append(sketch)
+    for other in sketches[1:]:
+        sketches[0].merge(other)
+    sketch = sketches[0]
+
+    ordered = np.sort(values)
+    assert sketch.n == values.size
+    for q in np.linspace(0, 1, 41):
+        estimate = sketch.quantile(q)
+        lo = np.searchsorted(ordered, estimate, side="left") / values.size
+        hi = np.searchsorted(ordered, estimate, side="right") / values.size
+        assert lo - 3 / size <= q <= hi + 3 / size
+
+
+def test_sketch_exact_until_compaction() -> None:
+    values = np.random.default_rng(4).normal(size=500)
+    sketch = QuantileSketch(1_000)
+    sketch.update(values)
+    for q in (0.025, 0.5, 0.975):
+        assert sketch.quantile(q) == np.percentile(values, 100 * q)
+
+
+def test_sketch_ci_close_to_exact(trades) -> None:
+    kwargs = dict(n_resamples=20_000, method="stationary", block_length=4)
+    exact = run_bootstrap(trades, keep_distribution=True, **kwargs)
+    approx = run_bootstrap(trades, keep_distribution=False, **kwargs)
+
+    means = np.sort(exact.expectancy_distribution)
+    error = 3 / S.BOOTSTRAP_SKETCH_SIZE
+    for estimate, q in ((approx.ci_lower, 0.025), (approx.ci_upper, 0.975)):
+        lo = np.searchsorted(means, estimate, side="left") / means.size
+        hi = np.searchsorted(means, estimate, side="right") / means.size
+        assert lo - error <= q <= hi + error
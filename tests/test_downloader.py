@@ -0,0 +1,117 @@
+"""
+test_downloader.py
+==================
+Resume logic of :func:`data.downloader.download_partitioned`, run
+against a fake Databento client.
+
+A partition whose size and mtime match the manifest is trusted without
+hashing; a touched but unchanged file is hashed once and its stamp
+refreshed; a changed file is fetched again. Narrowing the date range
+keeps old partitions but records the wanted set.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from config import settings as S
+from data import downloader
+
+
+class _FakeClient:
+    """Stands in for ``databento.Historical``; counts range requests."""
+
+    def __init__(self, make_m1) -> None:
+        self.requests: list[tuple[str, str]] = []
+        self._m1 = make_m1(n_minutes=2_000)
+        self.metadata = SimpleNamespace(get_cost=lambda **_: 0.0)
+        self.timeseries = SimpleNamespace(get_range=self._get_range)
+
+    def _get_range(self, *, start: str, end: str, **_) -> SimpleNamespace:
+        self.requests.append((start, end))
+        frame = self._m1.iloc[: 10 + len(self.requests)]
+        return SimpleNamespace(to_df=lambda: frame)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, make_m1) -> _FakeClient:
+    monkeypatch.setattr(S, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(S, "DATA_START", "2021-01-01T00:00:00")
+    monkeypatch.setattr(S, "DATA_END", "2021-04-01T00:00:00")
+    return _FakeClient(make_m1)
+
+
+@pytest.fixture
+def hashes(monkeypatch) -> list:
+    """Paths hashed by the downloader, in call order."""
+    calls: list = []
+    real = downloader.sha256_file
+
+    def counting(path):
+        calls.append(path)
+        return real(path)
+
+    monkeypatch.setattr(downloader, "sha256_file", counting)
+    return calls
+
+
+def _manifest(root) -> dict:
+    with open(root / "manifest.json") as f:
+        return json.load(f)
+
+
+def test_resume_trusts_stamp(client, hashes) -> None:
+    root = downloader.download_partitioned(client=client)
+    assert len(client.requests) == 3
+    entry = _manifest(root)["partitions"]["year=2021/month=01"]
+    assert {"size", "mtime_ns", "sha256"} <= entry.keys()
+
+    hashes.clear()
+    downloader.download_partitioned(client=client)
+    assert len(client.requests) == 3
+    assert hashes == []
+
+
+def test_touched_file_is_rehashed_once(client, hashes) -> None:
+    root = downloader.download_partitioned(client=client)
+    part = root / "year=2021/month=02/part.parquet"
+    stat = part.stat()
+    os.utime(part, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    hashes.clear()
+    downloader.download_partitioned(client=client)
+    assert hashes == [part]
+    assert len(client.requests) == 3
+    entry = _manifest(root)["partitions"]["year=2021/month=02"]
+    assert entry["mtime_ns"] == part.stat().st_mtime_ns
+
+    hashes.clear()
+    downloader.download_partitioned(client=client)
+    assert hashes == []
+
+
+def test_changed_file_is_refetched(client) -> None:
+    root = downloader.download_partitioned(client=client)
+    part = root / "year=2021/month=03/part.parquet"
+    pd.DataFrame({"x": [1]}).to_parquet(part)
+
+    downloader.download_partitioned(client=client)
+    assert len(client.requests) == 4
+    assert client.requests[-1][0].startswith("2021-03-01")
+
+
+def test_narrowed_range_records_wanted(client, monkeypatch) -> None:
+    root = downloader.download_partitioned(client=client)
+    monkeypatch.setattr(S, "DATA_START", "2021-02-01T00:00:00")
+    downloader.download_partitioned(client=client)
+
+    manifest = _manifest(root)
+    assert len(client.requests) == 3
+    assert manifest["wanted"] == ["year=2021/month=02", "year=2021/month=03"]
+    assert "year=2021/month=01" in manifest["partitions"]
+    assert (root / "year=2021/month=01/part.parquet").exists()
@@ -0,0 +1,170 @@
+"""
+test_engine_parity.py
+=====================
+The ``"array"``, ``"event"`` and ``"jit"`` engine modes must produce
+exactly the ledger and final state of the reference ``"bar"`` loop, on
+float-price and integer-tick frames alike.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from backtest.engine import BacktestState, run_backtest
+from config import constants as C
+from config import settings as S
+from config.run_config import RunConfig
+from data.roll_manager import annotate_rolls
+from execution.position_manager import Direction
+from indicators.ema import compute_ema_pair
+from preprocessing.resampler import resample_m1_to_m5
+from signals.crossover import generate_crossover_signals
+
+MODES: tuple[str, ...] = ("array", "event", "jit")
+
+# Hand-built scenario, freeze window of 3 bars:
+#   2 long, 5 repeat (ignored), 7 reverse, 10 roll with a short open
+#   (closed at 11), 12 signal inside the freeze (discarded), 15 long,
+#   20 reverse, 25 roll, 27 frozen, 30 long, 39 reverse on the final
+#   bar (left pending; the long is force-closed at the last open).
+_N_BARS = 40
+_FREEZE = 3
+_ROLL_BARS = (10, 25)
+_SIGNALS = {2: 1, 5: 1, 7: -1, 12: 1, 15: 1, 20: -1, 27: -1, 30: 1, 39: -1}
+
+
+def _run(
+    df: pd.DataFrame, signals: pd.Series, mode: str, freeze: int
+) -> BacktestState:
+    config = RunConfig.from_settings(roll_freeze_bars_post=freeze)
+    return run_backtest(df, signals, mode=mode, config=config)
+
+
+def _assert_same_run(state: BacktestState, ref: BacktestState) -> None:
+    assert_frame_equal(
+        state.ledger.to_dataframe(),
+        ref.ledger.to_dataframe(),
+        check_exact=True,
+    )
+    assert state.pending == ref.pending
+    assert state.roll_freeze_remaining == ref.roll_freeze_remaining
+    assert state.position.current_direction == ref.position.current_direction
+    assert state.force_closed == ref.force_closed
+
+
+@pytest.fixture
+def scenario(make_m5) -> tuple[pd.DataFrame, pd.Series]:
+    rng = np.random.default_rng(7)
+    rolls = np.zeros(_N_BARS, dtype=bool)
+    rolls[list(_ROLL_BARS)] = True
+    df = make_m5(22_000 + np.cumsum(rng.integers(-4, 5, _N_BARS)), rolls)
+    signals = pd.Series(np.zeros(_N_BARS, dtype=np.int8), index=df.index)
+    for bar, value in _SIGNALS.items():
+        signals.iloc[bar] = value
+    return df, signals
+
+
+def test_scenario_reference(scenario) -> None:
+    df, signals = scenario
+    ref = _run(df, signals, "bar", _FREEZE)
+    trades = ref.ledger.to_dataframe()
+    index = df.index
+
+    assert trades["direction"].tolist() == [
+        "LONG", "SHORT", "LONG", "SHORT", "LONG",
+    ]
+    assert trades["entry_bar"].tolist() == [index[i] for i in (3, 8, 16, 21, 31)]
+    assert trades["exit_bar"].tolist() == [index[i] for i in (8, 11, 21, 26, 39)]
+    assert ref.pending is not None
+    assert ref.pending.close_direction is Direction.LONG
+    assert ref.pending.open_direction is Direction.SHORT
+    assert ref.pending.signal_bar == index[-1]
+
+
+@pytest.mark.parametrize("ticks", [False, True], ids=["float", "ticks"])
+@pytest.mark.parametrize("mode", MODES)
+def test_scenario_parity(scenario, to_tick_frame, mode, ticks) -> None:
+    df, signals = scenario
+    if ticks:
+        df = to_tick_frame(df)
+    ref = _run(df, signals, "bar", _FREEZE)
+    _assert_same_run(_run(df, signals, mode, _FREEZE), ref)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_roll_on_final_bar_leaves_close_pending(make_m5, mode) -> None:
+    rolls = np.zeros(12, dtype=bool)
+    rolls[-1] = True
+    df = make_m5(22_000 + np.arange(12), rolls)
+    signals = pd.Series(np.zeros(12, dtype=np.int8), index=df.index)
+    signals.iloc[3] = -1
+
+    ref = _run(df, signals, "bar", _FREEZE)
+    assert ref.pending is not None and ref.pending.exit_reason == "roll"
+    _assert_same_run(_run(df, signals, mode, _FREEZE), ref)
+
+
+@pytest.mark.parametrize("ticks", [False, True], ids=["float", "ticks"])
+@pytest.mark.parametrize("mode", MODES)
+def test_random_parity(make_m5, to_tick_frame, mode, ticks) -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(150):
+        n = int(rng.integers(1, 120))
+        rolls = rng.random(n) < rng.choice([0.0, 0.05, 0.3])
+        df = make_m5(22_000 + np.cumsum(rng.integers(-6, 7, n)), rolls)
+        if ticks:
+            df = to_tick_frame(df)
+        signals = pd.Series(
+            rng.choice([-1, 0, 0, 1], n).astype(np.int8), index=df.index
+        )
+        freeze = int(rng.integers(0, 5))
+
+        ref = _run(df, signals, "bar", freeze)
+        _assert_same_run(_run(df, signals, mode, freeze), ref)
+
+
+@pytest.mark.parametrize("mode", ["bar", *MODES])
+def test_tick_frame_matches_float_prices(scenario, to_tick_frame, mode) -> None:
+    df, signals = scenario
+    floats = _run(df, signals, mode, _FREEZE).ledger.to_dataframe()
+    ticks = _run(to_tick_frame(df), signals, mode, _FREEZE).ledger.to_dataframe()
+
+    prices = ["direction", "entry_bar", "exit_bar", "entry_price", "exit_price"]
+    assert_frame_equal(ticks[prices], floats[prices], check_exact=True)
+    np.testing.assert_allclose(ticks["net_pnl"], floats["net_pnl"], atol=1e-6)
+
+
+def test_pipeline_parity(make_m1) -> None:
+    df_m5 = resample_m1_to_m5(annotate_rolls(make_m1(n_minutes=40_000)))
+    config = RunConfig.from_settings(ema_fast=5, ema_slow=13, warmup_bars=20)
+    signals = generate_crossover_signals(
+        *compute_ema_pair(df_m5[C.COL_CLOSE], config=config)
+    )
+    assert df_m5["contains_roll"].any()
+
+    ref = run_backtest(df_m5, signals, mode="bar", config=config)
+    assert len(ref.ledger) > 50
+    for mode in MODES:
+        state = run_backtest(df_m5, signals, mode=mode, config=config)
+        _assert_same_run(state, ref)
+
+
+def test_default_mode_matches_reference(scenario, monkeypatch) -> None:
+    df, signals = scenario
+    monkeypatch.setattr(S, "ROLL_FREEZE_BARS_POST", _FREEZE)
+    ref = run_backtest(df, signals, mode="bar")
+    _assert_same_run(run_backtest(df, signals), ref)
+
+
+
+@pytest.mark.parametrize("mode", ["bar", *MODES])
+@pytest.mark.parametrize("bad", [2, -2])
+def test_invalid_signal_raises(scenario, mode, bad) -> None:
+    df, signals = scenario
+    signals = signals.copy()
+    signals.iloc[4] = bad
+    with pytest.raises(ValueError, match="Invalid signal"):
+        run_backtest(df, signals, mode=mode)
@@ -0,0 +1,83 @@
+"""
+test_equity.py
+==============
+The vectorised mark-to-market curve (``settings.EQUITY_MARK_TO_MARKET``)
+must equal a per-bar loop over the open and closed trades, including
+positions force-closed at a roll and at the end of the data, and end at
+the closed-trade curve's value.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.engine import run_backtest
+from backtest.equity import build_equity_curve
+from config import constants as C
+from config.run_config import RunConfig
+from data.roll_manager import annotate_rolls
+from indicators.ema import compute_ema_pair
+from preprocessing.resampler import resample_m1_to_m5
+from signals.crossover import generate_crossover_signals
+
+
+def _per_bar_equity(
+    trades: pd.DataFrame,
+    df_m5: pd.DataFrame,
+    initial_capital: float,
+    contracts: int,
+) -> pd.Series:
+    """Reference: value every trade at every bar, one bar at a time."""
+    close = df_m5[C.COL_CLOSE].to_numpy(np.float64)
+    usd_per_price = C.TICK_VALUE / C.TICK_SIZE * contracts
+    entry_idx = df_m5.index.get_indexer(trades["entry_bar"])
+    exit_idx = df_m5.index.get_indexer(trades["exit_bar"])
+    direction = np.where(trades["direction"] == "LONG", 1.0, -1.0)
+
+    values = []
+    for t in range(len(df_m5)):
+        equity = initial_capital
+        for k in range(len(trades)):
+            if exit_idx[k] <= t:
+                equity += trades["net_pnl"].iloc[k]
+            elif entry_idx[k] <= t:
+                equity += (
+                    direction[k] * usd_per_price
+                    * (close[t] - trades["entry_price"].iloc[k])
+                )
+        values.append(equity)
+    return pd.Series(values, index=df_m5.index)
+
+
+@pytest.mark.parametrize("ticks", [False, True], ids=["float", "ticks"])
+def test_mark_to_market_matches_per_bar_loop(
+    make_m1, to_tick_frame, ticks
+) -> None:
+    df_m5 = resample_m1_to_m5(annotate_rolls(make_m1(n_minutes=6_000)))
+    config = RunConfig.from_settings(
+        ema_fast=5, ema_slow=13, warmup_bars=20, contracts=2
+    )
+    fast, slow = compute_ema_pair(df_m5[C.COL_CLOSE], config=config)
+    signals = generate_crossover_signals(fast, slow)
+    state = run_backtest(df_m5, signals, config=config)
+    trades = state.ledger.to_dataframe()
+
+    roll_bars = df_m5.index[df_m5["contains_roll"]]
+    assert trades["exit_bar"].isin(roll_bars).any()
+    assert state.force_closed
+    assert trades["exit_bar"].iloc[-1] == df_m5.index[-1]
+
+    close_frame = to_tick_frame(df_m5) if ticks else df_m5
+    equity = build_equity_curve(
+        trades, df_m5.index, initial_capital=1_000.0,
+        close=close_frame[C.COL_CLOSE], config=config, mark_to_market=True,
+    )
+    expected = _per_bar_equity(trades, df_m5, 1_000.0, config.contracts)
+
+    pd.testing.assert_series_equal(equity, expected, rtol=0, atol=1e-6)
+    closed = build_equity_curve(
+        trades, df_m5.index, initial_capital=1_000.0, mark_to_market=False
+    )
+    assert equity.iloc[-1] == pytest.approx(closed.iloc[-1], abs=1e-6)
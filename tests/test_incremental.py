@@ -0,0 +1,77 @@
+"""
+test_incremental.py
+===================
+:class:`IncrementalEMA` and :class:`IncrementalCrossover`, fed one close
+at a time, must reproduce ``compute_ema_pair`` and
+``generate_crossover_signals`` bar for bar — warmup mask included — and
+a generator saved and loaded mid-stream must continue identically.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import constants as C
+from config.run_config import RunConfig
+from indicators.ema import IncrementalEMA, compute_ema_pair
+from signals.crossover import IncrementalCrossover, generate_crossover_signals
+
+
+@pytest.fixture
+def close(make_m1) -> pd.Series:
+    return make_m1(n_minutes=3_000)[C.COL_CLOSE]
+
+
+@pytest.mark.parametrize(
+    "fast, slow, warmup", [(5, 13, 20), (9, 21, 0), (3, 8, 50)]
+)
+def test_matches_batch(close, fast, slow, warmup) -> None:
+    config = RunConfig.from_settings(
+        ema_fast=fast, ema_slow=slow, warmup_bars=warmup
+    )
+    ema_fast, ema_slow = compute_ema_pair(close, config=config)
+    signals = generate_crossover_signals(ema_fast, ema_slow)
+
+    inc_fast = IncrementalEMA(fast, warmup)
+    inc_slow = IncrementalEMA(slow, warmup)
+    crossover = IncrementalCrossover.from_config(config)
+    values = close.to_numpy()
+    streamed_fast = np.array([inc_fast.update(c) for c in values])
+    streamed_slow = np.array([inc_slow.update(c) for c in values])
+    streamed_signals = [crossover.update(c) for c in values]
+
+    np.testing.assert_array_equal(streamed_fast, ema_fast.to_numpy())
+    np.testing.assert_array_equal(streamed_slow, ema_slow.to_numpy())
+    assert np.isnan(streamed_fast[:warmup]).all()
+    assert streamed_signals == signals.tolist()
+    assert any(streamed_signals)
+
+
+def test_checkpoint_round_trip(close, tmp_path) -> None:
+    config = RunConfig.from_settings(ema_fast=5, ema_slow=13, warmup_bars=20)
+    expected = generate_crossover_signals(
+        *compute_ema_pair(close, config=config)
+    ).tolist()
+
+    path = tmp_path / "state" / "crossover.json"
+    half = len(close) // 2
+    first = IncrementalCrossover.from_config(config)
+    streamed = [
+        first.update(c, ts) for ts, c in close.iloc[:half].items()
+    ]
+    first.save(path)
+
+    restored = IncrementalCrossover.load(path, config)
+    assert restored == first
+    streamed += [
+        restored.update(c, ts) for ts, c in close.iloc[half:].items()
+    ]
+    assert streamed == expected
+
+    other = RunConfig.from_settings(ema_fast=8, ema_slow=13, warmup_bars=20)
+    with pytest.raises(ValueError):
+        IncrementalCrossover.load(path, other)
+    with pytest.raises(ValueError):
+        restored.update(close.iloc[-1], close.index[-1])
@@ -0,0 +1,148 @@
+"""
+test_ingest.py
+==============
+:class:`data.ingest.IngestionService` must hand every bar to a consumer
+that keeps up, whatever the overflow policy; drop counts, queue depth
+and lag must reflect a consumer that falls behind. ``tail_file`` in
+follow mode must not read a line until it is complete.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+
+import pytest
+
+from data.ingest import (
+    IngestionService,
+    M1Bar,
+    format_bar_line,
+    tail_file,
+)
+
+_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+
+def _bars(n: int) -> list[M1Bar]:
+    return [
+        M1Bar(i * 60_000_000_000, 1.1, 1.2, 1.0, 1.15, i % 7 + 1, 1000)
+        for i in range(n)
+    ]
+
+
+async def _source(bars: list[M1Bar], done: asyncio.Event | None = None):
+    for bar in bars:
+        yield bar
+    if done is not None:
+        done.set()
+
+
+@pytest.mark.parametrize("overflow", _POLICIES)
+def test_fast_consumer_gets_every_bar(tmp_path, overflow) -> None:
+    bars = _bars(1_000)
+    path = tmp_path / "bars.txt"
+    path.write_text("".join(map(format_bar_line, bars)))
+    got: list[M1Bar] = []
+
+    service = IngestionService(
+        tail_file(path, price_ticks=False), {"got": got.append},
+        maxsize=10, overflow=overflow,
+    )
+    metrics = asyncio.run(service.run())["got"]
+
+    assert got == bars
+    assert (metrics.received, metrics.delivered, metrics.dropped) == (
+        1_000, 1_000, 0
+    )
+    assert metrics.depth == 0
+    assert metrics.max_depth <= 10
+    assert metrics.lag_max_ns >= 0
+    assert math.isfinite(metrics.lag_mean_us)
+
+
+@pytest.mark.parametrize("overflow", ["drop_oldest", "drop_newest"])
+def test_stalled_consumer_drops(overflow) -> None:
+    bars = _bars(100)
+    got: list[M1Bar] = []
+
+    async def main():
+        # The consumer takes the first bar, then stalls until the source
+        # is exhausted.
+        done = asyncio.Event()
+
+        async def consumer(bar: M1Bar) -> None:
+            await done.wait()
+            got.append(bar)
+
+        service = IngestionService(
+            _source(bars, done), {"slow": consumer},
+            maxsize=10, overflow=overflow,
+        )
+        return (await service.run())["slow"]
+
+    metrics = asyncio.run(main())
+
+    kept = bars[90:] if overflow == "drop_oldest" else bars[1:11]
+    assert got == [bars[0]] + kept
+    assert (metrics.received, metrics.delivered, metrics.dropped) == (
+        100, 11, 89
+    )
+    assert metrics.max_depth == 10
+    assert metrics.depth == 0
+    assert metrics.lag_max_ns > 0
+
+
+def test_block_waits_for_slow_consumer() -> None:
+    bars = _bars(100)
+    got: list[M1Bar] = []
+
+    async def consumer(bar: M1Bar) -> None:
+        await asyncio.sleep(0.001)
+        got.append(bar)
+
+    service = IngestionService(
+        _source(bars), {"slow": consumer}, maxsize=10, overflow="block",
+    )
+    metrics = asyncio.run(service.run())["slow"]
+
+    assert got == bars
+    assert (metrics.delivered, metrics.dropped) == (100, 0)
+    assert metrics.max_depth == 10
+    assert metrics.blocked_ns > 0
+    assert metrics.lag_max_us > 1_000
+
+
+def test_tail_follow_waits_for_complete_line(tmp_path) -> None:
+    bars = _bars(3)
+    lines = [format_bar_line(bar) for bar in bars]
+    path = tmp_path / "bars.txt"
+    path.write_text(lines[0] + lines[1] + lines[2][:10])
+
+    async def main() -> list[M1Bar]:
+        stream = tail_file(
+            path, follow=True, poll_seconds=0.005, price_ticks=False
+        )
+        got = [await anext(stream), await anext(stream)]
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.05)
+        assert not pending.done()
+
+        with open(path, "a") as f:
+            f.write(lines[2][10:])
+        got.append(await asyncio.wait_for(pending, timeout=5))
+        await stream.aclose()
+        return got
+
+    assert asyncio.run(main()) == bars
+
+
+def test_tail_without_follow_reads_last_line(tmp_path) -> None:
+    bars = _bars(2)
+    path = tmp_path / "bars.txt"
+    path.write_text(format_bar_line(bars[0]) + format_bar_line(bars[1])[:-1])
+
+    async def main() -> list[M1Bar]:
+        return [bar async for bar in tail_file(path, price_ticks=False)]
+
+    assert asyncio.run(main()) == bars
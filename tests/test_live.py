@@ -0,0 +1,74 @@
+"""
+test_live.py
+============
+Replaying an M1 history through :class:`backtest.live.LiveDriver` must
+fill exactly the trades of the batch ``run_backtest`` on the resampled
+M5 bars — across contract rolls, the daily 17:00–17:59 CT break and a
+DST change.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from backtest.engine import run_backtest
+from backtest.live import LiveDriver, replay
+from config import constants as C
+from config.run_config import RunConfig
+from data.roll_manager import annotate_rolls
+from indicators.ema import compute_ema_pair
+from preprocessing.resampler import resample_m1_to_m5
+from signals.crossover import generate_crossover_signals
+
+
+@pytest.fixture
+def config() -> RunConfig:
+    return RunConfig.from_settings(ema_fast=5, ema_slow=13, warmup_bars=20)
+
+
+@pytest.fixture
+def df_m1(make_m1) -> pd.DataFrame:
+    # Spans the 2021-03-14 spring-forward in Chicago.
+    return make_m1(n_minutes=15_000, start="2021-03-08")
+
+
+def _batch_trades(df_m1: pd.DataFrame, config: RunConfig) -> pd.DataFrame:
+    df_m5 = resample_m1_to_m5(annotate_rolls(df_m1))
+    assert df_m5["contains_roll"].any()
+    fast, slow = compute_ema_pair(df_m5[C.COL_CLOSE], config=config)
+    signals = generate_crossover_signals(fast, slow)
+    return run_backtest(df_m5, signals, config=config).ledger.to_dataframe()
+
+
+def test_driver_matches_batch(df_m1, config) -> None:
+    driver = LiveDriver(
+        config=config, price_ticks=False, unit=df_m1.index.unit
+    )
+    columns = [
+        df_m1[col].to_numpy()
+        for col in (C.COL_OPEN, C.COL_HIGH, C.COL_LOW, C.COL_CLOSE,
+                    C.COL_VOLUME, C.COL_INSTRUMENT_ID)
+    ]
+    for ts_ns, *bar in zip(df_m1.index.as_unit("ns").asi8, *columns):
+        driver.on_m1_bar(ts_ns, *bar)
+    state = driver.finish()
+
+    expected = _batch_trades(df_m1, config)
+    assert len(expected) > 0
+    assert_frame_equal(state.ledger.to_dataframe(), expected, check_exact=True)
+
+
+def test_replay_matches_batch(tmp_path, df_m1, config) -> None:
+    raw_path = tmp_path / "raw.parquet"
+    df_m1.to_parquet(raw_path)
+
+    driver = replay(raw_path, config=config, batch_rows=1_000)
+
+    assert_frame_equal(
+        driver.state.ledger.to_dataframe(),
+        _batch_trades(df_m1, config),
+        check_exact=True,
+    )
+    assert driver.latency_summary()["count"] == len(df_m1)
@@ -0,0 +1,53 @@
+"""
+test_loader_parity.py
+=====================
+The projected Arrow loader (``settings.LOAD_ENGINE = "arrow"``, the
+default) must return exactly the reference pandas load for the columns
+it keeps, with and without a time window and in integer-tick mode.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pandas.testing import assert_frame_equal
+
+from data.loader import load_raw_m1
+
+
+@pytest.fixture
+def raw_file(tmp_path, make_m1) -> Path:
+    df = make_m1(n_minutes=20_000)
+    # Extra provider columns the projected loader must skip.
+    df["rtype"] = np.uint8(33)
+    df["publisher_id"] = np.uint16(1)
+    df["symbol"] = "6EH1"
+    path = tmp_path / "raw.parquet"
+    df.to_parquet(path, row_group_size=2_000)
+    return path
+
+
+@pytest.mark.parametrize("ticks", [False, True], ids=["float", "ticks"])
+@pytest.mark.parametrize(
+    "start, end",
+    [(None, None), ("2021-03-05", None), ("2021-03-03", "2021-03-09 12:34")],
+)
+def test_arrow_matches_pandas(raw_file, ticks, start, end) -> None:
+    arrow = load_raw_m1(
+        raw_file, start=start, end=end, price_ticks=ticks, engine="arrow"
+    )
+    full = load_raw_m1(
+        raw_file, start=start, end=end, price_ticks=ticks, engine="pandas"
+    )
+
+    assert len(arrow) > 0
+    assert "symbol" not in arrow.columns
+    assert_frame_equal(arrow, full[arrow.columns], check_exact=True)
+
+
+def test_empty_window(raw_file) -> None:
+    arrow = load_raw_m1(raw_file, start="2030-01-01", engine="arrow")
+    full = load_raw_m1(raw_file, start="2030-01-01", engine="pandas")
+    assert arrow.empty and full.empty
@@ -0,0 +1,167 @@
+"""
+test_m5_cache.py
+================
+The M5 cache (on by default, ``settings.M5_CACHE_ENABLED``) must return
+exactly the frame that was stored, and its key must change whenever the
+raw data or the resample settings change.
+
+The memory-mapped Arrow IPC entries (on by default,
+``settings.M5_CACHE_MMAP``) are checked against the Parquet entries:
+same frame, same backtest. Writers use a private temporary file per
+call, so concurrent writers of one key cannot interleave.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import data.m5_cache as m5_cache
+from pandas.testing import assert_frame_equal
+
+from backtest.engine import run_backtest
+from config import constants as C
+from config import settings as S
+from config.run_config import RunConfig
+from data.downloader import raw_parquet_path
+from data.m5_cache import load_cached_m5, m5_cache_key, store_m5
+from data.roll_manager import annotate_rolls, detect_rolls
+from indicators.ema import compute_ema_pair
+from main import prepare_m5_bars
+from preprocessing.resampler import resample_m1_to_m5
+from signals.crossover import generate_crossover_signals
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch) -> Path:
+    monkeypatch.setattr(S, "M5_CACHE_DIR", tmp_path / "m5_cache")
+    monkeypatch.setattr(S, "M5_CACHE_MMAP", False)
+    return S.M5_CACHE_DIR
+
+
+@pytest.fixture
+def raw_file(tmp_path, make_m1) -> Path:
+    path = tmp_path / "raw.parquet"
+    make_m1(n_minutes=5_000).to_parquet(path)
+    return path
+
+
+def _bars(raw_file: Path) -> tuple[pd.DataFrame, pd.DataFrame]:
+    df_m1 = pd.read_parquet(raw_file)
+    return resample_m1_to_m5(annotate_rolls(df_m1)), detect_rolls(df_m1)
+
+
+def test_round_trip(cache_dir, raw_file) -> None:
+    key = m5_cache_key(raw_file)
+    assert load_cached_m5(key) is None
+
+    df_m5, rolls = _bars(raw_file)
+    store_m5(key, df_m5, rolls)
+    cached_m5, cached_rolls = load_cached_m5(key)
+
+    assert_frame_equal(cached_m5, df_m5, check_exact=True)
+    assert_frame_equal(cached_rolls, rolls, check_exact=True)
+
+
+def test_key_tracks_inputs(cache_dir, raw_file, make_m1, monkeypatch) -> None:
+    key = m5_cache_key(raw_file)
+    assert m5_cache_key(raw_file) == key
+
+    freq = S.RESAMPLE_FREQ
+    monkeypatch.setattr(S, "RESAMPLE_FREQ", "15min")
+    assert m5_cache_key(raw_file) != key
+    monkeypatch.setattr(S, "RESAMPLE_FREQ", freq)
+    assert m5_cache_key(raw_file) == key
+
+    make_m1(n_minutes=5_000, seed=1).to_parquet(raw_file)
+    assert m5_cache_key(raw_file) != key
+
+
+@pytest.mark.parametrize("ticks", [False, True], ids=["float", "ticks"])
+def test_mmap_round_trip(
+    cache_dir, raw_file, monkeypatch, to_tick_frame, ticks
+) -> None:
+    monkeypatch.setattr(S, "M5_CACHE_MMAP", True)
+    df_m5, rolls = _bars(raw_file)
+    if ticks:
+        df_m5 = to_tick_frame(df_m5)
+
+    store_m5("k", df_m5, rolls)
+    assert (cache_dir / "k.arrow").exists()
+    cached_m5, cached_rolls = load_cached_m5("k")
+
+    assert_frame_equal(cached_m5, df_m5, check_exact=True)
+    assert_frame_equal(cached_rolls, rolls, check_exact=True)
+
+
+def test_mmap_added_to_parquet_entry(cache_dir, raw_file, monkeypatch) -> None:
+    df_m5, rolls = _bars(raw_file)
+    store_m5("k", df_m5, rolls)
+    assert not (cache_dir / "k.arrow").exists()
+
+    monkeypatch.setattr(S, "M5_CACHE_MMAP", True)
+    cached_m5, _ = load_cached_m5("k")
+    assert (cache_dir / "k.arrow").exists()
+    assert_frame_equal(cached_m5, df_m5, check_exact=True)
+
+
+def test_mmap_backtest_parity(cache_dir, raw_file, monkeypatch) -> None:
+    df_m5, rolls = _bars(raw_file)
+    store_m5("k", df_m5, rolls)
+    parquet_m5, _ = load_cached_m5("k")
+    monkeypatch.setattr(S, "M5_CACHE_MMAP", True)
+    mapped_m5, _ = load_cached_m5("k")
+
+    config = RunConfig.from_settings(ema_fast=5, ema_slow=13, warmup_bars=20)
+    results = []
+    for frame in (parquet_m5, mapped_m5):
+        fast, slow = compute_ema_pair(frame[C.COL_CLOSE], config=config)
+        signals = generate_crossover_signals(fast, slow)
+        state = run_backtest(frame, signals, config=config)
+        results.append(state.ledger.to_dataframe())
+
+    assert len(results[0]) > 0
+    assert_frame_equal(results[1], results[0], check_exact=True)
+
+
+def test_writers_use_private_temp_files(
+    cache_dir, raw_file, monkeypatch
+) -> None:
+    monkeypatch.setattr(S, "M5_CACHE_MMAP", True)
+    sources: list[str] = []
+    real_replace = m5_cache.os.replace
+
+    def recording(src, dst) -> None:
+        sources.append(str(src))
+        real_replace(src, dst)
+
+    monkeypatch.setattr(m5_cache.os, "replace", recording)
+    key = m5_cache_key(raw_file)
+    df_m5, rolls = _bars(raw_file)
+    store_m5(key, df_m5, rolls)
+    store_m5(key, df_m5, rolls)
+
+    assert len(sources) == 6
+    assert len(set(sources)) == len(sources)
+    assert not list(cache_dir.glob("*.tmp"))
+
+
+def test_streamed_entry_falls_back_on_miss(
+    cache_dir, tmp_path, make_m1, monkeypatch
+) -> None:
+    for name, value in (
+        ("DATA_DIR", tmp_path), ("OUTPUT_DIR", tmp_path / "output"),
+        ("RAW_DATA_LAYOUT", "file"), ("RESAMPLE_STREAMING", True),
+        ("M5_CACHE_ENABLED", True),
+    ):
+        monkeypatch.setattr(S, name, value)
+    df_m1 = make_m1(n_minutes=5_000)
+    df_m1.to_parquet(raw_parquet_path())
+    expected = resample_m1_to_m5(annotate_rolls(df_m1))
+    assert_frame_equal(prepare_m5_bars(), expected, check_exact=True)
+
+    # A lookup that misses right after adoption reads the adopted file.
+    monkeypatch.setattr(m5_cache, "load_cached_m5", lambda key: None)
+    assert_frame_equal(prepare_m5_bars(), expected, check_exact=True)
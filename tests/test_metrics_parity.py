@@ -0,0 +1,113 @@
+"""
+test_metrics_parity.py
+======================
+The fused metrics path (the default, ``settings.METRICS_ENGINE``) must
+match the reference ``compute_performance`` + ``compute_drawdown`` on
+every field — values up to summation order, and the same scalar types —
+with and without numba.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import metrics.fused as fused
+from metrics.drawdown import DrawdownResult, compute_drawdown
+from metrics.fused import compute_metrics
+from utils.jit import NUMBA_AVAILABLE
+
+
+@pytest.fixture(
+    params=[
+        pytest.param(True, id="numba", marks=pytest.mark.skipif(
+            not NUMBA_AVAILABLE, reason="numba not installed"
+        )),
+        pytest.param(False, id="numpy"),
+    ]
+)
+def kernels(request, monkeypatch) -> bool:
+    monkeypatch.setattr(fused, "NUMBA_AVAILABLE", request.param)
+    return request.param
+
+
+def _case(seed: int) -> tuple[pd.DataFrame, pd.Series]:
+    """Random trades and one of several equity-curve shapes."""
+    rng = np.random.default_rng(seed)
+    n_trades = int(rng.integers(1, 200))
+    n_bars = int(rng.integers(1, 3_000))
+    pnl = np.round(rng.normal(rng.normal(0, 5), 50, n_trades), 2)
+    pnl *= rng.choice([1, 1, 0], n_trades)
+    trades = pd.DataFrame({"net_pnl": pnl, "is_winner": pnl > 0})
+
+    steps = rng.normal(0, 10, n_bars)
+    kind = seed % 4
+    if kind == 0:
+        values = np.cumsum(steps)             # starts near 0
+    elif kind == 1:
+        values = 1_000 + np.cumsum(steps)     # positive peaks
+    elif kind == 2:
+        values = np.zeros(n_bars)             # flat: NaN pct and Sharpe
+    else:
+        values = -5 + np.abs(np.cumsum(steps))
+    return trades, pd.Series(values)
+
+
+def _assert_same(fast, ref) -> None:
+    # Series and the source equity are not compared fields; the series
+    # are checked separately.
+    for f in dataclasses.fields(ref):
+        if not f.compare:
+            continue
+        name = f.name
+        expected, actual = getattr(ref, name), getattr(fast, name)
+        assert type(actual) is type(expected), name
+        assert actual == pytest.approx(
+            expected, rel=1e-11, abs=1e-9, nan_ok=True
+        ), name
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_random_parity(kernels, seed) -> None:
+    trades, equity = _case(seed)
+    perf, dd = compute_metrics(trades, equity, engine="fused")
+    ref_perf, ref_dd = compute_metrics(trades, equity, engine="pandas")
+
+    _assert_same(perf, ref_perf)
+    _assert_same(dd, ref_dd)
+    pd.testing.assert_series_equal(dd.drawdown_series, ref_dd.drawdown_series)
+    pd.testing.assert_series_equal(dd.peak_series, ref_dd.peak_series)
+
+
+@pytest.mark.parametrize(
+    "pnl", [[5.0, 3.0], [-2.0, -1.0], [0.0, 0.0]], ids=["wins", "losses", "flat"]
+)
+def test_one_sided_trades(kernels, pnl) -> None:
+    pnl = np.asarray(pnl)
+    trades = pd.DataFrame({"net_pnl": pnl, "is_winner": pnl > 0})
+    equity = pd.Series(np.r_[100.0, 100.0 + np.cumsum(pnl)])
+
+    perf, dd = compute_metrics(trades, equity, engine="fused")
+    ref_perf, ref_dd = compute_metrics(trades, equity, engine="pandas")
+    _assert_same(perf, ref_perf)
+    _assert_same(dd, ref_dd)
+
+
+def test_drawdown_result_takes_series() -> None:
+    equity = pd.Series([0.0, 2.0, 1.0, 3.0, -1.0])
+    eager = compute_drawdown(equity)
+    lazy = DrawdownResult(
+        eager.max_drawdown_usd, eager.max_drawdown_pct, equity=equity,
+    )
+
+    # compute_drawdown hands over the series it already built.
+    assert {"drawdown_series", "peak_series"} <= vars(eager).keys()
+    assert eager.equity is None
+    assert eager == lazy
+    pd.testing.assert_series_equal(eager.drawdown_series, lazy.drawdown_series)
+    pd.testing.assert_series_equal(eager.peak_series, lazy.peak_series)
+    with pytest.raises(TypeError):
+        DrawdownResult(-1.0, -0.5)
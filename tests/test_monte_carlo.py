@@ -0,0 +1,74 @@
+"""
+test_monte_carlo.py
+===================
+``path_drawdowns`` on one row must equal ``compute_drawdown`` on the
+matching trade-step equity curve; ``run_monte_carlo`` must keep the
+final PnL of every shuffled path, and its results must not depend on
+the memory budget that sets the batch size.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics.drawdown import compute_drawdown, path_drawdowns
+from metrics.monte_carlo import run_monte_carlo
+
+_METHODS = ("shuffle", "iid", "block", "stationary")
+
+
+@pytest.fixture
+def trades() -> pd.DataFrame:
+    pnl = np.round(np.random.default_rng(11).normal(2.0, 80.0, 173), 2)
+    return pd.DataFrame({"net_pnl": pnl})
+
+
+@pytest.mark.parametrize("capital", [0.0, 2_000.0])
+@pytest.mark.parametrize("seed", range(5))
+def test_single_path_matches_compute_drawdown(capital, seed) -> None:
+    pnl = np.round(np.random.default_rng(seed).normal(0, 50, 300), 2)
+    equity = pd.Series(np.r_[capital, capital + np.cumsum(pnl)])
+
+    expected = compute_drawdown(equity)
+    dd = path_drawdowns(pnl[None, :], capital)
+
+    assert dd.max_drawdown_usd[0] == pytest.approx(
+        expected.max_drawdown_usd, rel=1e-12
+    )
+    assert dd.max_drawdown_pct[0] == pytest.approx(
+        expected.max_drawdown_pct, rel=1e-12, nan_ok=True
+    )
+    assert dd.final_equity[0] == pytest.approx(equity.iloc[-1], rel=1e-12)
+    assert dd.min_equity[0] == pytest.approx(equity.min(), rel=1e-12)
+
+
+def test_shuffle_keeps_final_pnl(trades) -> None:
+    result = run_monte_carlo(trades, n_paths=500, method="shuffle")
+    np.testing.assert_allclose(
+        result.final_pnl, trades["net_pnl"].sum(), rtol=0, atol=1e-8
+    )
+    assert np.unique(result.max_drawdown_usd).size > 1
+
+
+@pytest.mark.parametrize("method", _METHODS)
+def test_batch_size_invariant(trades, method) -> None:
+    kwargs = dict(n_paths=301, method=method, block_length=4)
+    whole = run_monte_carlo(trades, **kwargs)
+    # Room for about 7 paths per batch.
+    small = run_monte_carlo(trades, memory_bytes=7 * 173 * 48, **kwargs)
+
+    for field in dataclasses.fields(whole):
+        expected = getattr(whole, field.name)
+        if isinstance(expected, np.ndarray):
+            np.testing.assert_array_equal(getattr(small, field.name), expected)
+        else:
+            assert getattr(small, field.name) == expected
+
+
+def test_rejects_no_paths(trades) -> None:
+    with pytest.raises(ValueError):
+        run_monte_carlo(trades, n_paths=0)
@@ -0,0 +1,100 @@
+"""
+test_partitioned_window.py
+==========================
+With ``RAW_DATA_LAYOUT = "partitioned"`` the dataset directory may hold
+months outside ``[DATA_START, DATA_END)``. The pipeline must read only
+that window — in the in-memory and the streaming path alike — and the
+M5 cache key must follow the window, not the whole directory. The
+resampled bars are kept in a partitioned M5 dataset of the same layout.
+"""
+
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from config import settings as S
+from data.downloader import raw_dataset_dir
+from data.dataset_store import PartitionedDataset
+from data.loader import load_m5_bars, m5_dataset_dir
+from data.m5_cache import m5_cache_key
+from main import prepare_m5_bars
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch, make_m1) -> Path:
+    """Raw M1 from mid-January to mid-March 2021, one file per month."""
+    monkeypatch.setattr(S, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(S, "OUTPUT_DIR", tmp_path / "output")
+    monkeypatch.setattr(S, "M5_CACHE_DIR", tmp_path / "m5_cache")
+    monkeypatch.setattr(S, "M5_CACHE_ENABLED", False)
+    monkeypatch.setattr(S, "RAW_DATA_LAYOUT", "partitioned")
+    monkeypatch.setattr(S, "DATA_START", "2021-02-01T00:00:00")
+    monkeypatch.setattr(S, "DATA_END", "2021-03-01T00:00:00")
+
+    root = raw_dataset_dir()
+    df_m1 = make_m1(n_minutes=80_000, start="2021-01-15")
+    months = df_m1.index.tz_localize(None).to_period("M")
+    for month, part in df_m1.groupby(months):
+        path = root / f"year={month.year}/month={month.month:02d}/part.parquet"
+        path.parent.mkdir(parents=True)
+        part.to_parquet(path)
+    return root
+
+
+def test_pipeline_reads_only_the_window(dataset) -> None:
+    df_m5 = prepare_m5_bars()
+
+    assert df_m5.index[0] >= pd.Timestamp(S.DATA_START, tz="UTC")
+    assert df_m5.index[-1] < pd.Timestamp(S.DATA_END, tz="UTC")
+    assert df_m5.index[-1] >= pd.Timestamp("2021-02-26", tz="UTC")
+
+
+def test_streaming_matches_in_memory(dataset, monkeypatch) -> None:
+    expected = prepare_m5_bars()
+    monkeypatch.setattr(S, "RESAMPLE_STREAMING", True)
+    assert_frame_equal(prepare_m5_bars(), expected, check_exact=True)
+
+
+def test_m5_dataset_holds_the_window(dataset, monkeypatch) -> None:
+    monkeypatch.setattr(S, "DATA_START", "2021-01-20T00:00:00")
+    expected = prepare_m5_bars()
+    assert_frame_equal(load_m5_bars(), expected, check_exact=True)
+
+    shutil.rmtree(m5_dataset_dir())
+    monkeypatch.setattr(S, "RESAMPLE_STREAMING", True)
+    monkeypatch.setattr(S, "M5_CACHE_ENABLED", True)
+    monkeypatch.setattr(S, "STREAM_BATCH_ROWS", 2_000)
+    assert_frame_equal(prepare_m5_bars(), expected, check_exact=True)
+
+    partitions = PartitionedDataset(m5_dataset_dir()).partitions()
+    assert [p.file for p in partitions] == [
+        "year=2021/month=01/part.parquet", "year=2021/month=02/part.parquet",
+    ]
+    assert sum(p.rows for p in partitions) == len(expected)
+    assert_frame_equal(load_m5_bars(), expected, check_exact=True)
+    week = ("2021-02-08", "2021-02-15")
+    assert_frame_equal(
+        load_m5_bars(*week),
+        expected[(expected.index >= week[0]) & (expected.index < week[1])],
+        check_exact=True,
+    )
+
+
+def test_cache_key_follows_window(dataset, monkeypatch) -> None:
+    window = (S.DATA_START, S.DATA_END)
+    key = m5_cache_key(dataset, *window)
+    assert m5_cache_key(dataset, "2021-01-01", S.DATA_END) != key
+
+    # Rewriting a month outside the window leaves the key alone.
+    outside = dataset / "year=2021/month=03/part.parquet"
+    pd.read_parquet(outside).iloc[:-1].to_parquet(outside)
+    assert m5_cache_key(dataset, *window) == key
+
+    inside = dataset / "year=2021/month=02/part.parquet"
+    pd.read_parquet(inside).iloc[:-1].to_parquet(inside)
+    assert m5_cache_key(dataset, *window) != key
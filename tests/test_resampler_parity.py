@@ -0,0 +1,52 @@
+"""
+test_resampler_parity.py
+========================
+The array resampler (``settings.RESAMPLE_ENGINE = "numpy"``, the
+default) must return exactly the frame of the pandas reference
+``resample_m1_to_m5``, across DST changes and session breaks.
+"""
+
+from __future__ import annotations
+
+import pytest
+from pandas.testing import assert_frame_equal
+
+from config import settings as S
+from data.roll_manager import annotate_rolls
+from preprocessing.resampler import resample_m1_to_m5, resample_m1_to_m5_numpy
+
+
+# Spring-forward (2021-03-14) and fall-back (2021-11-07) in Chicago.
+@pytest.mark.parametrize("start", ["2021-03-08", "2021-11-01"])
+@pytest.mark.parametrize("ticks", [False, True], ids=["float", "ticks"])
+def test_matches_pandas(make_m1, to_tick_frame, start, ticks) -> None:
+    df_m1 = annotate_rolls(make_m1(n_minutes=20_000, start=start))
+    if ticks:
+        df_m1 = to_tick_frame(df_m1)
+
+    expected = resample_m1_to_m5(df_m1)
+    assert expected["contains_roll"].any()
+    assert_frame_equal(resample_m1_to_m5_numpy(df_m1), expected, check_exact=True)
+
+
+def test_without_roll_column(make_m1) -> None:
+    df_m1 = make_m1(n_minutes=5_000)
+    assert_frame_equal(
+        resample_m1_to_m5_numpy(df_m1),
+        resample_m1_to_m5(df_m1),
+        check_exact=True,
+    )
+
+
+@pytest.mark.parametrize(
+    "setting, value",
+    [("RESAMPLE_FREQ", "15min"), ("RESAMPLE_CLOSED", "right")],
+)
+def test_other_settings(make_m1, monkeypatch, setting, value) -> None:
+    monkeypatch.setattr(S, setting, value)
+    df_m1 = annotate_rolls(make_m1(n_minutes=5_000))
+    assert_frame_equal(
+        resample_m1_to_m5_numpy(df_m1),
+        resample_m1_to_m5(df_m1),
+        check_exact=True,
+    )
@@ -0,0 +1,65 @@
+"""
+test_run_config.py
+==================
+Derived cost fields of :class:`RunConfig` are resolved once, at
+construction, and do not take part in equality, hashing or the
+persistent cache key. Public helpers that take a config default it
+to ``RunConfig.from_settings()``.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import pickle
+
+from config import constants as C
+from config.run_config import RunConfig
+from execution.execution_engine import compute_fill_price, compute_fill_ticks
+from execution.position_manager import Direction
+
+
+def test_derived_fields() -> None:
+    config = RunConfig.from_settings(
+        slippage_ticks=3, roll_close_slippage_ticks=5,
+        commission_per_side=2.5, contracts=4,
+    )
+    assert config.slippage_amount == 3 * C.TICK_SIZE
+    assert config.roll_slippage_amount == 5 * C.TICK_SIZE
+    assert config.round_trip_commission == 2.5 * 2 * 4
+
+
+def test_replace_recomputes_derived_fields() -> None:
+    config = RunConfig.from_settings(slippage_ticks=1)
+    wider = dataclasses.replace(config, slippage_ticks=2)
+    assert wider.slippage_amount == 2 * C.TICK_SIZE
+    assert config.slippage_amount == 1 * C.TICK_SIZE
+
+
+def test_identity_uses_settings_fields_only() -> None:
+    config = RunConfig.from_settings()
+    assert set(config.as_dict()) == {
+        f.name for f in dataclasses.fields(RunConfig) if f.init
+    }
+    assert "slippage_amount" not in config.as_dict()
+    assert RunConfig(**config.as_dict()) == config
+    assert hash(RunConfig(**config.as_dict())) == hash(config)
+    assert RunConfig(**config.as_dict()).cache_key() == config.cache_key()
+
+
+def test_pickle_round_trip() -> None:
+    config = RunConfig.from_settings(contracts=2)
+    restored = pickle.loads(pickle.dumps(config))
+    assert restored == config
+    assert restored.round_trip_commission == config.round_trip_commission
+
+
+def test_fill_helpers_default_to_settings() -> None:
+    config = RunConfig.from_settings()
+    for direction in (Direction.LONG, Direction.SHORT):
+        for roll in (False, True):
+            assert compute_fill_price(direction, 1.1, roll) == (
+                compute_fill_price(direction, 1.1, roll, config=config)
+            )
+            assert compute_fill_ticks(direction, 22_000, roll) == (
+                compute_fill_ticks(direction, 22_000, roll, config=config)
+            )
@@ -0,0 +1,36 @@
+"""
+test_stream_resampler.py
+========================
+Streaming M1 → M5 resampling (``settings.RESAMPLE_STREAMING``) must
+write exactly the bars of the in-memory pipeline,
+``resample_m1_to_m5(annotate_rolls(m1))``, and return the same roll log
+as ``detect_rolls``, whatever the batch size.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from data.roll_manager import annotate_rolls, detect_rolls
+from preprocessing.resampler import resample_m1_to_m5
+from preprocessing.stream_resampler import stream_resample_parquet
+
+
+@pytest.mark.parametrize("batch_rows", [7, 333, 500, 4_999])
+def test_matches_in_memory(tmp_path, make_m1, batch_rows) -> None:
+    # Spans the 2021-03-14 spring-forward and several rolls.
+    df_m1 = make_m1(n_minutes=6_000, start="2021-03-12")
+    raw_path = tmp_path / "raw.parquet"
+    df_m1.to_parquet(raw_path)
+    out_path = tmp_path / "m5.parquet"
+
+    rolls = stream_resample_parquet(
+        out_path, raw_path=raw_path, batch_rows=batch_rows
+    )
+
+    expected = resample_m1_to_m5(annotate_rolls(df_m1))
+    assert expected["contains_roll"].any()
+    assert_frame_equal(pd.read_parquet(out_path), expected, check_exact=True)
+    assert_frame_equal(rolls, detect_rolls(df_m1), check_exact=True)
@@ -0,0 +1,80 @@
+"""
+test_walk_forward.py
+====================
+Consecutive OOS windows that select the same EMA pair must trade as one
+backtest: with a single-pair grid the stitched OOS ledger equals one
+``run_backtest`` over the whole OOS span, and no boundary close is
+recorded. With a real grid, boundary closes only occur where the pair
+changes.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from backtest.engine import run_backtest
+from backtest.walk_forward import run_walk_forward
+from config import constants as C
+from config.run_config import RunConfig
+from data.roll_manager import annotate_rolls
+from indicators.ema import compute_ema_pair
+from preprocessing.resampler import resample_m1_to_m5
+from signals.crossover import generate_crossover_signals
+
+_IS_BARS = 600
+_OOS_BARS = 300
+
+
+@pytest.fixture
+def df_m5(make_m1) -> pd.DataFrame:
+    return resample_m1_to_m5(annotate_rolls(make_m1(n_minutes=20_000)))
+
+
+@pytest.fixture
+def config() -> RunConfig:
+    return RunConfig.from_settings(ema_fast=5, ema_slow=13, warmup_bars=20)
+
+
+def test_single_pair_is_one_run(df_m5, config) -> None:
+    result = run_walk_forward(
+        df_m5, pairs=[(5, 13)], is_bars=_IS_BARS, oos_bars=_OOS_BARS,
+        anchored=False, min_trades=0, config=config,
+    )
+
+    fast, slow = compute_ema_pair(df_m5[C.COL_CLOSE], config=config)
+    signals = generate_crossover_signals(fast, slow)
+    oos = slice(_IS_BARS, len(df_m5))
+    expected = run_backtest(
+        df_m5.iloc[oos], signals.iloc[oos], config=config
+    ).ledger.to_dataframe()
+
+    assert len(result.windows) > 2
+    assert len(expected) > 0
+    assert_frame_equal(result.trades, expected, check_exact=True)
+    assert result.windows["boundary_closes"].sum() == 0
+    assert result.windows["oos_trades"].sum() == len(expected)
+    assert result.windows["oos_net_pnl"].sum() == pytest.approx(
+        expected["net_pnl"].sum()
+    )
+
+
+def test_boundary_closes_only_at_pair_changes(df_m5, config) -> None:
+    result = run_walk_forward(
+        df_m5,
+        pairs=[(3, 8), (5, 13), (8, 21), (13, 34)],
+        is_bars=_IS_BARS, oos_bars=_OOS_BARS, anchored=False,
+        objective="net_profit", min_trades=1, config=config,
+    )
+    windows = result.windows
+    pair = list(zip(windows["ema_fast"], windows["ema_slow"]))
+    changes = [a != b for a, b in zip(pair, pair[1:])] + [False]
+
+    assert any(changes)
+    assert windows["boundary_closes"].sum() > 0
+    assert all(
+        closes == 0 for closes, change in zip(windows["boundary_closes"], changes)
+        if not change
+    )
+    assert windows["oos_trades"].sum() == len(result.trades)
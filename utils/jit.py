@@ -0,0 +1,28 @@
+"""
+jit.py
+======
+Optional numba support shared by the compiled kernels
+(``backtest/jit_core.py``, ``metrics/fused.py``).
+
+When numba is installed, ``njit`` is ``numba.njit`` and
+``NUMBA_AVAILABLE`` is True. Otherwise ``njit`` is a no-op decorator, so
+the decorated kernels stay importable and run as plain Python; callers
+check ``NUMBA_AVAILABLE`` to choose a faster interpreted path instead.
+
+This module does NOT compile anything itself.
+"""
+
+from __future__ import annotations
+
+try:
+    from numba import njit  # type: ignore
+
+    NUMBA_AVAILABLE: bool = True
+except ImportError:  # pragma: no cover - depends on environment
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):  # type: ignore[no-redef]
+        """No-op stand-in for ``numba.njit`` when numba is absent."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func